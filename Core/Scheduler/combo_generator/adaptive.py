@@ -0,0 +1,176 @@
+# Core/Scheduler/combo_generator/adaptive.py
+from __future__ import annotations
+import math
+import threading
+import time
+from collections import Counter, deque
+
+from Core.Scheduler.interface import ComboGenerator
+from Core.Scheduler.combo_generator.bitmask_dp import BitmaskDPComboGenerator
+from Core.Scheduler.combo_generator.brute_force import BruteForceGenerator
+from Core.Scheduler.combo_generator.greedy import GreedyComboGenerator
+from Core.Scheduler.provider_index import top_k_providers
+from utils.utils import to_epoch
+
+try:
+    from Core.Scheduler.combo_generator.cpsat import CPSatComboGenerator
+    from Core.Scheduler.combo_generator.hybrid_cp import HybridCPComboGenerator
+except ImportError:  # pragma: no cover - ortools missing
+    CPSatComboGenerator = HybridCPComboGenerator = None
+
+
+class AdaptiveComboGenerator(ComboGenerator):
+    """Route each task to the cheapest exact generator that fits the budget.
+
+    Per task, every engine gets a size estimate of its search from its
+    :meth:`~Core.Scheduler.interface.ComboGenerator.size_estimate`. The
+    scene matrices and the per-scene top-``k`` providers are computed once
+    and shared by all estimates:
+
+    * ``bf``: ``prod(k_s + 1)`` over the unassigned scenes (``k_s``
+      candidates per scene, a bound of ``BruteForceGenerator.time_complexity``
+      that is cheap to compute);
+    * ``dp``: DP states (same as ``BitmaskDPComboGenerator.time_complexity``);
+    * ``cp`` / ``hybrid_cp``: scene-provider pairs of the model (all
+      fitting providers / the ``k`` fastest per scene);
+    * ``greedy``: scene-provider pairs that fit now.
+
+    The predicted solve time is ``rate * (size + 1)`` (the ``+ 1`` is the
+    fixed cost of a call). Tasks with no fitting pair go to greedy. The exact engines whose
+    prediction fits the latency budget (``budget`` seconds per task, at most
+    what is left of ``step_budget`` in the current step) are candidates and
+    the fastest one wins; if none fits, greedy runs. CP-SAT engines get what
+    is left of that budget as their ``time_limit``. If the chosen engine
+    places no unassigned scene (e.g. CP-SAT found no solution in its time
+    limit), the greedy result is used instead. After each solve the
+    engine's rate moves towards the observed seconds per unit (exponential
+    average with weight ``alpha``), so the thresholds calibrate online.
+
+    Decisions are appended to ``log`` (engine, size, predicted and observed
+    seconds; only the last ``log_size`` are kept) and counted in
+    ``decisions``. Concurrent calls (the scheduler's ``pipeline``) are safe:
+    the step deadline, rates, ``log`` and ``decisions`` are updated under a
+    lock. ``cp`` and ``hybrid_cp`` are left
+    out without ortools.
+    """
+
+    ENGINES = ("bf", "dp", "hybrid_cp", "cp")
+    # Initial seconds per size unit (measured on the example configs)
+    RATES = {"bf": 2e-4, "dp": 5e-5, "hybrid_cp": 5e-3, "cp": 5e-3, "greedy": 1e-5}
+
+    def __init__(
+        self,
+        engines=ENGINES,
+        budget: float = 0.5,
+        step_budget: float | None = None,
+        alpha: float = 0.3,
+        rates: dict | None = None,
+        log_size: int = 1000,
+    ):
+        unknown = set(engines) - set(self.ENGINES)
+        if unknown:
+            raise ValueError(f"unknown engines {sorted(unknown)}; expected {self.ENGINES}")
+        self.budget = budget
+        self.step_budget = step_budget
+        self.alpha = alpha
+        self.greedy = GreedyComboGenerator()
+        self.engines = {}
+        for name in engines:
+            if name == "bf":
+                self.engines[name] = BruteForceGenerator()
+            elif name == "dp":
+                self.engines[name] = BitmaskDPComboGenerator()
+            elif CPSatComboGenerator is not None:
+                self.engines[name] = (CPSatComboGenerator() if name == "cp"
+                                      else HybridCPComboGenerator())
+        # 엔진들이 보는 씬별 후보 수의 최댓값 (sizes에서 한 번만 계산)
+        self._k = max([g.kprov if name == "bf" else g.k
+                       for name, g in self.engines.items() if name != "cp"], default=0)
+        self.rates = {**self.RATES, **(rates or {})}
+        # CP-SAT은 배정된 씬을 provider 인덱스로 고정
+        self.subset_safe = all(g.subset_safe for g in self.engines.values())
+        self._step = (None, math.inf)  # (now, step deadline)
+        self._lock = threading.Lock()
+        self.log: deque = deque(maxlen=log_size)
+        self.decisions: Counter = Counter()
+
+    def __getstate__(self):
+        # 락은 복사하지 않음 (병렬 모드의 worker로 보낼 때)
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def release(self, t):
+        for g in self.engines.values():
+            g.release(t)
+
+    def cache_stats(self):
+        return {f"{name}_{k}": v for name, g in self.engines.items() for k, v in g.cache_stats().items()}
+
+    def time_complexity(self, t, ps, now, ev):
+        return self.greedy.time_complexity(t, ps, now, ev)
+
+    # --- routing ---------------------------------------------------------
+    def sizes(self, t, ps, now, ev) -> dict:
+        """Search-size estimate of every engine for ``t`` at ``now``."""
+        scene_ids = [i for i, (st, _) in enumerate(t.scene_allocation_data) if st is None]
+        M = ev.scene_matrices(t, now, ps)
+        top = top_k_providers(M, scene_ids, self._k)
+        out = {"greedy": self.greedy.size_estimate(t, M, scene_ids, top)}
+        for name, g in self.engines.items():
+            out[name] = g.size_estimate(t, M, scene_ids, top)
+        return out
+
+    def _limit(self, now, start) -> float:
+        now = to_epoch(now)
+        with self._lock:
+            if self._step[0] != now:
+                end = start + self.step_budget if self.step_budget is not None else math.inf
+                self._step = (now, end)
+            return min(self.budget, self._step[1] - start)
+
+    def choose(self, sizes: dict, limit: float) -> tuple[str, float]:
+        """``(engine, predicted seconds)`` for the given sizes and time limit."""
+        pred = {name: self.rates[name] * (sizes[name] + 1) for name in sizes}
+        fits = [name for name in self.engines if pred[name] <= limit] if sizes["greedy"] else []
+        name = min(fits, key=pred.get) if fits else "greedy"
+        return name, pred[name]
+
+    def best_combo(self, t, ps, now, ev, verbose=False, active=None):
+        start = time.monotonic()
+        sizes = self.sizes(t, ps, now, ev)
+        limit = self._limit(now, start)
+        with self._lock:
+            name, pred = self.choose(sizes, limit)
+        gen = self.engines.get(name, self.greedy)
+
+        t0 = time.monotonic()
+        if name in ("cp", "hybrid_cp"):
+            # CP-SAT 자체 time_limit(기본 10초) 대신 남은 지연 예산
+            res = gen.best_combo(t, ps, now, ev, active=active,
+                                 time_limit=max(1e-3, limit - (t0 - start)))
+        else:
+            res = gen.best_combo(t, ps, now, ev, active=active)
+        observed = time.monotonic() - t0
+        with self._lock:
+            self.rates[name] += self.alpha * (observed / (sizes[name] + 1) - self.rates[name])
+
+        # 배정된 씬의 provider만 담은 CP 조합은 새로 배치한 게 없음 (portfolio._score와 같은 규칙)
+        fallback = gen is not self.greedy and (res is None or all(
+            p < 0 or st is not None for p, (st, _) in zip(res[0], t.scene_allocation_data)))
+        if fallback:
+            res = self.greedy.best_combo(t, ps, now, ev, active=active) or res
+
+        with self._lock:
+            self.decisions[name] += 1
+            self.log.append({"task": t.id, "now": to_epoch(now), "algo": name, "size": sizes[name],
+                             "predicted": pred, "observed": observed, "fallback": fallback})
+        if verbose:
+            print(f"[AUTO] task={t.id} algo={name} size={sizes[name]} "
+                  f"predicted={pred:.4f}s observed={observed:.4f}s"
+                  + (" (greedy fallback)" if fallback else ""))
+        return res
@@ -0,0 +1,206 @@
+# Core/Scheduler/combo_generator/assignment.py
+from __future__ import annotations
+from typing import List, Tuple
+
+import numpy as np
+
+from Core.Scheduler.interface import ComboGenerator, objective_weights, on_active_providers
+from utils.utils import to_epoch, hours_to_us, US_PER_HOUR
+
+
+def min_cost_assignment(cost: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Minimum-cost assignment of a dense (n, m) cost matrix.
+
+    Shortest augmenting path Hungarian algorithm (O(n^2 m)) with the inner
+    loop vectorised over columns. Every row of the smaller side is matched;
+    returns ``(rows, cols)`` index arrays like
+    ``scipy.optimize.linear_sum_assignment``.
+    """
+    cost = np.asarray(cost, dtype=float)
+    n, m = cost.shape
+    if n > m:
+        cols, rows = min_cost_assignment(cost.T)
+        order = np.argsort(rows)
+        return rows[order], cols[order]
+    if n == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    # 1-based potentials as in the textbook formulation; column 0 is virtual
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    p = np.zeros(m + 1, dtype=np.int64)    # p[j]: row matched to column j
+    way = np.zeros(m + 1, dtype=np.int64)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used
+            free[0] = False
+            cur = cost[i0 - 1] - u[i0] - v[1:]
+            better = free[1:] & (cur < minv[1:])
+            minv[1:][better] = cur[better]
+            way[1:][better] = j0
+            j1 = int(np.argmin(np.where(free, minv, np.inf)))
+            delta = minv[j1]
+            u[p[used]] += delta
+            v[used] -= delta
+            minv[free] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+    cols = np.flatnonzero(p[1:])
+    rows = p[1:][cols] - 1
+    order = np.argsort(rows)
+    return rows[order], cols[order]
+
+
+class AssignmentComboGenerator(ComboGenerator):
+    """Min-cost bipartite assignment of scenes to providers (algo ``"assign"``).
+
+    Within one step each provider takes at most one scene and each scene at
+    most one provider, so the cost and deferral terms of the objective form
+    an assignment problem: placing scene s on provider p costs ``WC*c_sp``,
+    deferring it costs ``WD``. Subtracting ``WD`` from every pair turns the
+    defer option into an implicit zero-cost dummy column, leaving a small
+    ``P x S`` matrix.
+
+    The makespan term ``WT*max(dur)`` (and the deadline penalty, which also
+    only grows with the makespan) is handled by sweeping a duration
+    threshold downwards: solve with every pair allowed, then forbid pairs at
+    least as long as the makespan just found, and so on, stopping as soon as
+    the linear part alone cannot beat the best solution. This is exact for
+    the objective without the budget penalty. When that solution overspends
+    the remaining budget, the budget is handled Lagrangian-style: the cost
+    weight ``WC + lam`` is bisected over ``lam in [0, WB]`` for
+    ``budget_steps`` rounds. The best single pair is always a candidate too.
+    All candidates are scored with ``evaluator.feasible_many`` and the best
+    is returned.
+
+    The result is exact only when the budget does not bind (the
+    budget-free optimum fits the remaining budget). Otherwise the bisection
+    is a heuristic: the result scores at least as well as the budget-free
+    optimum, but can fall short of the exhaustive optimum.
+    """
+
+    def __init__(self, batch: int = 1024, budget_steps: int = 12):
+        self.batch = batch
+        self.budget_steps = budget_steps
+
+    def time_complexity(self, t, ps, now, ev):
+        scene_ids = [i for i, (st, _) in enumerate(t.scene_allocation_data) if st is None]
+        return len(scene_ids) * len(ps)
+
+    @staticmethod
+    def _sweep(M, wc: float, WD: float, WT: float, WDL: float, over_dl) -> Tuple[List[List[Tuple[int, int]]], int]:
+        """Threshold sweep for ``WT*T + WDL*over_dl(T) + sum(wc*c) + WD*deferred``.
+
+        Returns the solutions found (the optimum last) and the solve count.
+        """
+        gain = np.where(M.ok, M.cost * wc - WD, 0.0)
+        useful = M.ok & (gain < 0.0)
+        durs = np.unique(M.dur[useful])
+        out: List[List[Tuple[int, int]]] = []
+        best = np.inf
+        solves = 0
+        tau = np.inf
+        while True:
+            allowed = useful & (M.dur <= tau)
+            if not allowed.any():
+                break
+            C = np.where(allowed, gain, 0.0)
+            prov, scene = min_cost_assignment(C.T)
+            solves += 1
+            picked = [(s, p) for p, s in zip(prov.tolist(), scene.tolist()) if allowed[s, p]]
+            if not picked:
+                break
+            lin = float(sum(C[s, p] for s, p in picked))
+            # Lower thresholds only remove pairs, so lin can only grow
+            if lin >= best:
+                break
+            T = max(float(M.dur[s, p]) for s, p in picked)
+            j = lin + WT * T + WDL * over_dl(T)
+            if j < best:
+                best = j
+                out.append(picked)
+            else:
+                out.insert(0, picked)
+            k = int(np.searchsorted(durs, T, "left")) - 1
+            if k < 0:
+                break
+            tau = durs[k]
+        return out, solves
+
+    def best_combo(self, t, ps, now, ev, verbose=False, active=None):
+        if active is not None:
+            return on_active_providers(self.best_combo, t, ps, now, ev, verbose, active)
+        scene_ids = [i for i, (st, _) in enumerate(t.scene_allocation_data) if st is None]
+        if not scene_ids:
+            return None
+        M = ev.scene_matrices(t, now, ps)
+        if not M.ok.any():
+            return None
+
+        WT, WC, WD, WB, WDL = objective_weights(ev)
+        now_us = to_epoch(now)
+
+        def over_dl(T):
+            return max(0.0, (now_us + hours_to_us(T) - t.deadline_us) / US_PER_HOUR)
+
+        found, solves = self._sweep(M, WC, WD, WT, WDL, over_dl)
+        remaining = t.budget - t.spent_cost
+
+        def spend(picked):
+            return sum(float(M.cost[s, p]) for s, p in picked)
+
+        if found and WB > 0 and spend(found[-1]) > remaining:
+            lo, hi = 0.0, WB
+            for _ in range(self.budget_steps):
+                lam = (lo + hi) / 2
+                more, n = self._sweep(M, WC + lam, WD, WT, WDL, over_dl)
+                solves += n
+                found += more
+                if more and spend(more[-1]) > remaining:
+                    lo = lam
+                else:
+                    hi = lam
+
+        # Best single pair, scored directly
+        nU = len(scene_ids)
+        with np.errstate(invalid="ignore"):
+            pair_cost = t.spent_cost + M.cost
+            dur_us = np.rint(np.where(M.ok, M.dur, 0.0) * US_PER_HOUR)
+            pair_j = (
+                WT * M.dur + WC * pair_cost + WD * (nU - 1) +
+                WB * np.maximum(0.0, pair_cost - t.budget) +
+                WDL * np.maximum(0.0, (now_us + dur_us - t.deadline_us) / US_PER_HOUR)
+            )
+        s1, p1 = np.unravel_index(int(np.argmin(np.where(M.ok, pair_j, np.inf))), M.ok.shape)
+        found.append([(int(s1), int(p1))])
+
+        combos: List[List[int]] = []
+        for picked in found:
+            cmb = [-1] * t.scene_number
+            for s, p in picked:
+                cmb[s] = p
+            combos.append(cmb)
+        if verbose:
+            print(f"[ASSIGN] solves={solves} candidates={len(combos)}")
+
+        best_score = float("-inf")
+        best_res = None
+        for lo in range(0, len(combos), self.batch):
+            chunk = combos[lo:lo + self.batch]
+            ok, t_tot, cost, *_, score = ev.feasible_many(t, np.array(chunk), now, ps)
+            i = int(np.argmax(score))
+            if ok[i] and score[i] > best_score:
+                best_score = float(score[i])
+                best_res = (chunk[i], float(t_tot[i]), float(cost[i]))
+        return best_res
@@ -0,0 +1,168 @@
+# Core/Scheduler/combo_generator/bitmask_dp.py
+from __future__ import annotations
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from Core.Scheduler.interface import ComboGenerator, objective_weights, on_active_providers
+from Core.Scheduler.provider_index import top_k_providers
+from utils.utils import to_epoch, hours_to_us, US_PER_HOUR
+
+
+class BitmaskDPComboGenerator(ComboGenerator):
+    """Exact dynamic programme over provider-usage bitmasks (algo ``"dp"``).
+
+    Scenes are processed in order; the state is the set of providers already
+    used in this step. The number of deferred scenes follows from the state
+    (scenes seen minus providers used), so a state's label is (cost,
+    makespan). The makespan dimension is handled by a duration threshold:
+    below a threshold every state only needs its cheapest cost, which lets
+    the DP run as NumPy operations over all ``2**P`` masks at once. The
+    threshold is swept downwards exactly as in
+    :class:`~Core.Scheduler.combo_generator.assignment.AssignmentComboGenerator`
+    and the sweep stops once cost alone cannot improve. The whole objective
+    (budget penalty included) only grows with cost, makespan and deferrals,
+    so this is exact.
+
+    Like Hybrid, the search is restricted to the union of each scene's top
+    ``k`` providers. At most ``max_providers`` providers are kept, those
+    with the shortest best duration first.
+
+    Providers with identical duration, cost and fit for every scene are
+    interchangeable, so the state only records how many of each such class
+    are used: a mixed-radix number with ``prod(n_k + 1)`` values instead of
+    ``2**P`` masks (the same thing when all classes are singletons).
+    """
+
+    def __init__(self, k: int = 3, max_providers: int = 12):
+        self.k = k
+        self.max_providers = max_providers
+
+    def _select_providers(self, M, scene_ids, top) -> List[int]:
+        chosen = set()
+        for sid in scene_ids:
+            chosen.update(top[sid][: self.k])
+        idx = sorted(chosen)
+        if len(idx) > self.max_providers:
+            best = np.where(M.ok, M.dur, np.inf)[scene_ids].min(axis=0)
+            idx = sorted(sorted(idx, key=lambda p: best[p])[: self.max_providers])
+        return idx
+
+    @staticmethod
+    def _classes(M, scene_ids, sub) -> List[List[int]]:
+        """Group positions of ``sub`` whose columns are identical over ``scene_ids``."""
+        groups = {}
+        for i, p in enumerate(sub):
+            key = (M.dur[scene_ids, p].tobytes(), M.cost[scene_ids, p].tobytes(), M.ok[scene_ids, p].tobytes())
+            groups.setdefault(key, []).append(i)
+        return list(groups.values())
+
+    def time_complexity(self, t, ps, now, ev):
+        scene_ids = [i for i, (st, _) in enumerate(t.scene_allocation_data) if st is None]
+        if not scene_ids:
+            return 0
+        M = ev.scene_matrices(t, now, ps)
+        return int(self.size_estimate(t, M, scene_ids, top_k_providers(M, scene_ids, self.k)))
+
+    def size_estimate(self, t, M, scene_ids, top):
+        """DP states: scenes times class-usage states (exact, no solve)."""
+        if not scene_ids:
+            return 0.0
+        sub = self._select_providers(M, scene_ids, top)
+        return float(len(scene_ids) * int(np.prod([len(c) + 1 for c in self._classes(M, scene_ids, sub)])))
+
+    @staticmethod
+    def _min_cost(dur, cost, allowed, digits, sizes, weights) -> Tuple[np.ndarray, List[np.ndarray]]:
+        """Cheapest cost of every class-usage state plus per-scene back-pointers."""
+        n = len(digits[0]) if digits else 1
+        dp = np.full(n, np.inf)
+        dp[0] = 0.0
+        states = np.arange(n, dtype=np.int64)
+        choices: List[np.ndarray] = []
+        for s in range(len(dur)):
+            new = dp.copy()  # 연기
+            choice = np.full(n, -1, dtype=np.int8)
+            for k in np.flatnonzero(allowed[s]).tolist():
+                src = states[digits[k] < sizes[k]]
+                cand = dp[src] + cost[s, k]
+                dst = src + weights[k]
+                better = cand < new[dst]
+                new[dst[better]] = cand[better]
+                choice[dst[better]] = k
+            dp = new
+            choices.append(choice)
+        return dp, choices
+
+    def best_combo(self, t, ps, now, ev, verbose=False, active=None) -> Optional[Tuple[List[int], float, float]]:
+        if active is not None:
+            return on_active_providers(self.best_combo, t, ps, now, ev, verbose, active)
+        scene_ids = [i for i, (st, _) in enumerate(t.scene_allocation_data) if st is None]
+        if not scene_ids:
+            return None
+        M = ev.scene_matrices(t, now, ps)
+        sub = self._select_providers(M, scene_ids, top_k_providers(M, scene_ids, self.k))
+        if not sub:
+            return None
+
+        WT, WC, WD, WB, WDL = objective_weights(ev)
+        now_us = to_epoch(now)
+
+        # 같은 열을 가진 provider는 한 class: 상태 = class별 사용 수
+        classes = self._classes(M, scene_ids, sub)
+        rep = [sub[c[0]] for c in classes]
+        dur = M.dur[np.ix_(scene_ids, rep)]
+        cost = M.cost[np.ix_(scene_ids, rep)]
+        ok = M.ok[np.ix_(scene_ids, rep)]
+        sizes = [len(c) for c in classes]
+        weights = np.cumprod([1] + [n + 1 for n in sizes[:-1]]).tolist()
+        n_states = weights[-1] * (sizes[-1] + 1)
+        states = np.arange(n_states, dtype=np.int64)
+        digits = [(states // w) % (n + 1) for w, n in zip(weights, sizes)]
+        used = np.sum(digits, axis=0)
+        deferred = len(scene_ids) - used
+
+        durs = np.unique(dur[ok])
+        tau = np.inf
+        best_j = np.inf
+        combos: List[List[int]] = []
+        solves = 0
+        while True:
+            allowed = ok & (dur <= tau)
+            if not allowed.any():
+                break
+            dp, choices = self._min_cost(dur, cost, allowed, digits, sizes, weights)
+            solves += 1
+            total = t.spent_cost + dp
+            with np.errstate(invalid="ignore"):
+                g = WC * total + WD * deferred + WB * np.maximum(0.0, total - t.budget)
+            g[0] = np.inf  # 전부 연기는 제외
+            m = int(np.argmin(g))
+            if not np.isfinite(g[m]) or g[m] >= best_j:
+                break
+            # 역추적
+            cmb = [-1] * t.scene_number
+            T = 0.0
+            for s in range(len(scene_ids) - 1, -1, -1):
+                k = int(choices[s][m])
+                if k >= 0:
+                    # class 안에서는 번호 순서대로 배정
+                    cmb[scene_ids[s]] = sub[classes[k][int(digits[k][m]) - 1]]
+                    T = max(T, float(dur[s, k]))
+                    m -= weights[k]
+            combos.append(cmb)
+            over_dl = max(0.0, (now_us + hours_to_us(T) - t.deadline_us) / US_PER_HOUR)
+            best_j = min(best_j, float(g.min()) + WT * T + WDL * over_dl)
+            k = int(np.searchsorted(durs, T, "left")) - 1
+            if k < 0:
+                break
+            tau = durs[k]
+
+        if verbose:
+            print(f"[DP] providers={len(sub)} classes={len(classes)} states={n_states} solves={solves}")
+        if not combos:
+            return None
+        okv, t_tot, cst, *_, score = ev.feasible_many(t, np.array(combos), now, ps)
+        i = int(np.argmax(score))
+        if not okv[i]:
+            return None
+        return combos[i], float(t_tot[i]), float(cst[i])
@@ -1,9 +1,18 @@
 # Core/Scheduler/combo_generator/brute_force.py
 from __future__ import annotations
 import math
+import time
 from functools import reduce
+from itertools import islice
 from operator import mul
-from Core.Scheduler.interface import ComboGenerator
+from typing import Dict
+
+import numpy as np
+
+from Core.Scheduler.interface import ComboGenerator, on_active_providers
+from Core.Scheduler.metric_evaluator.baseline import BaselineEvaluator
+from Core.Scheduler.provider_index import top_k_providers
+from utils.utils import to_epoch, hours_to_us, US_PER_HOUR
 
 try:
     from tqdm import tqdm
@@ -14,29 +23,88 @@ except Exception:  # pragma: no cover - fallback when tqdm is unavailable
 class BruteForceGenerator(ComboGenerator):
     """
     한 타임스텝에서 'provider당 최대 1개 씬'을 하드 제약.
-    씬별로 시간 짧은 상위 k 후보 + 연기(-1)를 조합해 탐색.
+    씬별로 지금 들어가는 provider 중 시간 짧은 상위 k 후보 + 연기(-1)를
+    조합해 탐색 (후보는 top_k_providers로 선택).
+    조합은 ``batch``개씩 묶어 ``evaluator.feasible_many``로 한 번에 평가.
+
+    ``mode="bnb"``(기본)는 BaselineEvaluator 가중치로 부분 조합의 낙관적
+    하한을 계산해 현재 최선보다 나빠질 수밖에 없는 가지를 잘라낸다.
+    열거 순서와 동점 처리는 ``mode="exhaustive"``와 같아서 결과도 같다.
+
+    ``symmetry=True``(기본)이면 같은 씬(행이 같은 씬)끼리는 후보 순서가
+    단조 증가하는 조합만, 같은 provider(열이 같은 provider)끼리는 번호가
+    작은 것부터 쓰는 조합만 열거한다 (멀티셋 열거). 나머지 조합은 이들의
+    순열이라 점수가 같고, 열거 순서상 처음 나오는 최선도 항상 남는다.
+
+    ``best_combo(..., deadline=)``(``time.monotonic()`` 값)을 주면 그 시각
+    이후 탐색을 멈추고 그때까지 찾은 최선을 반환한다. 마감은 호출마다
+    따로라서 여러 스레드가 동시에 불러도 된다.
+
+    ``search_stats[task id]``는 그 태스크의 마지막 호출에서 펼친 노드 수
+    (``"nodes"``)와 마감에 걸렸는지(``"timed_out"``)를 담는다.
+    bnb 모드는 좋은 조합을 먼저 찾으므로 anytime 탐색으로 쓸 수 있다.
     """
-    def __init__(self, kprov: int = 3):
+    MODES = ("bnb", "exhaustive")
+
+    def __init__(self, kprov: int = 3, batch: int = 4096, mode: str = "bnb", symmetry: bool = True):
+        if mode not in self.MODES:
+            raise ValueError(f"unknown mode {mode!r}; expected one of {self.MODES}")
         self.kprov = kprov
+        self.batch = batch
+        self.mode = mode
+        self.symmetry = symmetry
+        # task id -> {"nodes", "timed_out"} of its last best_combo call
+        self.search_stats: Dict[str, dict] = {}
+
+    def release(self, t):
+        self.search_stats.pop(t.id, None)
+
+    def _best_providers(self, t, ps, now, M, scene_ids):
+        """Per scene, the ``kprov`` shortest durations that fit now (ties by index)."""
+        kprov = max(1, min(self.kprov, len(ps)))
+        return top_k_providers(M, scene_ids, kprov)
+
+    def size_estimate(self, t, M, scene_ids, top):
+        """``prod(k_s + 1)`` over the scenes: combos incl. deferrals, an upper
+        bound of :meth:`time_complexity` that skips the provider-mask DP."""
+        kprov = max(1, min(self.kprov, M.dur.shape[1]))
+        return math.prod(len(top[sid][:kprov]) + 1.0 for sid in scene_ids)
+
+    @staticmethod
+    def _symmetries(M, scene_ids, cands):
+        """Previous equivalent scene (position in ``scene_ids``) of every scene
+        and previous equivalent provider of every candidate provider; -1 if none."""
+        prev_scene, last = [], {}
+        for idx, sid in enumerate(scene_ids):
+            key = (M.dur[sid].tobytes(), M.cost[sid].tobytes(), M.ok[sid].tobytes())
+            prev_scene.append(last.get(key, -1))
+            last[key] = idx
+        prev_prov, last = {}, {}
+        for p in sorted(cands):
+            key = (M.dur[scene_ids, p].tobytes(), M.cost[scene_ids, p].tobytes(), M.ok[scene_ids, p].tobytes())
+            prev_prov[p] = last.get(key, -1)
+            last[key] = p
+        return prev_scene, prev_prov
 
-    def _best_providers(self, t, ps, sid, ev, kprov=3):
-        cand = []
-        for p_idx, prov in enumerate(ps):
-            d, _ = ev.time_cost(t, sid, prov)
-            if math.isfinite(d) and d > 0:
-                cand.append((d, p_idx))
-        cand.sort(key=lambda x: x[0])
-        return [p for _, p in cand[:max(1, min(kprov, len(cand)))]]
+    @staticmethod
+    def _can_bound(ev) -> bool:
+        """Bounds are derived from BaselineEvaluator's scoring, so only use
+        them when that scoring is in effect and every weight is non-negative."""
+        return (
+            isinstance(ev, BaselineEvaluator)
+            and type(ev).feasible is BaselineEvaluator.feasible
+            and type(ev).efficiency is BaselineEvaluator.efficiency
+            and min(ev.WT, ev.WC, ev.WD, ev.WB, ev.WDL) >= 0
+        )
 
-    def time_complexity(self, t, ps, now, ev):
+    def time_complexity(self, t, ps, now, ev) -> int:
+        """Combos over the top-k candidates (excluding all-skip); bnb visits far
+        fewer nodes, see :attr:`search_stats`."""
         scene_ids = [i for i, (st, _) in enumerate(t.scene_allocation_data) if st is None]
         if not scene_ids:
             return 0
-        kprov = min(self.kprov, len(ps))
-        feasible: list[list[int]] = []
-        for sid in scene_ids:
-            cands = self._best_providers(t, ps, sid, ev, kprov=kprov)
-            feasible.append(cands)
+        top = self._best_providers(t, ps, now, ev.scene_matrices(t, now, ps), scene_ids)
+        feasible: list[list[int]] = [top[sid] for sid in scene_ids]
 
         # Iterative dynamic programming to count assignments while enforcing
         # the "one scene per provider" constraint. ``dp`` maps a bitmask of
@@ -54,18 +122,22 @@ class BruteForceGenerator(ComboGenerator):
             dp = new_dp
         return sum(dp.values()) - 1
 
-    def best_combo(self, t, ps, now, ev, verbose=False):
+    def best_combo(self, t, ps, now, ev, verbose=False, active=None, deadline: float | None = None):
+        if active is not None:
+            return on_active_providers(self.best_combo, t, ps, now, ev, verbose, active,
+                                       deadline=deadline)
         # 미배정 씬만
         scene_ids = [i for i, (st, _) in enumerate(t.scene_allocation_data) if st is None]
         if not scene_ids:
             return None
 
         # 씬별 후보: 시간 짧은 상위 k + skip(-1)
-        kprov = min(self.kprov, len(ps))
+        bnb = self.mode == "bnb" and self._can_bound(ev)
+        M = ev.scene_matrices(t, now, ps)
+        top = self._best_providers(t, ps, now, M, scene_ids)
         cand_lists = []
         for sid in scene_ids:
-            cands = self._best_providers(t, ps, sid, ev, kprov=kprov)
-            cands.append(-1)  # 연기 옵션
+            cands = top[sid] + [-1]  # 연기 옵션
             cand_lists.append((sid, cands))
 
         # Total number of unique combinations (excluding all-skip) for progress
@@ -81,33 +153,93 @@ class BruteForceGenerator(ComboGenerator):
         best_score = float("-inf")
         best_res = None
 
-        def generate(idx: int, used: set[int], cmb: list[int]):
-            if idx == len(cand_lists):
-                if any(pid != -1 for pid in cmb):
+        # ---- branch-and-bound: J = -score를 최소화 ----
+        # J = WT*T + WC*cost + WD*D + WB*over_budget + WDL*over_deadline 는
+        # makespan T, 비용, 연기 수에 대해 단조 증가. 남은 씬 j는 최소
+        # min(WD, WC*cmin_j)를 더하므로 suffix[idx]까지 더한 값이 하한.
+        n = len(cand_lists)
+        now_us = to_epoch(now)
+        suffix = [0.0] * (n + 1)
+        if bnb:
+            for idx in range(n - 1, -1, -1):
+                sid, cands = cand_lists[idx]
+                extra = ev.WD
+                for pid in cands[:-1]:
+                    extra = min(extra, ev.WC * float(M.cost[sid, pid]))
+                suffix[idx] = suffix[idx + 1] + extra
+
+        def partial_j(T, C, D):
+            cost = t.spent_cost + C
+            over_dl = max(0.0, (now_us + hours_to_us(T) - t.deadline_us) / US_PER_HOUR)
+            return (
+                ev.WT * T + ev.WC * cost + ev.WD * D +
+                ev.WB * max(0.0, cost - t.budget) + ev.WDL * over_dl
+            )
+
+        # 대칭 제거: 같은 씬은 후보 위치가 단조 증가, 같은 provider는 번호 순서대로
+        if self.symmetry:
+            prev_scene, prev_prov = self._symmetries(
+                M, scene_ids, {p for _, c in cand_lists for p in c if p != -1})
+        else:
+            prev_scene, prev_prov = [-1] * n, {}
+        pos = [0] * n  # 씬별로 고른 후보 위치
+
+        best_j = float("inf")
+        nodes = 0
+        timed_out = False
+
+        def generate(idx: int, used: set[int], cmb: list[int], T: float, C: float, D: int):
+            nonlocal best_j, nodes, timed_out
+            nodes += 1
+            if deadline is not None and (timed_out or time.monotonic() > deadline):
+                timed_out = True
+                return
+            if bnb:
+                j = partial_j(T, C, D)
+                # 동점 가능성이 있는 가지는 남겨 둔다 (부동소수 오차 여유 포함)
+                if j + suffix[idx] > best_j + 1e-9 * max(1.0, abs(best_j)):
+                    return
+            if idx == n:
+                if D < n:
+                    if bnb:
+                        best_j = min(best_j, j)
                     yield cmb.copy()
                 return
             sid, candidates = cand_lists[idx]
-            for pid in candidates:
-                if pid != -1 and pid in used:
-                    continue
+            first = pos[prev_scene[idx]] if prev_scene[idx] >= 0 else 0
+            for k in range(first, len(candidates)):
+                pid = candidates[k]
+                if pid != -1:
+                    q = prev_prov.get(pid, -1)
+                    if pid in used or (q != -1 and q not in used):
+                        continue
+                pos[idx] = k
                 cmb[sid] = pid
                 if pid != -1:
                     used.add(pid)
-                yield from generate(idx + 1, used, cmb)
-                if pid != -1:
+                    yield from generate(idx + 1, used, cmb,
+                                        max(T, float(M.dur[sid, pid])), C + float(M.cost[sid, pid]), D)
                     used.remove(pid)
+                else:
+                    yield from generate(idx + 1, used, cmb, T, C, D + 1)
                 cmb[sid] = -1
 
-        iterator = generate(0, set(), [-1] * t.scene_number)
+        iterator = generate(0, set(), [-1] * t.scene_number, 0.0, 0.0, 0)
         if iter_total is not None:
             iterator = tqdm(iterator, total=iter_total, disable=not verbose)
-        for cmb in iterator:
-            ok, t_tot, cost, deferred, overB, overDL = ev.feasible(t, cmb, now, ps)
-            if not ok:
-                continue
-            score = ev.efficiency(t, cmb, ps, now, t_tot, cost, deferred, overB, overDL)
-            if score > best_score:
-                best_score = score
-                best_res = (cmb, t_tot, cost)
+        while True:
+            chunk = list(islice(iterator, self.batch))
+            if not chunk:
+                break
+            ok, t_tot, cost, *_, score = ev.feasible_many(t, np.array(chunk), now, ps)
+            # argmax returns the first best row, keeping enumeration order on ties
+            i = int(np.argmax(score))
+            if ok[i] and score[i] > best_score:
+                best_score = float(score[i])
+                best_res = (chunk[i], float(t_tot[i]), float(cost[i]))
 
+        self.search_stats[t.id] = {"nodes": nodes, "timed_out": timed_out}
+        if verbose:
+            print(f"[BF] mode={'bnb' if bnb else 'exhaustive'} nodes visited={nodes} "
+                  f"(search space={iter_total})")
         return best_res
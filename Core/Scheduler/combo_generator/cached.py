@@ -0,0 +1,127 @@
+# Core/Scheduler/combo_generator/cached.py
+from __future__ import annotations
+from typing import Hashable, List, Tuple
+
+import numpy as np
+
+from Core.Scheduler.interface import ComboGenerator
+from utils.cache import BoundedCache
+from utils.utils import hours_to_us, to_epoch
+
+_NONE = object()  # cached "no combo" result
+
+
+class CachedComboGenerator(ComboGenerator):
+    """Memoise ``best_combo`` of any generator by a canonical problem signature.
+
+    The signature describes the step's subproblem up to renaming providers:
+
+    * the task's unassigned scene sizes (in scene order), global file size,
+      workload, bandwidth and spent cost;
+    * the remaining budget and deadline slack, or ``None`` once they are
+      too large to bind for any placement this step;
+    * one profile per provider that can run at least one scene now:
+      throughput, bandwidth, price, whether it hosts the task's global file,
+      and which scenes fit its current window. Profiles are sorted, so
+      providers with equal profiles form interchangeable classes.
+
+    The wrapped generator always solves the canonical subproblem (the
+    providers in profile order), so equal signatures give equal results,
+    and a hit is mapped back onto the current providers. Providers that
+    cannot run any scene are dropped from it. Ties between
+    providers may therefore break differently than with the bare
+    generator. Generators with ``subset_safe = False`` read assigned scenes
+    by provider index; for them, tasks with assigned scenes bypass the cache.
+
+    Everything else (``last_solve``, ...) is delegated to the wrapped
+    generator. Joint generators (with ``best_combos``) solve all tasks at
+    once, which a per-task memo cannot serve, so they are refused.
+    """
+
+    def __init__(self, inner: ComboGenerator, cache_size: int = 4096):
+        if hasattr(inner, "best_combos"):
+            raise ValueError(f"cannot memoise the joint generator {type(inner).__name__}")
+        self.inner = inner
+        self._memo = BoundedCache(cache_size)
+        self.bypassed = 0
+
+    def __getattr__(self, name):
+        # Only called for attributes not found on the wrapper
+        if name == "inner":
+            raise AttributeError(name)
+        return getattr(self.inner, name)
+
+    # --- signature -------------------------------------------------------
+    @staticmethod
+    def signature(t, ps, now, ev, M=None) -> Tuple[Hashable, List[int], List[int]]:
+        """``(key, scene_ids, providers in canonical order)`` at ``now``."""
+        now = to_epoch(now)
+        M = ev.scene_matrices(t, now, ps) if M is None else M
+        scene_ids = [i for i, (st, _) in enumerate(t.scene_allocation_data) if st is None]
+        ok = M.ok[scene_ids]
+        rel = np.flatnonzero(ok.any(axis=0)).tolist()
+        profiles = sorted(
+            ((ps[p].throughput, ps[p].bandwidth, ps[p].price_per_gpu_hour,
+              t.id in ps[p].hosted, ok[:, p].tobytes()), p)
+            for p in rel
+        )
+        order = [p for _, p in profiles]
+
+        # 예산/데드라인은 이번 스텝에 걸릴 수 있을 때만 구분
+        dur = np.where(ok, M.dur[scene_ids], 0.0)[:, rel]
+        cost = np.where(ok, M.cost[scene_ids], 0.0)[:, rel]
+        max_dur = float(dur.max()) if dur.size else 0.0
+        max_cost = float(cost.max(axis=1).sum()) if cost.size else 0.0
+        slack = t.deadline_us - now
+        budget = t.budget - t.spent_cost
+        key = (
+            id(ev),
+            tuple(t.scene_size(s) for s in scene_ids),
+            t.global_file_size, t.scene_workload, t.bandwidth, t.spent_cost,
+            budget if budget <= max_cost * (1 + 1e-9) else None,
+            slack if slack < hours_to_us(max_dur) + 1 else None,
+            tuple(prof for prof, _ in profiles),
+        )
+        return key, scene_ids, order
+
+    # --- interface -------------------------------------------------------
+    def release(self, t):
+        self.inner.release(t)
+
+    def close(self):
+        self.inner.close()
+
+    def cache_stats(self):
+        stats = dict(self.inner.cache_stats())
+        stats.update({f"memo_{k}": v for k, v in self._memo.stats().items()})
+        stats["memo_bypassed"] = self.bypassed
+        return stats
+
+    def time_complexity(self, t, ps, now, ev):
+        return self.inner.time_complexity(t, ps, now, ev)
+
+    def best_combo(self, t, ps, now, ev, verbose=False, active=None):
+        partial = any(st is not None for st, _ in t.scene_allocation_data)
+        if partial and not getattr(self.inner, "subset_safe", True):
+            self.bypassed += 1
+            return self.inner.best_combo(t, ps, now, ev, verbose, active=active)
+
+        # active는 필요 없음: 지금 들어가는 provider만 시그니처에 포함
+        key, scene_ids, order = self.signature(t, ps, now, ev)
+        hit = self._memo.get(key)
+        if hit is None:
+            res = self.inner.best_combo(t, [ps[p] for p in order], now, ev, verbose)
+            if res is None:
+                self._memo.put(key, _NONE)
+                return None
+            cmb, t_tot, cost = res
+            self._memo.put(key, (tuple(cmb[s] for s in scene_ids), t_tot, cost))
+            return [order[p] if p >= 0 else -1 for p in cmb], t_tot, cost
+        if hit is _NONE:
+            return None
+        placed, t_tot, cost = hit
+        cmb = [-1] * t.scene_number
+        for s, p in zip(scene_ids, placed):
+            if p >= 0:
+                cmb[s] = order[p]
+        return cmb, t_tot, cost
@@ -0,0 +1,139 @@
+# Core/Scheduler/combo_generator/cp_joint.py
+from __future__ import annotations
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from Core.Scheduler.interface import objective_weights
+from Core.Scheduler.combo_generator.cpsat import CPSatComboGenerator
+from Core.Scheduler.combo_generator.cp_utils import SCALE, BIG, WS, budget_left
+from utils.utils import to_epoch, US_PER_SEC
+
+
+class JointCPSatComboGenerator(CPSatComboGenerator):
+    """One CP-SAT model for all waiting tasks of a step (algo ``"cp_joint"``).
+
+    Every unassigned (scene, provider) pair that can start now becomes a
+    boolean. Each scene takes at most one provider, and each provider takes
+    at most one scene *across all tasks*. The objective is the sum of the
+    per-task ``BaselineEvaluator`` scores (makespan, cost, deferrals,
+    budget and deadline overruns). Tasks no longer compete in selector
+    order, and a step costs one solve instead of one per task.
+
+    Like the per-task generators, which never return an all-deferred combo,
+    the model is work-conserving: a task may place nothing only if every
+    provider it could use is taken by another task.
+
+    The scheduler calls :meth:`best_combos` once per step when the
+    generator provides it. Solver parameters are those of
+    :class:`CPSatComboGenerator`. ``last_solve`` records the status, wall
+    time, objective, best bound and relative gap of the latest solve.
+    """
+
+    def best_combo(self, t, ps, now, ev, verbose=False, active=None):
+        return self.best_combos([t], ps, now, ev, verbose, active).get(t.id)
+
+    def best_combos(
+        self, tasks: Sequence, ps, now, ev, verbose: bool = False,
+        active: Optional[Sequence[int]] = None,
+    ) -> Dict[str, Optional[Tuple[List[int], float, float]]]:
+        now = to_epoch(now)
+        live = None
+        if active is not None:
+            live = np.zeros(len(ps), dtype=bool)
+            live[list(active)] = True
+        WT, WC, WD, WB, WDL = objective_weights(ev)
+        c_time = round(WT * WS)                   # per ms of makespan
+        c_late = round(WDL * WS)                  # per ms past the deadline
+        c_cost = round(WC * 3600 * WS)            # per milli-USD
+        c_over = round(WB * 3600 * WS)            # per milli-USD over budget
+        c_defer = round(WD * 3600 * SCALE * WS)   # per deferred scene
+
+        m = cp_model.CpModel()
+        per_prov: Dict[int, list] = {}
+        pairs: Dict[str, List[Tuple[int, int, object]]] = {}
+        usable: List[Tuple[list, set]] = []  # (task literals, providers it could use)
+        objective = []
+        for t in tasks:
+            M = ev.scene_matrices(t, now, ps)
+            sids, pids = np.nonzero(M.ok if live is None else M.ok & live)
+            if len(sids) == 0:
+                pairs[t.id] = []
+                continue
+            dur_ms = np.rint(M.dur[sids, pids] * 3600 * SCALE).astype(np.int64).tolist()
+            cost_m = np.rint(M.cost[sids, pids] * SCALE).astype(np.int64).tolist()
+
+            xs = []
+            per_scene: Dict[int, list] = {}
+            for s, p, d, c in zip(sids.tolist(), pids.tolist(), dur_ms, cost_m):
+                x = m.NewBoolVar(f"x_{t.id}_{s}_{p}")
+                xs.append((s, p, x, d, c))
+                per_scene.setdefault(s, []).append(x)
+                per_prov.setdefault(p, []).append(x)
+            for lits in per_scene.values():
+                m.AddAtMostOne(lits)
+            pairs[t.id] = [(s, p, x) for s, p, x, _, _ in xs]
+            usable.append(([x for _, _, x, _, _ in xs], set(pids.tolist())))
+
+            n_unassigned = sum(st is None for st, _ in t.scene_allocation_data)
+            makespan = m.NewIntVar(0, BIG, f"T_{t.id}")
+            for _, _, x, d, _ in xs:
+                m.Add(makespan >= d * x)
+            cost = sum(c * x for _, _, x, _, c in xs)
+            placed = sum(x for _, _, x, _, _ in xs)
+
+            window = int((t.deadline_us - now) * SCALE / US_PER_SEC)
+            over_deadline = m.NewIntVar(0, BIG, f"OD_{t.id}")
+            m.Add(over_deadline >= makespan - window)
+
+            objective += [
+                c_time * makespan,
+                c_cost * cost,
+                c_defer * (n_unassigned - placed),
+                c_late * over_deadline,
+            ]
+            left = budget_left(t)
+            if left is not None:  # 예산이 없으면(inf) 초과 항도 없음
+                over_budget = m.NewIntVar(0, BIG, f"OB_{t.id}")
+                m.Add(over_budget >= cost - left)
+                objective.append(c_over * over_budget)
+        # 공유 자원: provider당 이번 스텝 1개 씬 (모든 task 합산)
+        for lits in per_prov.values():
+            m.AddAtMostOne(lits)
+        # 전부 연기는 쓸 수 있는 provider가 모두 찼을 때만
+        for lits, provs in usable:
+            for p in provs:
+                m.AddBoolOr(lits + per_prov[p])
+        m.Minimize(sum(objective))
+
+        solver = self._solver(verbose)
+        status = solver.Solve(m)
+        found = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+        obj = solver.ObjectiveValue() if found else float("nan")
+        bound = solver.BestObjectiveBound() if found else float("nan")
+        self.last_solve = {
+            "status": solver.StatusName(status),
+            "wall_time": solver.WallTime(),
+            "tasks": len(tasks),
+            "vars": sum(len(v) for v in pairs.values()),
+            "objective": obj,
+            "bound": bound,
+            "gap": abs(obj - bound) / max(1.0, abs(obj)) if found else float("nan"),
+        }
+        if verbose:
+            print(f"[CP-JOINT] {self.last_solve}")
+
+        out: Dict[str, Optional[Tuple[List[int], float, float]]] = {}
+        for t in tasks:
+            cmb = [-1] * t.scene_number
+            if found:
+                for s, p, x in pairs[t.id]:
+                    if solver.BooleanValue(x):
+                        cmb[s] = p
+            if all(p == -1 for p in cmb):
+                out[t.id] = None
+                continue
+            ok, t_tot, cost, *_ = ev.feasible(t, cmb, now, ps)
+            out[t.id] = (cmb, t_tot, cost) if ok else None
+        return out
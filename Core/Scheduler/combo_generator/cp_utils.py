@@ -0,0 +1,40 @@
+# Core/Scheduler/combo_generator/cp_utils.py
+"""Pieces shared by the CP-SAT models (per task, joint and lookahead)."""
+from __future__ import annotations
+import math
+from typing import Optional
+
+from ortools.sat.python import cp_model
+
+# Integer scaling: durations in ms (hours * 3600 * SCALE), costs in milli-USD
+SCALE = 1000
+BIG = 10**9
+# Objective scale of the CP-SAT models: multiplying the score by
+# 3600 * SCALE * WS gives integer coefficients
+WS = 100
+
+
+def make_solver(time_limit: float, num_workers: int | None = None, relative_gap: float | None = None,
+                random_seed: int | None = None, verbose: bool = False) -> cp_model.CpSolver:
+    """CP-SAT solver with the given parameters; ``None`` keeps the default."""
+    solver = cp_model.CpSolver()
+    prm = solver.parameters
+    if verbose:
+        prm.log_search_progress = True
+    prm.max_time_in_seconds = time_limit
+    if num_workers is not None:
+        prm.num_workers = num_workers
+    if relative_gap is not None:
+        prm.relative_gap_limit = relative_gap
+    if random_seed is not None:
+        prm.random_seed = random_seed
+    return solver
+
+
+def budget_left(t) -> Optional[int]:
+    """Remaining budget of ``t`` in milli-USD, clamped to ``[0, BIG]``;
+    ``None`` when the task has no budget (``inf``)."""
+    left = t.budget - t.spent_cost
+    if not math.isfinite(left):
+        return None
+    return max(0, min(BIG, int(left * SCALE)))
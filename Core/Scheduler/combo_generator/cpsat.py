@@ -1,64 +1,40 @@
 # Core/Scheduler/combo_generator/cpsat.py
 from __future__ import annotations
 import math
-import datetime as dt
 from typing import List, Tuple
+import numpy as np
 from ortools.sat.python import cp_model
 
-from Core.Scheduler.interface import ComboGenerator
+from Core.Scheduler.interface import ComboGenerator, objective_weights
+from Core.Scheduler.combo_generator.greedy import GreedyComboGenerator
+from Core.Scheduler.metric_evaluator.baseline import BaselineEvaluator
+from utils.cache import BoundedCache
+from Core.Scheduler.combo_generator.cp_utils import (
+    SCALE as _SCALE, BIG as _BIG, WS as _WS, budget_left, make_solver,
+)
+from utils.utils import to_epoch, US_PER_SEC
 
-_SCALE = 1000
-_BIG   = 10**9
 
+def _set_domain(m, var, lo: int, hi: int) -> None:
+    """Change the [lo, hi] domain of ``var`` in place (model reuse)."""
+    dom = m.Proto().variables[var.Index()].domain
+    dom[0], dom[1] = lo, hi
 
-def _cap_now_hours_from_avail(prov, now: dt.datetime) -> float:
-    """Length of current available window starting at now (hours)."""
-    for s, e in getattr(prov, "available_hours", []):
-        if s <= now < e:
-            return max(0.0, (e - now).total_seconds() / 3600.0)
-    return 0.0
 
+def _build_model_skeleton(t, ps, M):
+    """Model for ``t`` on ``ps`` built from ``SceneMatrices`` M.
 
-def _build_common_model(t, ps, now):
+    Only the task/provider state enters the constraints. What changes with
+    the simulation clock (which pairs fit the current window, the time left
+    to the deadline, the remaining budget) is carried by variable domains
+    and set by :func:`_set_instant`, so the model can be solved again at a
+    later step.
+    """
     S, P = t.scene_number, len(ps)
-    TOT  = [[0.0]*P for _ in range(S)]
-    COST = [[0.0]*P for _ in range(S)]
-    PROF = [[0.0]*P for _ in range(S)]
-
-    cap_hours = [_cap_now_hours_from_avail(prov, now) for prov in ps]
-    for s in range(S):
-        for p in range(P):
-            prov = ps[p]
-            bw   = min(t.bandwidth, prov.bandwidth)
-            thr  = getattr(prov, "throughput", 0.0)
-            if bw <= 0 or thr <= 0:
-                tx = cmp = float("inf")
-            else:
-                has_global = any(rec[0] == t.id for rec in getattr(prov, "schedule", []))
-                size = t.scene_size(s)
-                if not has_global:
-                    size += t.global_file_size
-                tx = size / bw / 3600.0
-                cmp = t.scene_workload / thr
-            tot = tx + cmp
-            if tot - 1e-9 > cap_hours[p]:
-                tot = float("inf")
-            TOT[s][p]  = tot
-            COST[s][p] = tot * prov.price_per_gpu_hour if math.isfinite(tot) else float("inf")
-            PROF[s][p] = prov.price_per_gpu_hour
-
-    # 이미 사용한 비용(부분 배정)
-    spent = 0.0
-    for prov in ps:
-        for rec in getattr(prov, "schedule", []):
-            if len(rec) == 3:
-                tid, st, ft = rec
-            else:
-                tid, _, st, ft = rec
-            if tid == t.id:
-                spent += ((ft - st).total_seconds()/3600.0) * prov.price_per_gpu_hour
-    remaining_budget = max(0.0, t.budget - spent)
-    window_sec = int((t.deadline - now).total_seconds() * _SCALE)
+    price = np.array([prov.price_per_gpu_hour for prov in ps], dtype=float)
+    TOT  = M.dur.tolist()
+    COST = np.where(np.isfinite(M.dur), M.dur * price, np.inf).tolist()
+    PROF = np.broadcast_to(price, (S, P)).tolist()
 
     m = cp_model.CpModel()
     x = [[m.NewBoolVar(f"x{s}_{p}") for p in range(P)] for s in range(S)]
@@ -99,26 +75,187 @@ def _build_common_model(t, ps, now):
     makespan = m.NewIntVar(0, _BIG, "makespan")
     m.AddMaxEquality(makespan, prov_time)
 
+    # 시각에 따라 바뀌는 값: 남은 예산, 데드라인까지 남은 시간 (도메인으로 고정)
+    budget = m.NewIntVar(0, _BIG, "budget")
+    window = m.NewIntVar(-_BIG, _BIG, "window")
+
     total_cost = m.NewIntVar(0, _BIG, "total_cost")
     m.Add(total_cost == sum(cost_int[s][p] * x[s][p] for s in range(S) for p in range(P)))
     over_budget = m.NewIntVar(0, _BIG, "over_budget")
-    m.Add(over_budget >= total_cost - int(remaining_budget * _SCALE))
+    m.Add(over_budget >= total_cost - budget)
     over_deadline = m.NewIntVar(0, _BIG, "over_deadline")
-    m.Add(over_deadline >= makespan - window_sec)
+    m.Add(over_deadline >= makespan - window)
+
+    return m, x, y, tot_int, cost_int, prof_int, total_cost, makespan, over_budget, over_deadline, budget, window
+
+
+def _add_symmetry_breaking(m, x, y, t, M, tot_int, cost_int):
+    """Symmetry-breaking constraints for a model from :func:`_build_model_skeleton`.
+
+    Unassigned scenes with identical rows are interchangeable: the earlier
+    one is placed whenever the later one is, on a lower provider index.
+    Providers with identical columns are interchangeable while the same
+    scenes fit their windows: the lower index is used first. That holds
+    only at some instants, so each such pair gets an enforcement literal
+    that :func:`_set_instant` switches. Every solution can be permuted
+    into one that satisfies both, so the optimum is unchanged.
+
+    Returns ``(scene groups, [(literal, q, p), ...])``.
+    """
+    S = len(x)
+    P = len(x[0]) if S else 0
+    unassigned = [s for s in range(S) if t.scene_allocation_data[s][0] is None]
+    groups = {}
+    for s in unassigned:
+        groups.setdefault((M.dur[s].tobytes(), M.cost[s].tobytes()), []).append(s)
+    scene_groups = [g for g in groups.values() if len(g) > 1]
+    for g in scene_groups:
+        for a, b in zip(g, g[1:]):
+            m.Add(y[a] >= y[b])
+            m.Add(
+                sum(p * x[a][p] for p in range(P)) + 1 <= sum(p * x[b][p] for p in range(P))
+            ).OnlyEnforceIf(y[b])
+
+    pairs = []
+    last = {}
+    for p in range(P):
+        key = tuple((tot_int[s][p], cost_int[s][p]) for s in range(S))
+        q = last.get(key)
+        if q is not None:
+            e = m.NewBoolVar(f"sym_{q}_{p}")
+            m.Add(sum(x[s][q] for s in range(S)) >= sum(x[s][p] for s in range(S))).OnlyEnforceIf(e)
+            pairs.append((e, q, p))
+        last[key] = p
+    return scene_groups, pairs
+
+
+def _canonical(cmb, scene_groups, prov_classes):
+    """Permute ``cmb`` into the representative kept by :func:`_add_symmetry_breaking`."""
+    cmb = list(cmb)
+    for cls in prov_classes:
+        members = set(cls)
+        used = [s for s, p in enumerate(cmb) if p in members]
+        for s, p in zip(used, cls):
+            cmb[s] = p
+    for g in scene_groups:
+        placed = sorted(cmb[s] for s in g if cmb[s] != -1)
+        for i, s in enumerate(g):
+            cmb[s] = placed[i] if i < len(placed) else -1
+    return cmb
+
+
+def _set_instant(m, x, budget, window, t, now: int, M, sym=()) -> None:
+    """Fix the time-dependent domains of a model from :func:`_build_model_skeleton`.
+
+    ``sym`` are the provider pairs of :func:`_add_symmetry_breaking`; a pair
+    is ordered only if the same scenes fit both windows now.
+    """
+    window_sec = int((t.deadline_us - now) * _SCALE / US_PER_SEC)
+    v = budget_left(t)
+    v = _BIG if v is None else v
+    _set_domain(m, budget, v, v)
+    v = max(-_BIG, min(_BIG, window_sec))
+    _set_domain(m, window, v, v)
+    # 지금 가용구간에 안 들어가는 쌍은 이번 호출에서만 금지
+    with np.errstate(invalid="ignore"):
+        too_long = M.dur - 1e-9 > M.cap
+    for s in range(t.scene_number):
+        if t.scene_allocation_data[s][0] is not None:
+            continue
+        for p in range(len(x[s])):
+            _set_domain(m, x[s][p], 0, 0 if too_long[s, p] else 1)
+    unassigned = [s for s in range(t.scene_number) if t.scene_allocation_data[s][0] is None]
+    for e, q, p in sym:
+        v = int(np.array_equal(too_long[unassigned, q], too_long[unassigned, p]))
+        _set_domain(m, e, v, v)
+
+
+def _build_common_model(t, ps, now, ev=None):
+    """One-off model at ``now`` (skeleton + time-dependent domains)."""
+    now = to_epoch(now)
+    M = (ev if ev is not None else BaselineEvaluator()).scene_matrices(t, now, ps)
+    m, x, y, *rest = _build_model_skeleton(t, ps, M)
+    budget, window = rest[-2:]
+    _set_instant(m, x, budget, window, t, now, M)
+    return (m, x, y, *rest[:-2])
+
+
+class _TaskModel:
+    """A built CP-SAT model for one task and its last solution."""
+    __slots__ = ("m", "x", "y", "budget", "window", "scene_groups", "sym", "last")
+
+    def __init__(self, m, x, y, budget, window, scene_groups=(), sym=()):
+        self.m, self.x, self.y = m, x, y
+        self.budget, self.window = budget, window
+        self.scene_groups, self.sym = scene_groups, sym  # see _add_symmetry_breaking
+        self.last = None  # combo of the previous solve, used as hint
 
-    return m, x, y, tot_int, cost_int, prof_int, total_cost, makespan, over_budget, over_deadline
 
 class CPSatComboGenerator(ComboGenerator):
+    """Exact per-task CP-SAT model.
+
+    Built models are cached per task and reused while the task and provider
+    state is unchanged (key: unassigned scenes + ``Provider.version`` of every
+    provider), only the time-dependent domains are refreshed. Each solve is
+    hinted with the previous solution of the same model, or the greedy combo
+    for a fresh model. Solver parameters: ``num_workers``, ``time_limit``
+    (seconds), ``relative_gap`` and ``random_seed``; ``None`` keeps the
+    CP-SAT default. ``symmetry`` adds the constraints of
+    :func:`_add_symmetry_breaking`.
+    """
+
+    subset_safe = False  # 배정된 씬은 provider 인덱스로 고정
+
+    def __init__(
+        self,
+        num_workers: int | None = None,
+        time_limit: float = 10.0,
+        relative_gap: float | None = None,
+        random_seed: int | None = None,
+        hint: bool = True,
+        cache_size: int = 64,
+        symmetry: bool = True,
+    ):
+        self.num_workers = num_workers
+        self.time_limit = time_limit
+        self.relative_gap = relative_gap
+        self.random_seed = random_seed
+        self.hint = hint
+        self.symmetry = symmetry
+        self._models = BoundedCache(cache_size)
+        self._greedy = GreedyComboGenerator()
+        self.last_solve: dict = {}
+
+    def release(self, t):
+        self._models.drop(t.id)
+
+    def cache_stats(self):
+        return self._models.stats()
+
+    def _solver(self, verbose=False, time_limit: float | None = None) -> cp_model.CpSolver:
+        return make_solver(self.time_limit if time_limit is None else time_limit,
+                            self.num_workers, self.relative_gap, self.random_seed, verbose)
+
+    def _task_model(self, t, ps, M, ev) -> _TaskModel:
+        key = (
+            t.id,
+            tuple(id(p) for p in ps),
+            tuple(p.version for p in ps),
+            tuple(st is None for st, _ in t.scene_allocation_data),
+        )
+        tm = self._models.get(key)
+        if tm is not None:
+            return tm
+        # Provider versions only grow, so older models of this task are dead
+        self._models.drop(t.id)
+        tm = self._build_task_model(t, ps, M, ev)
+        self._models.put(key, tm, t.id)
+        return tm
+
     def time_complexity(self, t, ps, now, ev):
         unassigned = [i for i, (st, _) in enumerate(t.scene_allocation_data) if st is None]
-        feasible = []
-        for sid in unassigned:
-            cands = []
-            for p_idx, prov in enumerate(ps):
-                d, _ = ev.time_cost(t, sid, prov)
-                if math.isfinite(d) and d > 0 and _cap_now_hours_from_avail(prov, now) >= d:
-                    cands.append(p_idx)
-            feasible.append(cands)
+        ok = ev.scene_matrices(t, now, ps).ok
+        feasible = [np.flatnonzero(ok[sid]).tolist() for sid in unassigned]
 
         # Use iterative dynamic programming instead of recursion to avoid
         # hitting Python's recursion depth limit when many scenes are
@@ -135,13 +272,12 @@ class CPSatComboGenerator(ComboGenerator):
                         new_dp[new_mask] = new_dp.get(new_mask, 0) + cnt
             dp = new_dp
         return sum(dp.values()) - 1
-    def best_combo(self, t, ps, now, ev, verbose=False):
-        if verbose:
-            space = self.time_complexity(t, ps, now, ev)
-            print(f"[CP] search space={space}")
-
-        m, x, y, *_rest = _build_common_model(t, ps, now)
-        total_cost, makespan, over_budget, over_deadline = _rest[-4:]
+    def _build_task_model(self, t, ps, M, ev) -> _TaskModel:
+        m, x, y, tot_int, cost_int, *_rest = _build_model_skeleton(t, ps, M)
+        total_cost, makespan, over_budget, over_deadline, budget, window = _rest[-6:]
+        scene_groups, sym = (
+            _add_symmetry_breaking(m, x, y, t, M, tot_int, cost_int) if self.symmetry else ([], [])
+        )
 
         # 미배치 씬 수
         unassigned = [s for s in range(t.scene_number)
@@ -153,31 +289,69 @@ class CPSatComboGenerator(ComboGenerator):
         else:
             deferred = m.NewIntVar(0, 0, "deferred")
 
-        # 시간/데드라인 초과를 시간 단위로 변환
-        makespan_h = m.NewIntVar(0, _BIG, "makespan_h")
-        m.Add(makespan_h * 3600 == makespan)
-        over_deadline_h = m.NewIntVar(0, _BIG, "over_deadline_h")
-        m.Add(over_deadline_h * 3600 == over_deadline)
-
-        wt = getattr(ev, "WT", 1.0)
-        wc = getattr(ev, "WC", 1.0)
-        wd = getattr(ev, "WD", 1.0)
-        wb = getattr(ev, "WB", 1.0)
-        wdl = getattr(ev, "WDL", 1.0)
-
+        # 평가기 점수(시간 단위 가중합)에 3600 * SCALE * WS를 곱한 정수 계수:
+        # makespan/데드라인 초과는 ms, 비용은 milli-USD 그대로 씀
+        wt, wc, wd, wb, wdl = objective_weights(ev)
         m.Minimize(
-            int(wt * _SCALE) * makespan_h +
-            int(wc * _SCALE) * total_cost +
-            int(wd * _SCALE) * deferred +
-            int(wb * _SCALE) * over_budget +
-            int(wdl * _SCALE) * over_deadline_h
+            round(wt * _WS) * makespan +
+            round(wc * 3600 * _WS) * total_cost +
+            round(wd * 3600 * _SCALE * _WS) * deferred +
+            round(wb * 3600 * _WS) * over_budget +
+            round(wdl * _WS) * over_deadline
         )
+        return _TaskModel(m, x, y, budget, window, scene_groups, sym)
+
+    def _add_hint(self, tm: _TaskModel, t, ps, now, ev) -> None:
+        tm.m.ClearHints()
+        cmb = tm.last
+        if cmb is None:
+            res = self._greedy.best_combo(t, ps, now, ev)
+            cmb = res[0] if res is not None else [-1] * t.scene_number
+        if tm.scene_groups or tm.sym:
+            # 힌트도 대칭 제약을 만족하도록 대표 조합으로
+            classes, where = [], {}
+            for e, q, p in tm.sym:
+                if tm.m.Proto().variables[e.Index()].domain[0] == 1:
+                    cls = where.get(q)
+                    if cls is None:
+                        cls = where[q] = [q]
+                        classes.append(cls)
+                    cls.append(p)
+                    where[p] = cls
+            cmb = _canonical(cmb, tm.scene_groups, classes)
+        for s in range(t.scene_number):
+            if t.scene_allocation_data[s][0] is not None:
+                continue
+            for p in range(len(ps)):
+                tm.m.AddHint(tm.x[s][p], 1 if cmb[s] == p else 0)
+            tm.m.AddHint(tm.y[s], 1 if cmb[s] != -1 else 0)
+
+    def best_combo(self, t, ps, now, ev, verbose=False, active=None, time_limit: float | None = None):
+        # ``active`` is ignored: cached models are built over the full
+        # provider list (assigned scenes are pinned by provider index), and
+        # inactive providers are already fixed to 0 by _set_instant.
+        # ``time_limit`` overrides the generator's for this call only.
+        if verbose:
+            space = self.time_complexity(t, ps, now, ev)
+            print(f"[CP] search space={space}")
+
+        now = to_epoch(now)
+        M = ev.scene_matrices(t, now, ps)
+        builds = self._models.misses
+        tm = self._task_model(t, ps, M, ev)
+        _set_instant(tm.m, tm.x, tm.budget, tm.window, t, now, M, tm.sym)
+        if self.hint:
+            self._add_hint(tm, t, ps, now, ev)
 
-        solver = cp_model.CpSolver()
+        solver = self._solver(verbose, time_limit)
+        status = solver.Solve(tm.m)
+        self.last_solve = {
+            "status": solver.StatusName(status),
+            "wall_time": solver.WallTime(),
+            "reused": self._models.misses == builds,
+        }
         if verbose:
-            solver.parameters.log_search_progress = True
-        solver.parameters.max_time_in_seconds = 10
-        status = solver.Solve(m)
+            print(f"[CP] {self.last_solve}")
         if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
             return None
 
@@ -188,10 +362,11 @@ class CPSatComboGenerator(ComboGenerator):
                 continue
             chosen = -1
             for p in range(len(ps)):
-                if solver.BooleanValue(x[s][p]):
+                if solver.BooleanValue(tm.x[s][p]):
                     chosen = p
                     break
             cmb.append(chosen)
+        tm.last = cmb
 
         ok, t_tot, cost, _, _, _ = ev.feasible(t, cmb, now, ps)
         if not ok:
@@ -1,38 +1,51 @@
 # Core/Scheduler/combo_generator/greedy.py
 from __future__ import annotations
 import heapq
-from Core.Scheduler.interface import ComboGenerator
+
+import numpy as np
+
+from Core.Scheduler.interface import ComboGenerator, on_active_providers
 
 
 class GreedyComboGenerator(ComboGenerator):
     """Greedy heuristic for scene-provider assignment.
 
-    Each unassigned scene is paired with every provider. The pairwise
-    combinations are evaluated individually and pushed into a max-heap by
-    efficiency. Pairs are popped from the heap and selected if the scene and
+    Each unassigned scene is paired with every provider that can start it now
+    (``evaluator.scene_matrices``). The pairwise combinations are evaluated
+    individually, ``batch`` at a time through ``evaluator.feasible_many``, and
+    pushed into a max-heap by efficiency. Pairs are popped from the heap and selected if the scene and
     provider have not been used yet. The final chosen combination is validated
     with ``evaluator.feasible`` and returned.
     """
 
+    def __init__(self, batch: int = 1024):
+        self.batch = batch
+
     def time_complexity(self, t, ps, now, ev):
         scene_ids = [i for i, (st, _) in enumerate(t.scene_allocation_data) if st is None]
         return len(scene_ids) * len(ps)
 
-    def best_combo(self, t, ps, now, ev, verbose=False):
+    def best_combo(self, t, ps, now, ev, verbose=False, active=None):
+        if active is not None:
+            return on_active_providers(self.best_combo, t, ps, now, ev, verbose, active)
         scene_ids = [i for i, (st, _) in enumerate(t.scene_allocation_data) if st is None]
         if not scene_ids:
             return None
 
+        # Single-pair combos for every (scene, provider) that fits now
+        sids, pids = np.nonzero(ev.scene_matrices(t, now, ps).ok)
         heap = []  # max-heap using negative score
-        for sid in scene_ids:
-            for pid, _ in enumerate(ps):
-                cmb = [-1] * t.scene_number
-                cmb[sid] = pid
-                ok, t_tot, cost, deferred, overB, overDL = ev.feasible(t, cmb, now, ps)
-                if not ok:
-                    continue
-                score = ev.efficiency(t, cmb, ps, now, t_tot, cost, deferred, overB, overDL)
-                heapq.heappush(heap, (-score, sid, pid))
+        for lo in range(0, len(sids), self.batch):
+            s_chunk, p_chunk = sids[lo:lo + self.batch], pids[lo:lo + self.batch]
+            combos = np.full((len(s_chunk), t.scene_number), -1, dtype=np.int64)
+            combos[np.arange(len(s_chunk)), s_chunk] = p_chunk
+            ok, *_, score = ev.feasible_many(t, combos, now, ps)
+            heap += [
+                (-sc, sid, pid)
+                for sid, pid, good, sc in zip(s_chunk.tolist(), p_chunk.tolist(), ok.tolist(), score.tolist())
+                if good
+            ]
+        heapq.heapify(heap)
 
         cmb = [-1] * t.scene_number
         used = set()
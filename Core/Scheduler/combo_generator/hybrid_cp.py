@@ -2,12 +2,12 @@
 
 from __future__ import annotations
 
-import math
 from typing import List
 
 from Core.Scheduler.interface import ComboGenerator
 from Core.Scheduler.combo_generator.cpsat import CPSatComboGenerator
 from Core.Scheduler.combo_generator.greedy import GreedyComboGenerator
+from Core.Scheduler.provider_index import top_k_providers
 
 
 class HybridCPComboGenerator(ComboGenerator):
@@ -16,46 +16,60 @@ class HybridCPComboGenerator(ComboGenerator):
     For each unassigned scene only the top ``k`` providers (shortest estimated
     duration) are considered. The reduced provider set is optimised via the
     existing :class:`CPSatComboGenerator`. If CP-SAT fails to find a feasible
-    solution, the algorithm falls back to the greedy heuristic.
+    solution, the algorithm falls back to the greedy heuristic. Extra keyword
+    arguments (solver parameters) are passed to the CP-SAT generator, and
+    ``best_combo(..., time_limit=)`` to its call.
     """
 
-    def __init__(self, k: int = 3):
+    subset_safe = False  # 배정된 씬은 provider 인덱스로 고정
+
+    def __init__(self, k: int = 3, **cp_kwargs):
         self.k = k
-        self._cp = CPSatComboGenerator()
+        self._cp = CPSatComboGenerator(**cp_kwargs)
         self._greedy = GreedyComboGenerator()
 
     # --- helpers ---------------------------------------------------------
-    def _select_providers(self, t, ps, ev):
-        """Return subset of providers and mapping to original indices."""
+    def _select_providers(self, t, ps, now, ev):
+        """Return subset of providers and mapping to original indices.
+
+        Candidates for unassigned scenes are the ``k`` fastest providers
+        that fit the scene now (``M.ok``), so providers with no window at
+        ``now`` are never picked and ``active`` is not needed here.
+        """
         # Always keep providers that already host some scenes
         chosen = {p for _, p in t.scene_allocation_data if p is not None}
         unassigned = [i for i, (st, _) in enumerate(t.scene_allocation_data) if st is None]
+        M = ev.scene_matrices(t, now, ps)
+        top = top_k_providers(M, unassigned, self.k)
         for sid in unassigned:
-            candidates = []
-            for pid, prov in enumerate(ps):
-                d, _ = ev.time_cost(t, sid, prov)
-                if math.isfinite(d):
-                    candidates.append((d, pid))
-            candidates.sort(key=lambda x: x[0])
-            for _, pid in candidates[: self.k]:
-                chosen.add(pid)
+            chosen.update(top[sid])
         idx = sorted(chosen)
         subset_ps = [ps[i] for i in idx]
         mapping = {new: old for new, old in enumerate(idx)}
         return subset_ps, mapping
 
     # --- interface -------------------------------------------------------
+    def release(self, t):
+        self._cp.release(t)
+
+    def cache_stats(self):
+        return self._cp.cache_stats()
+
     def time_complexity(self, t, ps, now, ev):
-        subset, _ = self._select_providers(t, ps, ev)
+        subset, _ = self._select_providers(t, ps, now, ev)
         return self._cp.time_complexity(t, subset, now, ev)
 
-    def best_combo(self, t, ps, now, ev, verbose=False):
-        subset_ps, mapping = self._select_providers(t, ps, ev)
+    def size_estimate(self, t, M, scene_ids, top):
+        """Scene-provider pairs of the reduced model (``k`` per scene)."""
+        return float(sum(len(top[sid][: self.k]) for sid in scene_ids))
+
+    def best_combo(self, t, ps, now, ev, verbose=False, active=None, time_limit: float | None = None):
+        subset_ps, mapping = self._select_providers(t, ps, now, ev)
         if not subset_ps:
             return None
-        res = self._cp.best_combo(t, subset_ps, now, ev, verbose)
+        res = self._cp.best_combo(t, subset_ps, now, ev, verbose, time_limit=time_limit)
         if res is None:
-            return self._greedy.best_combo(t, ps, now, ev, verbose)
+            return self._greedy.best_combo(t, ps, now, ev, verbose, active=active)
         cmb_subset, t_tot, cost = res
         # Map indices back to original provider list
         cmb_full: List[int] = []
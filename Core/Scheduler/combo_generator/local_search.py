@@ -0,0 +1,304 @@
+# Core/Scheduler/combo_generator/local_search.py
+from __future__ import annotations
+import bisect
+import math
+import random
+import time
+
+import numpy as np
+
+from Core.Scheduler.interface import ComboGenerator, on_active_providers
+from Core.Scheduler.metric_evaluator.baseline import BaselineEvaluator
+from utils.utils import to_epoch, hours_to_us, US_PER_HOUR
+
+
+class _Search:
+    """Combo over the unassigned scenes with incremental objective terms.
+
+    ``J = -efficiency`` (see ``BaselineEvaluator.efficiency``) depends on the
+    combo only through the makespan ``T``, the added cost ``C`` and the
+    number of deferred scenes ``D``. They are kept up to date per move; the
+    makespan from a sorted list of the placed durations. Like the
+    generators, the search never defers every scene: such combos score
+    ``inf``.
+    """
+
+    def __init__(self, t, now, ev, M, sids, start):
+        self.ev = ev
+        self.dur, self.cost, self.ok = M.dur[sids], M.cost[sids], M.ok[sids]
+        self.n, self.P = self.ok.shape
+        self.spent, self.budget = t.spent_cost, t.budget
+        self.now, self.deadline = to_epoch(now), t.deadline_us
+        self.cur = [-1] * self.n
+        self.owner: dict[int, int] = {}
+        self.used = np.zeros(self.P, dtype=bool)
+        self.durs: list[float] = []
+        self.C, self.D = 0.0, self.n
+        for i, p in enumerate(start):
+            if p >= 0:
+                self.place(i, p)
+
+    # --- objective -------------------------------------------------------
+    def j(self, T, C, D):
+        ev = self.ev
+        cost = self.spent + C
+        over_dl = max(0.0, (self.now + hours_to_us(T) - self.deadline) / US_PER_HOUR)
+        return (ev.WT * T + ev.WC * cost + ev.WD * D +
+                ev.WB * max(0.0, cost - self.budget) + ev.WDL * over_dl)
+
+    def j_many(self, T, C, D):
+        ev = self.ev
+        cost = self.spent + C
+        over_dl = np.maximum(0.0, (self.now + np.round(T * US_PER_HOUR) - self.deadline) / US_PER_HOUR)
+        return (ev.WT * T + ev.WC * cost + ev.WD * D +
+                ev.WB * np.maximum(0.0, cost - self.budget) + ev.WDL * over_dl)
+
+    def current(self):
+        return self.j(self.T, self.C, self.D) if self.D < self.n else math.inf
+
+    @property
+    def T(self):
+        return self.durs[-1] if self.durs else 0.0
+
+    def top_without(self, removed):
+        """Makespan once the durations in ``removed`` are taken out."""
+        rem = list(removed)
+        for v in reversed(self.durs):
+            if v in rem:
+                rem.remove(v)
+            else:
+                return v
+        return 0.0
+
+    # --- moves -----------------------------------------------------------
+    def place(self, i, p):
+        self.cur[i] = p
+        self.owner[p] = i
+        self.used[p] = True
+        bisect.insort(self.durs, float(self.dur[i, p]))
+        self.C += float(self.cost[i, p])
+        self.D -= 1
+
+    def unplace(self, i):
+        p = self.cur[i]
+        self.cur[i] = -1
+        del self.owner[p]
+        self.used[p] = False
+        self.durs.pop(bisect.bisect_left(self.durs, float(self.dur[i, p])))
+        self.C -= float(self.cost[i, p])
+        self.D += 1
+
+    def move(self, i, q):
+        """Scene ``i`` to free provider ``q`` (``-1`` defers it)."""
+        if self.cur[i] >= 0:
+            self.unplace(i)
+        if q >= 0:
+            self.place(i, q)
+
+    def swap(self, i, k):
+        """Exchange the providers of scenes ``i`` and ``k`` (either may be ``-1``)."""
+        p, q = self.cur[i], self.cur[k]
+        self.move(i, -1)
+        self.move(k, -1)
+        if q >= 0:
+            self.place(i, q)
+        if p >= 0:
+            self.place(k, p)
+
+    def swap_ok(self, i, k):
+        p, q = self.cur[i], self.cur[k]
+        return (p >= 0 or q >= 0) and (q < 0 or self.ok[i, q]) and (p < 0 or self.ok[k, p])
+
+    def swap_j(self, i, k):
+        p, q = self.cur[i], self.cur[k]
+        removed, T, C = [], 0.0, self.C
+        for s, old, new in ((i, p, q), (k, q, p)):
+            if old >= 0:
+                removed.append(float(self.dur[s, old]))
+                C -= float(self.cost[s, old])
+            if new >= 0:
+                T = max(T, float(self.dur[s, new]))
+                C += float(self.cost[s, new])
+        return self.j(max(T, self.top_without(removed)), C, self.D)
+
+    def move_j(self, i, q):
+        p = self.cur[i]
+        T, C, D = self.T, self.C, self.D
+        if p >= 0:
+            T, C, D = self.top_without([float(self.dur[i, p])]), C - float(self.cost[i, p]), D + 1
+        if q >= 0:
+            T, C, D = max(T, float(self.dur[i, q])), C + float(self.cost[i, q]), D - 1
+        return self.j(T, C, D) if D < self.n else math.inf
+
+    def best_move(self):
+        """Steepest neighbour: ``(J, kind, i, x)`` over moves, defers and swaps."""
+        best = (self.current(), None, -1, -1)
+        for i in range(self.n):
+            p = self.cur[i]
+            T, C, D = self.T, self.C, self.D
+            if p >= 0:
+                T, C, D = self.top_without([float(self.dur[i, p])]), C - float(self.cost[i, p]), D + 1
+                jd = self.j(T, C, D) if D < self.n else math.inf
+                if jd < best[0]:
+                    best = (jd, "move", i, -1)
+            qs = np.flatnonzero(self.ok[i] & ~self.used)
+            if qs.size:
+                js = self.j_many(np.maximum(T, self.dur[i, qs]), C + self.cost[i, qs], D - 1)
+                k = int(np.argmin(js))
+                if js[k] < best[0]:
+                    best = (float(js[k]), "move", i, int(qs[k]))
+        for i in range(self.n):
+            for k in range(i + 1, self.n):
+                if self.swap_ok(i, k):
+                    js = self.swap_j(i, k)
+                    if js < best[0]:
+                        best = (js, "swap", i, k)
+        return best
+
+    def random_move(self, rng):
+        """Random neighbour ``(J, kind, i, x)`` or ``None``."""
+        i = rng.randrange(self.n)
+        cands = np.flatnonzero(self.ok[i]).tolist() + [-1]
+        q = rng.choice(cands)
+        if q == self.cur[i]:
+            return None
+        if q >= 0 and self.used[q]:
+            k = self.owner[q]
+            return (self.swap_j(i, k), "swap", i, k) if self.swap_ok(i, k) else None
+        return self.move_j(i, q), "move", i, q
+
+    def apply(self, kind, i, x):
+        if kind == "move":
+            self.move(i, x)
+        else:
+            self.swap(i, x)
+
+
+class LocalSearchComboGenerator(ComboGenerator):
+    """Improve the combo of another generator by local search.
+
+    The wrapped generator's combo (or the all-deferred combo when it finds
+    none) is the start point. Neighbours reassign one scene to a free
+    provider, defer or undefer a scene, or swap the providers of two scenes
+    (one side may be deferred). Each neighbour is scored incrementally from
+    makespan, added cost and deferred count, with the
+    ``BaselineEvaluator.efficiency`` weights; other evaluators get the
+    wrapped result unchanged.
+
+    ``method="descent"`` takes the steepest improving neighbour until none
+    is left. ``method="anneal"`` is simulated annealing over random
+    neighbours (start temperature ``t0``, geometric ``cooling``, seeded by
+    ``seed``) and keeps the best combo seen. Both stop after ``max_iters``
+    iterations or ``max_seconds`` of wall time. The result is never worse
+    than the wrapped generator's. Statistics of the last call are in
+    ``last_search``. Joint generators (with ``best_combos``) plan all tasks
+    at once and cannot be wrapped.
+    """
+
+    METHODS = ("descent", "anneal")
+    OPTIONS = ("method", "max_iters", "max_seconds", "t0", "cooling", "seed")
+
+    def __init__(
+        self,
+        inner: ComboGenerator,
+        method: str = "descent",
+        max_iters: int = 1000,
+        max_seconds: float | None = None,
+        t0: float = 5.0,
+        cooling: float = 0.995,
+        seed: int | None = 0,
+    ):
+        if method not in self.METHODS:
+            raise ValueError(f"unknown method {method!r}; expected one of {self.METHODS}")
+        if hasattr(inner, "best_combos"):
+            raise ValueError(f"local search cannot wrap the joint generator {type(inner).__name__}")
+        self.inner = inner
+        self.method = method
+        self.max_iters = max_iters
+        self.max_seconds = max_seconds
+        self.t0 = t0
+        self.cooling = cooling
+        self.rng = random.Random(seed)
+        self.subset_safe = inner.subset_safe
+        self.last_search: dict = {}
+
+    def __getattr__(self, name):
+        # Only called for attributes not found on the wrapper
+        if name == "inner":
+            raise AttributeError(name)
+        return getattr(self.inner, name)
+
+    def release(self, t):
+        self.inner.release(t)
+
+    def close(self):
+        self.inner.close()
+
+    def cache_stats(self):
+        return self.inner.cache_stats()
+
+    def time_complexity(self, t, ps, now, ev):
+        return self.inner.time_complexity(t, ps, now, ev)
+
+    def _search(self, s: _Search):
+        stop = time.monotonic() + self.max_seconds if self.max_seconds is not None else None
+        j = best_j = s.current()
+        best = list(s.cur)
+        temp = self.t0
+        it = moves = 0
+        while it < self.max_iters and (stop is None or time.monotonic() < stop):
+            it += 1
+            if self.method == "descent":
+                nj, kind, i, x = s.best_move()
+                if kind is None or nj >= j - 1e-9 * max(1.0, abs(j)):
+                    break
+            else:
+                nb = s.random_move(self.rng)
+                temp *= self.cooling
+                if nb is None:
+                    continue
+                nj, kind, i, x = nb
+                if nj == math.inf or nj > j and \
+                        self.rng.random() >= math.exp((j - nj) / max(temp, 1e-12)):
+                    continue
+            s.apply(kind, i, x)
+            j = nj
+            moves += 1
+            if j < best_j:
+                best_j, best = j, list(s.cur)
+        return best, it, moves
+
+    def best_combo(self, t, ps, now, ev, verbose=False, active=None):
+        if active is not None and self.subset_safe:
+            return on_active_providers(self.best_combo, t, ps, now, ev, verbose, active)
+        res = self.inner.best_combo(t, ps, now, ev, verbose, active=active)
+        if type(ev).efficiency is not BaselineEvaluator.efficiency or \
+                type(ev).feasible is not BaselineEvaluator.feasible:
+            return res
+        sids = [i for i, (st, _) in enumerate(t.scene_allocation_data) if st is None]
+        if not sids:
+            return res
+
+        M = ev.scene_matrices(t, now, ps)
+        base = list(res[0]) if res is not None else [-1] * t.scene_number
+        s = _Search(t, now, ev, M, sids, [base[i] for i in sids])
+        placed, iters, moves = self._search(s)
+
+        cmb = base.copy()
+        for i, p in zip(sids, placed):
+            cmb[i] = p
+        out = res
+        if cmb != base and any(cmb[i] >= 0 for i in sids):
+            ok, t_tot, cost, *rest = ev.feasible(t, cmb, now, ps)
+            score = ev.efficiency(t, cmb, ps, now, t_tot, cost, *rest) if ok else float("-inf")
+            if res is None:
+                old = float("-inf")
+            else:
+                old = ev.efficiency(t, res[0], ps, now, *ev.feasible(t, res[0], now, ps)[1:])
+            if score > old:
+                out = (cmb, t_tot, cost)
+        self.last_search = {"method": self.method, "iterations": iters, "moves": moves,
+                            "improved": out is not res}
+        if verbose:
+            print(f"[LS] {self.last_search}")
+        return out
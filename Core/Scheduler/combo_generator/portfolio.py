@@ -0,0 +1,163 @@
+# Core/Scheduler/combo_generator/portfolio.py
+from __future__ import annotations
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+
+from Core.Scheduler.interface import ComboGenerator
+from Core.Scheduler.combo_generator.brute_force import BruteForceGenerator
+from Core.Scheduler.combo_generator.greedy import GreedyComboGenerator
+from utils.utils import to_epoch
+
+try:
+    from Core.Scheduler.combo_generator.cpsat import CPSatComboGenerator
+except ImportError:  # pragma: no cover - ortools missing
+    CPSatComboGenerator = None
+
+
+def _score(ev, t, ps, now, res) -> float:
+    # 새로 배치하는 씬이 없으면 후보가 아님 (greedy/bf와 같은 규칙)
+    if res is None or all(p == -1 or st is not None
+                          for p, (st, _) in zip(res[0], t.scene_allocation_data)):
+        return float("-inf")
+    ok, *rest = ev.feasible(t, res[0], now, ps)
+    return ev.efficiency(t, res[0], ps, now, *rest) if ok else float("-inf")
+
+
+class PortfolioComboGenerator(ComboGenerator):
+    """Anytime portfolio: greedy first, then exact engines until a deadline.
+
+    Greedy runs synchronously, so there is always an answer. The engines in
+    ``engines`` then search in worker threads until the wall-clock deadline:
+    ``budget`` seconds per engine run, counted from when the engine starts
+    (engines of concurrent calls may wait for a thread), and at most
+    ``step_budget`` seconds for all calls of one scheduling step (same
+    ``now``); ``None`` means no limit. Both engines stop by themselves at
+    the deadline, which is passed to each call (``deadline=`` of
+    ``BruteForceGenerator``, ``time_limit=`` of CP-SAT), and return their
+    best so far, so the call returns shortly after it.
+
+    Engines: ``"bf"`` (branch-and-bound, ``kprov`` candidates per scene) and
+    ``"cp"`` (skipped when ortools is missing). The best result by
+    ``evaluator.efficiency`` is returned; ties keep greedy, then the engine
+    order; combos that place no unassigned scene do not count. Every call
+    appends to ``log`` (winner, score per engine, gain over greedy, wall
+    seconds; only the last ``log_size`` calls are kept) and counts the
+    winner in ``wins``. Concurrent calls (the scheduler's ``pipeline``) are
+    safe: the shared step deadline, ``log`` and ``wins`` are updated under
+    a lock. ``close`` shuts the thread pool down; the scheduler calls it at
+    the end of a run.
+    """
+
+    ENGINES = ("bf", "cp")
+
+    def __init__(
+        self,
+        engines=("bf", "cp"),
+        budget: float | None = 1.0,
+        step_budget: float | None = None,
+        kprov: int = 3,
+        log_size: int = 1000,
+    ):
+        unknown = set(engines) - set(self.ENGINES)
+        if unknown:
+            raise ValueError(f"unknown engines {sorted(unknown)}; expected {self.ENGINES}")
+        self.budget = budget
+        self.step_budget = step_budget
+        self.greedy = GreedyComboGenerator()
+        self.engines = {}
+        for name in engines:
+            if name == "bf":
+                self.engines[name] = BruteForceGenerator(kprov=kprov)
+            elif CPSatComboGenerator is not None:
+                self.engines[name] = CPSatComboGenerator()
+        # CP-SAT은 배정된 씬을 provider 인덱스로 고정
+        self.subset_safe = all(g.subset_safe for g in self.engines.values())
+        self._pool: ThreadPoolExecutor | None = None  # created on first use
+        self._step = (None, float("inf"))  # (now, step deadline)
+        self._lock = threading.Lock()
+        self.log: deque = deque(maxlen=log_size)
+        self.wins: Counter = Counter()
+
+    def __getstate__(self):
+        # 스레드 풀과 락은 복사하지 않음 (병렬 모드의 worker로 보낼 때)
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=len(self.engines))
+            return self._pool
+
+    def close(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
+    def release(self, t):
+        for g in self.engines.values():
+            g.release(t)
+
+    def cache_stats(self):
+        return {f"{name}_{k}": v for name, g in self.engines.items() for k, v in g.cache_stats().items()}
+
+    def time_complexity(self, t, ps, now, ev):
+        return max(g.time_complexity(t, ps, now, ev) for g in (self.greedy, *self.engines.values()))
+
+    def _step_end(self, now, start) -> float:
+        """Deadline shared by all calls of the step at ``now`` (``inf`` if none)."""
+        now = to_epoch(now)
+        with self._lock:
+            if self._step[0] != now:
+                end = start + self.step_budget if self.step_budget is not None else float("inf")
+                self._step = (now, end)
+            return self._step[1]
+
+    def _run(self, name, gen, t, ps, now, ev, active, step_end):
+        # 엔진별 마감은 스레드를 얻은 시점부터 (대기 시간은 예산에서 빠지지 않음)
+        deadline = min(step_end, time.monotonic() + self.budget if self.budget is not None else float("inf"))
+        if deadline == float("inf"):
+            deadline = None
+        # 마감은 호출 인자로만 넘김 (엔진은 동시 호출끼리 공유됨)
+        if deadline is None:
+            return gen.best_combo(t, ps, now, ev, active=active)
+        if name == "bf":
+            return gen.best_combo(t, ps, now, ev, active=active, deadline=deadline)
+        return gen.best_combo(t, ps, now, ev, active=active,
+                              time_limit=max(1e-3, deadline - time.monotonic()))
+
+    def best_combo(self, t, ps, now, ev, verbose=False, active=None):
+        start = time.monotonic()
+        step_end = self._step_end(now, start)
+        results = {"greedy": self.greedy.best_combo(t, ps, now, ev, active=active)}
+
+        if self.engines and time.monotonic() < step_end and (self.budget is None or self.budget > 0):
+            pool = self._executor()
+            futures = {
+                name: pool.submit(self._run, name, g, t, ps, now, ev, active, step_end)
+                for name, g in self.engines.items()
+            }
+            # 엔진들이 마감을 스스로 지키므로 모두 기다린다 (끝난 뒤 provider가 바뀌지 않게)
+            for name, fut in futures.items():
+                results[name] = fut.result()
+
+        scores = {name: _score(ev, t, ps, now, res) for name, res in results.items()}
+        winner = max(scores, key=scores.get)  # 동점이면 앞쪽 (greedy 우선)
+        gain = scores[winner] - scores["greedy"] if results["greedy"] is not None else None
+        wall = time.monotonic() - start
+        with self._lock:
+            self.wins[winner] += 1
+            self.log.append({"task": t.id, "now": to_epoch(now), "winner": winner,
+                             "scores": scores, "gain": gain, "wall": wall})
+        if verbose:
+            print(f"[PORTFOLIO] task={t.id} winner={winner} gain={gain} wall={wall:.3f}s")
+        return results[winner] if scores[winner] > float("-inf") else None
@@ -3,6 +3,7 @@ from __future__ import annotations
 import datetime as dt
 from typing import List, Dict
 from Core.Scheduler.interface import Dispatcher
+from utils.utils import to_epoch, from_epoch, hours_to_us, US_PER_HOUR
 
 Assignment = tuple[str, int, dt.datetime, dt.datetime, int]
 
@@ -22,6 +23,7 @@ class SequentialDispatcher(Dispatcher):
                 continue
             groups.setdefault(p, []).append(sid)
 
+        now = to_epoch(now)
         for p, sids in groups.items():
             prov, cur = ps[p], now
             for sid in sids:
@@ -30,7 +32,7 @@ class SequentialDispatcher(Dispatcher):
 
                 if verbose:
                     # 전송 파일 크기 (scene + optional global)
-                    has_global = any(rec[0] == t.id for rec in getattr(prov, "schedule", []))
+                    has_global = t.id in prov.hosted
                     size = t.scene_size(sid)
                     if not has_global:
                         size += t.global_file_size
@@ -45,13 +47,15 @@ class SequentialDispatcher(Dispatcher):
                     cost = total_time * prov.price_per_gpu_hour
 
                 st = cur
-                ft = st + dt.timedelta(hours=dur)
+                ft = st + hours_to_us(dur)
                 prov.assign(t.id, sid, st, dur)
-                t.scene_allocation_data[sid] = (st, p)
-                out.append((t.id, sid, st, ft, p))
+                t.spent_cost += (ft - st) / US_PER_HOUR * prov.price_per_gpu_hour
+                st_dt = from_epoch(st)
+                t.scene_allocation_data[sid] = (st_dt, p)
+                out.append((t.id, sid, st_dt, from_epoch(ft), p))
                 if verbose:
                     print(
-                        f"      scene{sid}->P{p} {st.strftime('%m-%d %H:%M')} "
+                        f"      scene{sid}->P{p} {st_dt.strftime('%m-%d %H:%M')} "
                         f"tot={total_time:.4f}h size={size:.2f}MB "
                         f"tx={tx_time:.4f}h cmp={cmp_time:.4f}h cost=${cost:.4f}"
                     )
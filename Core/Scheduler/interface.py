@@ -2,51 +2,122 @@
 from __future__ import annotations
 import datetime
 from abc import ABC, abstractmethod
-from typing import List, Tuple, Optional, Sequence
+from typing import Dict, List, NamedTuple, Tuple, Optional, Sequence
+
+import numpy as np
 
 from Model.tasks import Tasks, Task
 from Model.providers import Providers, Provider
+from utils.utils import to_epoch, US_PER_HOUR
 
 # Assignment: (task_id, scene_id, start, finish, provider_index)
 Assignment = Tuple[str, int, datetime.datetime, datetime.datetime, int]
 
+# Simulation time passed between components: integer microseconds since
+# utils.utils.EPOCH (see utils.utils.to_epoch). Implementations also accept
+# datetimes and convert them on entry.
+SimTime = int
+
+
+class SceneMatrices(NamedTuple):
+    """Per (scene, provider) figures for one task at one instant.
+
+    Rows are all ``task.scene_number`` scenes, columns the providers in the
+    order given. Already assigned scenes have zero duration/cost and are
+    never ``ok``.
+    """
+    dur: np.ndarray   # (S, P) hours, inf when the provider cannot run it
+    cost: np.ndarray  # (S, P) incremental USD
+    cap: np.ndarray   # (P,)   hours left in the window containing now
+    ok: np.ndarray    # (S, P) bool: scene may start on the provider now
+
 class TaskSelector(ABC):
     @abstractmethod
-    def select(self, now: datetime.datetime, waiting: Sequence[Task]) -> List[Task]: ...
+    def select(self, now: SimTime, waiting: Sequence[Task]) -> List[Task]: ...
 
 class ComboGenerator(ABC):
+    # best_combo only reads unassigned scenes, so it may be run on any
+    # subset of the providers (see on_active_providers)
+    subset_safe = True
+
     @abstractmethod
     def best_combo(
         self,
         task: Task,
         providers: Providers,
-        sim_time: datetime.datetime,
+        sim_time: SimTime,
         evaluator: "MetricEvaluator",
         verbose: bool = False,
+        active: Optional[Sequence[int]] = None,
     ) -> Optional[Tuple[List[int], float, float]]: ...
     # return: (combo[scene_id->provider_idx or -1], t_tot_hours, cost_usd)
+    # active: ascending indices of providers available at sim_time (see
+    #         Core.Scheduler.provider_index.ActiveProviders); None = all
 
     def time_complexity(
         self,
         task: Task,
         providers: Providers,
-        sim_time: datetime.datetime,
+        sim_time: SimTime,
         evaluator: "MetricEvaluator",
     ) -> int:
         """Return exact count of feasible assignments (excluding all-skip)."""
         return 0
 
+    def size_estimate(
+        self,
+        task: Task,
+        M: SceneMatrices,
+        scene_ids: Sequence[int],
+        top: Dict[int, List[int]],
+    ) -> float:
+        """Cheap estimate of the search size of :meth:`best_combo`.
+
+        ``M`` are the task's scene matrices, ``scene_ids`` its unassigned
+        scenes and ``top`` their fitting providers, shortest first (see
+        :func:`~Core.Scheduler.provider_index.top_k_providers`), with at
+        least as many per scene as the generator considers. The default is
+        the number of scene-provider pairs that fit now.
+        """
+        return float(M.ok[list(scene_ids)].sum())
+
+    def release(self, task: Task) -> None:
+        """Forget anything cached for ``task`` (complete or past its deadline)."""
+
+    def cache_stats(self) -> Dict[str, float]:
+        """Counters of the generator's internal cache, if any."""
+        return {}
+
+    def close(self) -> None:
+        """Release worker threads or processes, if any (end of a run)."""
+
 class MetricEvaluator(ABC):
     @abstractmethod
     def time_cost(self, task: Task, scene_id: int, prov: Provider) -> Tuple[float, float]: ...
     # return: (duration_hours, incremental_cost_usd)
 
+    def scene_matrices(self, task: Task, sim_time: SimTime, providers: Providers) -> SceneMatrices:
+        """Batched :meth:`time_cost` plus window capacity at ``sim_time``.
+
+        The default implementation loops over :meth:`time_cost`; evaluators
+        should override it with a vectorised version.
+        """
+        now = to_epoch(sim_time)
+        S, P = task.scene_number, len(providers)
+        dur = np.zeros((S, P))
+        cost = np.zeros((S, P))
+        for p_idx, prov in enumerate(providers):
+            for sid in range(S):
+                dur[sid, p_idx], cost[sid, p_idx] = self.time_cost(task, sid, prov)
+        cap = np.array([prov.calendar.remaining(now) / US_PER_HOUR for prov in providers], dtype=float)
+        return SceneMatrices(dur, cost, cap, scene_ok_mask(task, dur, cap))
+
     @abstractmethod
     def feasible(
         self,
         task: Task,
         combo: List[int],
-        sim_time: datetime.datetime,
+        sim_time: SimTime,
         providers: Providers,
     ) -> Tuple[bool, float, float, int, float, float]:
         """
@@ -65,7 +136,7 @@ class MetricEvaluator(ABC):
         task: Task,
         combo: List[int],
         ps: Providers,
-        now: datetime.datetime,
+        now: SimTime,
         t_tot: float,
         cost: float,
         deferred: int,
@@ -74,14 +145,74 @@ class MetricEvaluator(ABC):
     ) -> float: ...
     # 클수록 좋은 점수 (보통 -가중합)
 
+    def feasible_many(
+        self,
+        task: Task,
+        combos: np.ndarray,
+        sim_time: SimTime,
+        providers: Providers,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorised :meth:`feasible` + :meth:`efficiency` over many combos.
+
+        ``combos`` is an (N, S) integer array, one combo per row. Returns the
+        arrays ``(ok, t_tot, cost, deferred, over_budget, over_deadline_h,
+        score)``, each of length N; infeasible rows score ``-inf``.
+        The default implementation loops over the scalar methods.
+        """
+        combos = np.asarray(combos, dtype=np.int64).reshape(-1, task.scene_number)
+        out = np.empty((7, len(combos)))
+        for i, row in enumerate(combos.tolist()):
+            ok, t_tot, cost, deferred, over_b, over_dl = self.feasible(task, row, sim_time, providers)
+            score = (
+                self.efficiency(task, row, providers, sim_time, t_tot, cost, deferred, over_b, over_dl)
+                if ok else float("-inf")
+            )
+            out[:, i] = (ok, t_tot, cost, deferred, over_b, over_dl, score)
+        return (out[0].astype(bool), out[1], out[2], out[3].astype(np.int64), out[4], out[5], out[6])
+
+    def release(self, task: Task) -> None:
+        """Forget anything cached for ``task`` (complete or past its deadline)."""
+
+    def cache_stats(self) -> Dict[str, float]:
+        """Hit/miss/eviction counters of the evaluator cache, if any."""
+        return {}
+
 class Dispatcher(ABC):
     @abstractmethod
     def dispatch(
         self,
         task: Task,
         combo: List[int],
-        sim_time: datetime.datetime,
+        sim_time: SimTime,
         providers: Providers,
         evaluator: MetricEvaluator,
         verbose: bool,
     ) -> List[Assignment]: ...
+
+
+def on_active_providers(best_combo, task, providers, sim_time, evaluator, verbose, active, **kwargs):
+    """Run ``best_combo`` on the ``active`` providers only.
+
+    The returned combo is mapped back to indices into ``providers``.
+    Generators whose combos only name unassigned scenes use this to make
+    their work proportional to the active set. ``kwargs`` are passed on.
+    """
+    sub = [providers[i] for i in active]
+    res = best_combo(task, sub, sim_time, evaluator, verbose, **kwargs)
+    if res is None:
+        return None
+    cmb, t_tot, cost = res
+    return [active[p] if p >= 0 else -1 for p in cmb], t_tot, cost
+
+
+def objective_weights(ev) -> Tuple[float, float, float, float, float]:
+    """``(WT, WC, WD, WB, WDL)`` of ``ev``; 1.0 for any weight it lacks."""
+    return tuple(getattr(ev, w, 1.0) for w in ("WT", "WC", "WD", "WB", "WDL"))
+
+
+def scene_ok_mask(task: Task, dur: np.ndarray, cap: np.ndarray) -> np.ndarray:
+    """Pairs that pass the per-scene checks of ``feasible``."""
+    unassigned = np.array([st is None for st, _ in task.scene_allocation_data], dtype=bool)
+    with np.errstate(invalid="ignore"):
+        fits = np.isfinite(dur) & (dur > 0.0) & ~(dur - 1e-9 > cap) & (cap > 0.0)
+    return fits & unassigned[:, None]
@@ -0,0 +1,470 @@
+# Core/Scheduler/lookahead.py
+from __future__ import annotations
+import bisect
+import datetime
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from Core.Scheduler.interface import objective_weights
+from Core.Scheduler.scheduler import BaselineScheduler, Assignment
+from Core.Scheduler.combo_generator.cp_utils import SCALE, BIG, WS, budget_left, make_solver
+from utils.utils import to_epoch, from_epoch, hours_to_us, US_PER_HOUR
+
+_US_PER_MS = 1000
+
+
+def _first_fit(busy, lo: int, hi: int, d: int) -> int | None:
+    """Earliest start in ``[lo, hi]`` of a block of length ``d`` clear of ``busy`` (sorted spans)."""
+    st = lo
+    for a, b in busy:
+        if b <= st:
+            continue
+        if a >= st + d:
+            break
+        st = b
+    return st if st <= hi else None
+
+
+class LookaheadScheduler(BaselineScheduler):
+    """Rolling-horizon scheduler: plan ``horizon`` ahead, commit the first ``commit_window``.
+
+    At every step one CP-SAT model covers all waiting tasks. Each
+    unassigned (scene, provider) pair gets an optional fixed-size interval
+    per free availability window of the provider that starts before
+    ``now + horizon`` and is long enough for the scene, so scenes may start
+    later than ``now`` and a provider may run several scenes one after
+    another. Per provider the intervals are ``NoOverlap``; each scene takes
+    at most one interval.
+
+    The objective is the sum of the per-task evaluator scores with the
+    weights of the evaluator (``WT``, ``WC``, ``WD``, ``WB``, ``WDL``, same
+    integer scaling as ``cp_joint``), where the makespan is the latest
+    planned end measured from ``now``. A scene left out of the plan counts
+    as deferred and runs after the horizon: the makespan is then at least
+    ``horizon`` plus its shortest duration, and at least ``horizon`` plus
+    the shortest durations of all left-out scenes spread over the providers
+    the task can use. Work pushed past the horizon thus keeps its weight.
+    Ties are broken towards early starts (unit weight per ms of start
+    time), since the makespan alone gives no reason to start other scenes
+    before the last one.
+
+    Only intervals starting before ``now + commit_window`` (default ``time_gap``)
+    are committed, through ``Provider.assign`` at their planned start; the
+    rest of the plan is re-solved at the next step and hinted to the
+    solver. Tasks with no interval in the horizon are left to ``_wake``
+    like in :class:`BaselineScheduler`. ``time_limit`` is the budget of one
+    plan, shared by a solve with the hints fixed (at most half of it) and
+    the search that follows. If neither finds a plan the step falls back
+    to the per-task generator of
+    ``algo`` (``workers`` and ``pipeline`` only apply there). The plan is
+    reused while nothing changed (see :meth:`plan`); a planned scene that
+    no longer fits its window when dispatched drops the plan, so the next
+    step re-solves. ``plan_stats`` counts solves, reuses and such drops,
+    ``solve_log`` records every solve.
+    """
+
+    def __init__(self, *, horizon=datetime.timedelta(hours=24), commit_window=None,
+                 time_limit: float = 10.0, num_workers: int | None = None,
+                 relative_gap: float | None = None, random_seed: int | None = None,
+                 algo="greedy", **kwargs):
+        super().__init__(algo=algo, **kwargs)
+        self.horizon = horizon
+        self.commit_window = commit_window if commit_window is not None else self.time_gap
+        self.time_limit = time_limit
+        self.num_workers = num_workers
+        self.relative_gap = relative_gap
+        self.random_seed = random_seed
+        # Previous plan: (task id, scene) -> (provider, start us)
+        self._plan: Dict[Tuple[str, int], Tuple[int, int]] = {}
+        # Inputs of the previous solve (see _key) and its result
+        self._last: Tuple[tuple, Dict[str, list] | None] = ((), None)
+        self.plan_stats = {"solved": 0, "reused": 0, "dropped": 0, "backfilled": 0}
+
+    def _wake(self, now, ps):
+        """Also retry marked tasks once a window that fits them is in the horizon.
+
+        The base test only looks at capacity available now; a plan can use
+        any window starting before ``now + horizon``.
+        """
+        super()._wake(now, ps)
+        end = now + self.horizon // datetime.timedelta(microseconds=1)
+        for tid, (pids, need) in list(self._unschedulable.items()):
+            for p, h in zip(pids, need):
+                st = ps[int(p)].earliest_available(float(h), now)
+                if st is not None and st <= end:
+                    del self._unschedulable[tid]
+                    break
+
+    def _compute_next_event(self, ps, after):
+        """Next provider event, or the next time a window or gap enters the horizon."""
+        H = self.horizon // datetime.timedelta(microseconds=1)
+        nxt = super()._compute_next_event(ps, after)
+        ahead = super()._compute_next_event(ps, after + H)
+        if ahead is not None:
+            nxt = ahead - H if nxt is None else min(nxt, ahead - H)
+        return nxt
+
+    def _windows(self, ps, now, end) -> List[List[Tuple[int, int]]]:
+        """Free windows ``(lo, hi)`` per provider that start before ``end``, clipped at ``now``."""
+        out = []
+        for p in ps:
+            cal = p.calendar
+            ws = []
+            for i in range(cal.first_ending_after(now), len(cal)):
+                lo = max(int(cal.starts[i]), now)
+                if lo >= end:
+                    break
+                ws.append((lo, int(cal.ends[i])))
+            out.append(ws)
+        return out
+
+    def _warm_start(self, cands, now) -> Dict[int, int]:
+        """Complete start plan for the solver: ``{candidate index: start ms}``.
+
+        ``cands`` are ``(task id, scene, provider, lo, hi, dur)`` in ms. The
+        previous plan is kept where it still fits; the other scenes are
+        list-scheduled in order, each on the candidate that ends earliest.
+        """
+        busy: Dict[int, list] = {}
+        by_scene: Dict[Tuple[str, int], list] = {}
+        for i, c in enumerate(cands):
+            by_scene.setdefault(c[:2], []).append(i)
+        out: Dict[int, int] = {}
+
+        def take(i, st):
+            bisect.insort(busy.setdefault(cands[i][2], []), (st, st + cands[i][5]))
+            out[i] = st
+
+        done = set()
+        for key, (p, start) in self._plan.items():
+            start = (start - now) // _US_PER_MS
+            for i in by_scene.get(key, ()):
+                _, _, q, lo, hi, d = cands[i]
+                if q == p and lo <= start <= hi and _first_fit(busy.get(p, ()), start, start, d) is not None:
+                    take(i, start)
+                    done.add(key)
+                    break
+        for key, idxs in by_scene.items():
+            if key in done:
+                continue
+            best = None
+            for i in idxs:
+                _, _, p, lo, hi, d = cands[i]
+                st = _first_fit(busy.get(p, ()), lo, hi, d)
+                if st is not None and (best is None or st + d < best[1] + cands[best[0]][5]):
+                    best = (i, st)
+            if best is not None:
+                take(*best)
+        return out
+
+    @staticmethod
+    def _key(tasks, ps, end) -> tuple:
+        """What a plan depends on besides time: task ids, provider versions and
+        the number of windows per provider starting before ``end``."""
+        return (tuple(t.id for t in tasks), tuple(p.version for p in ps),
+                tuple(int(np.searchsorted(p.calendar.starts, end)) for p in ps))
+
+    @staticmethod
+    def _end_after(p, dur_h, after, memo) -> int | None:
+        """Earliest end (epoch us) of a ``dur_h`` block on ``p`` starting at or after ``after``."""
+        key = (id(p), hours_to_us(dur_h))
+        if key not in memo:
+            st = p.earliest_available(dur_h, after)
+            memo[key] = None if st is None else st + key[1]
+        return memo[key]
+
+    def plan(self, tasks, ps, now) -> Dict[str, List[Tuple[int, int, int]]] | None:
+        """Solve the lookahead model for ``tasks`` at ``now``.
+
+        Returns ``{task id: [(scene, provider, start us), ...]}`` for the
+        tasks that have at least one interval in the horizon, or ``None``
+        when the solver finds no plan. If neither the tasks nor any provider
+        changed since the previous solve, no window entered the horizon and
+        none of the planned starts has passed, the previous plan is returned
+        as is.
+        """
+        ev = self.evaluator
+        now = to_epoch(now)
+        H = self.horizon // datetime.timedelta(microseconds=1)
+        H_ms = H // _US_PER_MS
+        wins = self._windows(ps, now, now + H)
+        key = self._key(tasks, ps, now + H)
+        if key == self._last[0] and self._last[1] is not None and \
+                all(st >= now for es in self._last[1].values() for _, _, st in es):
+            self.plan_stats["reused"] += 1
+            return self._last[1]
+        self.plan_stats["solved"] += 1
+        t0 = time.perf_counter()
+        WT, WC, WD, WB, WDL = objective_weights(ev)
+        c_time = round(WT * WS)
+        c_late = round(WDL * WS)
+        c_cost = round(WC * 3600 * WS)
+        c_over = round(WB * 3600 * WS)
+        c_defer = round(WD * 3600 * SCALE * WS)
+
+        m = cp_model.CpModel()
+        ends: Dict[Tuple[int, int], int | None] = {}
+        per_prov: Dict[int, list] = {}
+        items: Dict[str, list] = {}  # task id -> [(scene, provider, x, start var)]
+        cands, cvars = [], []  # every optional interval, for the warm start
+        objective = []
+        for t in tasks:
+            M = ev.scene_matrices(t, now, ps)
+            sids = [i for i, (st, _) in enumerate(t.scene_allocation_data) if st is None]
+            with np.errstate(invalid="ignore"):
+                usable = np.isfinite(M.dur[sids]) & (M.dur[sids] > 0.0)
+            # 지평 안에 들어갈 수 있는 씬 수의 상한 (provider별 창 길이 / 가장 짧은 씬).
+            # 그보다 많은 씬은 변수 없이 미룬 씬으로 셈: 짧은 씬부터 모델에 넣음
+            room = 0
+            for p, ws in enumerate(wins):
+                if usable[:, p].any():
+                    d = hours_to_us(float(M.dur[sids, p][usable[:, p]].min()))
+                    room += sum(max(0, min(hi, now + H + d) - lo) // d for lo, hi in ws)
+            order = np.argsort(np.where(usable, M.dur[sids], np.inf).min(axis=1), kind="stable")
+            xs = []
+            per_scene: Dict[int, list] = {}
+            for s in (sids[i] for i in order[:room]):
+                for p, ws in enumerate(wins):
+                    d_h = float(M.dur[s, p])
+                    if not (np.isfinite(d_h) and d_h > 0.0):
+                        continue
+                    d_us = hours_to_us(d_h)
+                    d_ms = -(-d_us // _US_PER_MS)
+                    c = int(round(float(M.cost[s, p]) * SCALE))
+                    for lo, hi in ws:
+                        lo_ms = -(-(lo - now) // _US_PER_MS)
+                        hi_ms = min((hi - now) // _US_PER_MS - d_ms, H_ms)
+                        if lo_ms > hi_ms:
+                            continue
+                        x = m.NewBoolVar(f"x_{t.id}_{s}_{p}_{lo_ms}")
+                        st = m.NewIntVar(lo_ms, hi_ms, f"s_{t.id}_{s}_{p}_{lo_ms}")
+                        iv = m.NewOptionalFixedSizeIntervalVar(st, d_ms, x, f"i_{t.id}_{s}_{p}_{lo_ms}")
+                        xs.append((s, p, x, st, d_ms, c))
+                        per_scene.setdefault(s, []).append(x)
+                        per_prov.setdefault(p, []).append(iv)
+                        cands.append((t.id, s, p, lo_ms, hi_ms, d_ms))
+                        cvars.append((x, st))
+            if not xs:
+                continue
+            items[t.id] = [(s, p, x, st) for s, p, x, st, _, _ in xs]
+
+            # 계획에서 빠진 씬은 horizon 이후에 실행됨: 씬 하나는 지평 뒤 가장 일찍 끝나는
+            # 시점까지, 남은 일 전체는 쓸 수 있는 provider에 나눠서 makespan의 하한
+            n_prov = max(1, int(usable.any(axis=0).sum()))
+            bounds = []  # (scene, 나눠 쓴 길이, 가장 이른 종료, 가장 싼 비용)
+            for s, ok in zip(sids, usable):
+                d = -(-hours_to_us(float(M.dur[s][ok].min())) // _US_PER_MS) if ok.any() else 0
+                # 지평 이후 달력(이미 배정된 일 제외)에서 가장 일찍 끝나는 시점
+                fins = [self._end_after(ps[p], float(M.dur[s, p]), now + H, ends)
+                        for p in np.flatnonzero(ok)]
+                fins = [f for f in fins if f is not None]
+                end = -(-(min(fins) - now) // _US_PER_MS) if fins else H_ms + d
+                # 미룬 씬도 결국 비용을 냄: 가장 싼 provider 기준
+                c = int(round(float(M.cost[s][ok].min()) * SCALE)) if ok.any() else 0
+                bounds.append((s, d // n_prov, end, c))
+            # 지평 뒤 종료 시점은 BIG(약 11.6일)를 넘을 수 있음
+            hi = max([BIG, H_ms + sum(b[1] for b in bounds)] + [b[2] for b in bounds])
+            makespan = m.NewIntVar(0, hi, f"T_{t.id}")
+            for _, _, x, st, d, _ in xs:
+                m.Add(makespan >= st + d).OnlyEnforceIf(x)
+            spill = m.NewBoolVar(f"spill_{t.id}")
+            tail, later = [], []
+            for s, d, end, c in bounds:
+                lits = per_scene.get(s)
+                if lits is None:
+                    m.Add(spill == 1)
+                    m.Add(makespan >= end)
+                    tail.append(d)
+                    later.append(c)
+                    continue
+                m.AddAtMostOne(lits)
+                m.Add(spill + sum(lits) >= 1)
+                m.Add(makespan >= end).OnlyEnforceIf([x.Not() for x in lits])
+                tail.append(d * (1 - sum(lits)))
+                later.append(c * (1 - sum(lits)))
+            m.Add(makespan >= H_ms + sum(tail)).OnlyEnforceIf(spill)
+            cost = sum(c * x for _, _, x, _, _, c in xs) + sum(later)
+            placed = sum(x for _, _, x, _, _, _ in xs)
+
+            window = max(-BIG, min(BIG, (t.deadline_us - now) // _US_PER_MS))
+            over_deadline = m.NewIntVar(0, hi + BIG, f"OD_{t.id}")
+            m.Add(over_deadline >= makespan - window)
+
+            objective += [
+                c_time * makespan,
+                c_cost * cost,
+                c_defer * (len(sids) - placed),
+                c_late * over_deadline,
+                # 동점이면 일찍 시작 (makespan만 보면 다른 씬을 미룰 이유가 없음)
+                sum(st for _, _, _, st, _, _ in xs),
+            ]
+            left = budget_left(t)
+            if left is not None:  # 예산이 없으면(inf) 초과 항도 없음
+                over_budget = m.NewIntVar(0, BIG, f"OB_{t.id}")
+                m.Add(over_budget >= cost - left)
+                objective.append(c_over * over_budget)
+        if not items:
+            return {}
+        for ivs in per_prov.values():
+            m.AddNoOverlap(ivs)
+        warm = self._warm_start(cands, now)
+        for i, (x, st) in enumerate(cvars):
+            m.AddHint(x, i in warm)
+            m.AddHint(st, warm.get(i, cands[i][3]))
+        objective = sum(objective)
+        m.Minimize(objective)
+
+        # 힌트(리스트 스케줄)를 고정해서 먼저 풀고, 그 값을 상한으로 탐색.
+        # 탐색이 시간 안에 더 나은 해를 못 찾으면 리스트 스케줄을 씀.
+        # 모델 생성과 두 풀이가 time_limit 하나를 나눠 씀 (고정 풀이는 남은 시간의 절반까지)
+        build = time.perf_counter() - t0
+        budget = max(0.0, self.time_limit - build)
+        fixed = make_solver(budget / 2, self.num_workers, random_seed=self.random_seed)
+        fixed.parameters.fix_variables_to_their_hinted_value = True
+        warm_found = fixed.Solve(m) in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+        if warm_found:
+            m.Add(objective <= round(fixed.ObjectiveValue()))
+
+        solver = make_solver(max(0.0, budget - fixed.WallTime()), self.num_workers,
+                              self.relative_gap, self.random_seed, self.verbose >= 3)
+        status = solver.Solve(m)
+        found = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+        best = solver if found else fixed if warm_found else None
+        obj = best.ObjectiveValue() if best is not None else float("nan")
+        bound = solver.BestObjectiveBound() if found else float("nan")
+        self.solve_log.append({
+            "now": now,
+            "status": solver.StatusName(status),
+            "wall_time": solver.WallTime() + fixed.WallTime(),
+            "build_time": build,
+            "tasks": len(items),
+            "vars": sum(len(v) for v in items.values()),
+            "objective": obj,
+            "bound": bound,
+            "gap": abs(obj - bound) / max(1.0, abs(obj)) if found else float("nan"),
+            "warm_start": not found and warm_found,
+        })
+        if best is None:
+            return None
+
+        out: Dict[str, List[Tuple[int, int, int]]] = {}
+        self._plan = {}
+        for tid, vs in items.items():
+            out[tid] = []
+            for s, p, x, st in vs:
+                if best.BooleanValue(x):
+                    start = now + best.Value(st) * _US_PER_MS
+                    out[tid].append((s, p, start))
+                    self._plan[(tid, s)] = (p, start)
+            out[tid].sort(key=lambda e: e[2])
+        self._last = (key, out)
+        return out
+
+    def _dispatch(self, t, entries, now, ps) -> List[Assignment]:
+        """Assign the planned scenes of ``t`` that start in the commit window."""
+        out: List[Assignment] = []
+        end = now + self.commit_window // datetime.timedelta(microseconds=1)
+        for s, p, start in entries:
+            if start >= end:
+                break
+            prov = ps[p]
+            dur, _ = self.evaluator.time_cost(t, s, prov)
+            ft = start + hours_to_us(dur)
+            # 계획은 올림한 길이로 잡지만, 창이 그새 깎였으면 못 들어감:
+            # 계획을 버려 다음 스텝에 이 씬까지 다시 풀게 함
+            if prov.calendar.remaining(start) < ft - start:
+                self._last = ((), None)
+                self.plan_stats["dropped"] += 1
+                if self.verbose >= 2:
+                    print(f"      [{t.id}] scene{s}->P{p} {from_epoch(start):%m-%d %H:%M} "
+                          f"no longer fits, re-plan")
+                continue
+            prov.assign(t.id, s, start, dur)
+            t.spent_cost += (ft - start) / US_PER_HOUR * prov.price_per_gpu_hour
+            st_dt = from_epoch(start)
+            t.scene_allocation_data[s] = (st_dt, p)
+            out.append((t.id, s, st_dt, from_epoch(ft), p))
+            if self.verbose >= 2:
+                print(f"      [{t.id}] scene{s}->P{p} {st_dt:%m-%d %H:%M}~{from_epoch(ft):%H:%M}")
+        return out
+
+    def _backfill(self, tasks, plans, now, ps) -> List[Assignment]:
+        """Give scenes the plan leaves out to providers it leaves idle.
+
+        The bounds on left-out scenes are optimistic (they assume the
+        capacity after the horizon is theirs), so a plan may defer work that
+        could start now. Providers available now with no planned interval
+        take such scenes through the per-task generator of ``algo``, as in
+        :class:`BaselineScheduler`; planned scenes keep their slots. Not every
+        generator honours ``active``, so entries on other providers are dropped.
+        """
+        self._active.update(now)
+        planned = {p for es in plans.values() for _, p, _ in es}
+        idle = [i for i in self._active.indices() if i not in planned]
+        out: List[Assignment] = []
+        for t in tasks:
+            if not idle:
+                break
+            if t.id in self._unschedulable:
+                continue
+            keep = {s for s, _, _ in plans.get(t.id, ())}
+            if all(st is not None or s in keep for s, (st, _) in enumerate(t.scene_allocation_data)):
+                continue
+            best = self.generator.best_combo(
+                t, ps, now, self.evaluator, verbose=self.verbose >= 2, active=idle
+            )
+            if best is None:
+                continue
+            cmb = [-1 if s in keep or p not in idle else int(p) for s, p in enumerate(best[0])]
+            got = self.dispatcher.dispatch(t, cmb, now, ps, self.evaluator, self.verbose >= 2)
+            if got:
+                self.plan_stats["backfilled"] += len(got)
+                idle = [i for i in idle if i not in {a[4] for a in got}]
+                out += got
+        return out
+
+    def _schedule_once(self, now, ps):
+        selected = self.selector.select(now, self.waiting_tasks)
+        todo = [
+            t for t in selected
+            if t.id not in self._unschedulable
+            and any(st is None for st, _ in t.scene_allocation_data)
+        ]
+        plans = self.plan(todo, ps, now) if todo else {}
+        if plans is None:
+            return super()._schedule_once(now, ps)
+
+        new: List[Assignment] = []
+        remain = []
+        for t in selected:
+            if all(st is not None for st, _ in t.scene_allocation_data):
+                continue
+            remain.append(t)
+            if t.id in self._unschedulable:
+                continue
+            entries = plans.get(t.id)
+            if entries is None:
+                # 지평 안에 들어갈 창이 없음
+                self._mark_unschedulable(t, now, ps)
+                continue
+            new += self._dispatch(t, entries, now, ps)
+        if self._last[1] is plans and plans:
+            # 계획대로 배정만 했으면 남은 계획은 그대로 유효: 바뀐 버전으로 다시 등록
+            rest = [t for t in todo if t.id not in self._unschedulable
+                    and any(st is None for st, _ in t.scene_allocation_data)]
+            H = self.horizon // datetime.timedelta(microseconds=1)
+            self._last = (self._key(rest, ps, now + H), {
+                t.id: [e for e in plans.get(t.id, ()) if t.scene_allocation_data[e[0]][0] is None]
+                for t in rest
+            })
+        new += self._backfill(remain, plans, now, ps)
+        self.waiting_tasks = []
+        for t in remain:
+            if any(st is None for st, _ in t.scene_allocation_data):
+                self.waiting_tasks.append(t)
+            else:
+                self._release(t)
+        return new
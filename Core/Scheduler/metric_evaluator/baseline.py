@@ -1,9 +1,13 @@
 # Core/Scheduler/metric_evaluator/baseline.py
 from __future__ import annotations
 import math
-import datetime as dt
 from typing import Dict, List, Tuple
-from Core.Scheduler.interface import MetricEvaluator
+
+import numpy as np
+
+from Core.Scheduler.interface import MetricEvaluator, SceneMatrices, scene_ok_mask
+from utils.cache import BoundedCache
+from utils.utils import to_epoch, hours_to_us, US_PER_HOUR
 
 class BaselineEvaluator(MetricEvaluator):
     """
@@ -17,19 +21,20 @@ class BaselineEvaluator(MetricEvaluator):
         WC: float = 1.0,    # 비용 가중치 (USD)
         WD: float = 10.0,   # 연기(미배치 scene 수) 가중치
         WB: float = 200.0,  # 예산초과 패널티 ($)
-        WDL: float = 500.0  # 데드라인초과 패널티 (hours)
+        WDL: float = 500.0,  # 데드라인초과 패널티 (hours)
+        cache_size: int = 100_000,  # _c 최대 항목 수 (LRU)
     ):
-        self._c: Dict[tuple, float] = {}
-        # key: (task_id, sched_len_per_provider)
-        self._spent_cache: Dict[tuple, float] = {}
+        # Entries are grouped by task id so release() can drop a whole task
+        self._c = BoundedCache(cache_size)
         self.WT, self.WC, self.WD, self.WB, self.WDL = WT, WC, WD, WB, WDL
 
     # -------- 기본 시간 계산(전송+연산) 캐시 --------
     def _t_tx(self, t, s, p):
-        has_global = any(rec[0] == t.id for rec in getattr(p, "schedule", []))
+        has_global = t.id in p.hosted
         k = ("tx", t.id, s, p, has_global)
-        if k in self._c:
-            return self._c[k]
+        v = self._c.get(k)
+        if v is not None:
+            return v
         bw = min(t.bandwidth, p.bandwidth)
         if bw <= 0:
             v = float("inf")
@@ -38,34 +43,60 @@ class BaselineEvaluator(MetricEvaluator):
             if not has_global:
                 size += t.global_file_size
             v = size / bw / 3600
-        self._c[k] = v
+        self._c.put(k, v, t.id)
         return v
 
     def _t_cmp(self, t, p):
         k = ("cmp", t.id, p)
-        if k in self._c:
-            return self._c[k]
+        v = self._c.get(k)
+        if v is not None:
+            return v
         thr = getattr(p, "throughput", 0.0)
         v = float("inf") if thr <= 0 else t.scene_workload / thr
-        self._c[k] = v
+        self._c.put(k, v, t.id)
         return v
 
+    def release(self, t):
+        self._c.drop(t.id)
+
+    def cache_stats(self):
+        return self._c.stats()
+
     def time_cost(self, t, s, p):
         if t.scene_allocation_data[s][0] is not None:
             return 0.0, 0.0
         d = self._t_tx(t, s, p) + self._t_cmp(t, p)
         return d, d * p.price_per_gpu_hour
 
+    # -------- S×P 일괄 계산 (time_cost와 동일한 연산 순서) --------
+    def scene_matrices(self, t, now, ps) -> SceneMatrices:
+        now = to_epoch(now)
+        P = len(ps)
+        thr = np.fromiter((p.throughput for p in ps), dtype=float, count=P)
+        price = np.fromiter((p.price_per_gpu_hour for p in ps), dtype=float, count=P)
+        bw = np.minimum(t.bandwidth, np.fromiter((p.bandwidth for p in ps), dtype=float, count=P))
+        hosted = np.fromiter((t.id in p.hosted for p in ps), dtype=bool, count=P)
+        cap = np.fromiter((p.calendar.remaining(now) for p in ps), dtype=float, count=P) / US_PER_HOUR
+
+        size = np.asarray(t.scene_file_sizes, dtype=float)[:, None] + np.where(hosted, 0.0, t.global_file_size)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            tx = np.where(bw > 0, size / bw / 3600, np.inf)
+            cmp = np.where(thr > 0, t.scene_workload / thr, np.inf)
+        dur = tx + cmp
+        cost = dur * price
+        assigned = np.array([st is not None for st, _ in t.scene_allocation_data], dtype=bool)
+        dur[assigned] = 0.0
+        cost[assigned] = 0.0
+        return SceneMatrices(dur, cost, cap, scene_ok_mask(t, dur, cap))
+
     # -------- now 포함 가용구간 길이(시간) --------
     @staticmethod
-    def _cap_now_hours_from_avail(prov, now: dt.datetime) -> float:
-        for s, e in getattr(prov, "available_hours", []):
-            if s <= now < e:
-                return max(0.0, (e - now).total_seconds() / 3600.0)
-        return 0.0
+    def _cap_now_hours_from_avail(prov, now: int) -> float:
+        return prov.calendar.remaining(now) / US_PER_HOUR
 
     # -------- 메인 판정 --------
-    def feasible(self, t, cmb, now: dt.datetime, ps) -> Tuple[bool, float, float, int, float, float]:
+    def feasible(self, t, cmb, now: int, ps) -> Tuple[bool, float, float, int, float, float]:
+        now = to_epoch(now)
         # 이번 스텝 미배치 수
         deferred = sum(
             1 for sid, pid in enumerate(cmb)
@@ -84,20 +115,8 @@ class BaselineEvaluator(MetricEvaluator):
             if len(sids) > 1:
                 return False, math.inf, math.inf, deferred, math.inf, math.inf
 
-        # 과거 같은 task의 지출 (provider 스케줄 길이 기반 캐시)
-        key = (t.id, tuple(len(getattr(p, "schedule", [])) for p in ps))
-        spent = self._spent_cache.get(key)
-        if spent is None:
-            spent = 0.0
-            for prov in ps:
-                for rec in getattr(prov, "schedule", []):
-                    if len(rec) == 3:
-                        tid, st, ft = rec
-                    else:
-                        tid, _sid, st, ft = rec
-                    if tid == t.id:
-                        spent += ((ft - st).total_seconds()/3600.0) * prov.price_per_gpu_hour
-            self._spent_cache[key] = spent
+        # 과거 같은 task의 지출 (dispatcher가 갱신하는 누적 원장)
+        spent = t.spent_cost
 
         incr_cost = 0.0
         per_prov_h: Dict[int, float] = {}
@@ -125,10 +144,63 @@ class BaselineEvaluator(MetricEvaluator):
 
         # 소프트 초과량 (패널티용)
         over_budget = max(0.0, total_cost - t.budget)
-        over_deadline_h = max(0.0, (now + dt.timedelta(hours=t_tot) - t.deadline).total_seconds()/3600.0)
+        over_deadline_h = max(0.0, (now + hours_to_us(t_tot) - t.deadline_us) / US_PER_HOUR)
 
         return True, t_tot, total_cost, deferred, over_budget, over_deadline_h
 
+    def feasible_many(self, t, combos, now, ps):
+        """Vectorised feasible + efficiency; bitwise equal to the scalar path."""
+        if type(self).feasible is not BaselineEvaluator.feasible or \
+                type(self).efficiency is not BaselineEvaluator.efficiency:
+            return super().feasible_many(t, combos, now, ps)
+        now = to_epoch(now)
+        S = t.scene_number
+        C = np.asarray(combos, dtype=np.int64).reshape(-1, S)
+        M = self.scene_matrices(t, now, ps)
+
+        unassigned = np.array([st is None for st, _ in t.scene_allocation_data], dtype=bool)
+        placed = (C >= 0) & unassigned
+        deferred = ((C == -1) & unassigned).sum(axis=1)
+
+        # HARD: provider당 1개 씬 -> 정렬 후 인접 중복 검사 (미배치 칸은 고유 음수)
+        keyed = np.sort(np.where(placed, C, -1 - np.arange(S)), axis=1)
+        dup = (keyed[:, 1:] == keyed[:, :-1]).any(axis=1)
+
+        rows = np.arange(S)
+        pid = np.where(placed, C, 0)
+        fits = np.where(placed, M.ok[rows, pid], True).all(axis=1)
+        ok = fits & ~dup
+
+        dur = np.where(placed, M.dur[rows, pid], 0.0)
+        t_tot = dur.max(axis=1) if S else np.zeros(len(C))
+        # cumsum adds in scene order, like the scalar loop
+        incr = np.cumsum(np.where(placed, M.cost[rows, pid], 0.0), axis=1)[:, -1] if S else np.zeros(len(C))
+        cost = t.spent_cost + incr
+
+        over_budget = np.maximum(0.0, cost - t.budget)
+        with np.errstate(invalid="ignore"):
+            t_us = np.rint(np.where(ok, t_tot, 0.0) * US_PER_HOUR).astype(np.int64)
+        over_deadline_h = np.maximum(0.0, (now + t_us - t.deadline_us) / US_PER_HOUR)
+
+        score = -(
+            self.WT  * t_tot +
+            self.WC  * cost +
+            self.WD  * deferred +
+            self.WB  * over_budget +
+            self.WDL * over_deadline_h
+        )
+        score = np.where(ok & np.isfinite(score), score, -np.inf)
+        inf = np.full(len(C), np.inf)
+        return (
+            ok,
+            np.where(ok, t_tot, inf),
+            np.where(ok, cost, inf),
+            deferred,
+            np.where(ok, over_budget, inf),
+            np.where(ok, over_deadline_h, inf),
+            score,
+        )
+
     def efficiency(
         self, t, cmb, ps, now,
         t_tot: float, cost: float, deferred: int, over_budget: float, over_deadline_h: float
@@ -0,0 +1,109 @@
+# Core/Scheduler/provider_index.py
+"""Provider-set helpers: the active set the scheduler keeps current as time
+advances, and per-scene top-``k`` provider selection."""
+
+from __future__ import annotations
+import heapq
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from Model.providers import Providers
+
+
+class ActiveProviders:
+    """Providers whose availability window contains ``now``.
+
+    Maintained by a sweep over window open/close events: every provider has
+    one pending event (the end of its current window if active, the start of
+    its next window otherwise) in a heap, and :meth:`update` only touches
+    providers whose event has passed. Assignments carve the calendar, so
+    active providers whose ``version`` changed since they were last examined
+    are re-checked as well; that keeps each update O(active + events).
+    """
+
+    def __init__(self, ps: Providers, now: Optional[int] = None):
+        self.ps = ps
+        self.now: Optional[int] = None
+        self._end: Dict[int, int] = {}        # active provider -> window end (epoch us)
+        self._seen: List[int] = [-1] * len(ps)  # provider version last examined
+        self._heap: List[Tuple[int, int, int]] = []  # (event time, provider, version)
+        if now is not None:
+            self.update(now)
+
+    def __len__(self) -> int:
+        return len(self._end)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.indices())
+
+    def __contains__(self, pidx: int) -> bool:
+        return pidx in self._end
+
+    def indices(self) -> List[int]:
+        """Active provider indices in ascending order."""
+        return sorted(self._end)
+
+    def remaining(self, pidx: int) -> int:
+        """Time left (us) in the active window of ``pidx``; 0 if inactive."""
+        end = self._end.get(pidx)
+        return 0 if end is None or self.now is None else max(0, end - self.now)
+
+    def next_event(self) -> Optional[int]:
+        """Earliest pending window open/close time."""
+        return self._heap[0][0] if self._heap else None
+
+    def _examine(self, pidx: int, now: int) -> None:
+        p = self.ps[pidx]
+        self._seen[pidx] = p.version
+        cal = p.calendar
+        i = cal.index_at(now)
+        if i >= 0:
+            end = int(cal.ends[i])
+            self._end[pidx] = end
+            heapq.heappush(self._heap, (end, pidx, p.version))
+        else:
+            self._end.pop(pidx, None)
+            nxt = cal.next_start(now)
+            if nxt is not None:
+                heapq.heappush(self._heap, (nxt, pidx, p.version))
+
+    def update(self, now: int) -> None:
+        """Advance the sweep to ``now`` (must not go backwards)."""
+        if self.now is None:
+            self.now = now
+            for pidx in range(len(self.ps)):
+                self._examine(pidx, now)
+            return
+        self.now = now
+        # Active providers that got work since the last update
+        for pidx in [i for i in self._end if self.ps[i].version != self._seen[i]]:
+            self._examine(pidx, now)
+        while self._heap and self._heap[0][0] <= now:
+            _, pidx, version = heapq.heappop(self._heap)
+            if version != self._seen[pidx]:
+                continue  # superseded by a later examination
+            self._examine(pidx, now)
+
+
+def top_k_providers(M, scene_ids: Sequence[int], k: int) -> Dict[int, List[int]]:
+    """Per scene, the ``k`` pairs allowed by ``M.ok`` with the shortest
+    ``M.dur``, ties by provider index (same as a stable sort of each row).
+
+    The ``k``-th shortest duration of every row comes from one
+    ``np.partition``; only the pairs up to it are sorted, so a call costs
+    O(S * P) plus O(k log k) per scene instead of a full sort of each row.
+    """
+    out: Dict[int, List[int]] = {sid: [] for sid in scene_ids}
+    if k <= 0 or not len(scene_ids) or not M.dur.shape[1]:
+        return out
+    sids = list(scene_ids)
+    ok = M.ok[sids]
+    dur = np.where(ok, M.dur[sids], np.inf)
+    kk = min(k, dur.shape[1])
+    kth = np.partition(dur, kk - 1, axis=1)[:, kk - 1]
+    for sid, row, mask, lim in zip(sids, dur, ok, kth):
+        # 경계값과 같은 쌍까지 모두 넣어야 동점이 번호 순서로 정리됨
+        cand = np.flatnonzero(mask & (row <= lim))
+        out[sid] = cand[np.argsort(row[cand], kind="stable")][:k].tolist()
+    return out
@@ -2,22 +2,86 @@ from Core.Scheduler.task_selector.fifo import FIFOTaskSelector
 from Core.Scheduler.metric_evaluator.baseline import BaselineEvaluator
 from Core.Scheduler.combo_generator.brute_force import BruteForceGenerator
 from Core.Scheduler.combo_generator.greedy import GreedyComboGenerator
+from Core.Scheduler.combo_generator.assignment import AssignmentComboGenerator
+from Core.Scheduler.combo_generator.bitmask_dp import BitmaskDPComboGenerator
+from Core.Scheduler.combo_generator.portfolio import PortfolioComboGenerator
+from Core.Scheduler.combo_generator.local_search import LocalSearchComboGenerator
+from Core.Scheduler.combo_generator.adaptive import AdaptiveComboGenerator
 from Core.Scheduler.dispatcher.sequential import SequentialDispatcher
 
-COMBO_REG = {"bf": BruteForceGenerator, "greedy": GreedyComboGenerator}
+COMBO_REG = {"bf": BruteForceGenerator, "greedy": GreedyComboGenerator,
+             "assign": AssignmentComboGenerator, "dp": BitmaskDPComboGenerator,
+             "portfolio": PortfolioComboGenerator, "auto": AdaptiveComboGenerator}
 
-DISP_REG = {"bf": SequentialDispatcher, "greedy": SequentialDispatcher}
+DISP_REG = {"bf": SequentialDispatcher, "greedy": SequentialDispatcher,
+            "assign": SequentialDispatcher, "dp": SequentialDispatcher,
+            "portfolio": SequentialDispatcher, "auto": SequentialDispatcher}
 
 try:
     from Core.Scheduler.combo_generator.cpsat import CPSatComboGenerator
     from Core.Scheduler.combo_generator.hybrid_cp import HybridCPComboGenerator
+    from Core.Scheduler.combo_generator.cp_joint import JointCPSatComboGenerator
     from Core.Scheduler.dispatcher.sequential import CPSatDispatcher
     if CPSatComboGenerator:
         COMBO_REG["cp"] = CPSatComboGenerator
         DISP_REG["cp"] = CPSatDispatcher
         COMBO_REG["hybrid_cp"] = HybridCPComboGenerator
         DISP_REG["hybrid_cp"] = CPSatDispatcher
+        COMBO_REG["cp_joint"] = JointCPSatComboGenerator
+        DISP_REG["cp_joint"] = CPSatDispatcher
 except ImportError:
     print("ERROR")
     pass
 
+
+def _split(algo):
+    base, plus, suffix = algo.partition("+")
+    if plus and suffix != "ls":
+        raise KeyError(algo)
+    return base, bool(plus)
+
+
+def algo_names():
+    """Every valid ``algo``: the registered generators and ``"<algo>+ls"`` for
+    those that solve one task at a time (joint ones cannot be wrapped)."""
+    return [*COMBO_REG, *(f"{a}+ls" for a, g in COMBO_REG.items() if not hasattr(g, "best_combos"))]
+
+
+def make_generator(algo, **kwargs):
+    """Combo generator of ``algo``; ``"<algo>+ls"`` wraps it in local search.
+
+    For ``+ls`` the :attr:`LocalSearchComboGenerator.OPTIONS` among
+    ``kwargs`` go to the local search, the rest to the wrapped generator
+    (``ValueError`` for a joint generator).
+    """
+    base, ls = _split(algo)
+    if not ls:
+        return COMBO_REG[base](**kwargs)
+    opts = {k: kwargs.pop(k) for k in LocalSearchComboGenerator.OPTIONS if k in kwargs}
+    return LocalSearchComboGenerator(COMBO_REG[base](**kwargs), **opts)
+
+
+def cli_kwargs(args):
+    """``(cp_kwargs, generator_kwargs)`` from the command-line options shared by
+    ``simulator.py`` and ``Experiment/run_experiments.py``.
+
+    ``cp_kwargs`` are the CP-SAT solver options given (``--cp-*``);
+    ``generator_kwargs`` are what ``args.algo`` takes of them, or its
+    ``--budget``/``--step-budget``. ``"<algo>+ls"`` passes its kwargs through
+    to the wrapped generator.
+    """
+    cp_kwargs = {k: v for k, v in (("num_workers", args.cp_workers),
+                                   ("time_limit", args.cp_time_limit),
+                                   ("relative_gap", args.cp_gap),
+                                   ("random_seed", args.cp_seed)) if v is not None}
+    base = args.algo.split("+")[0]
+    gen_kwargs = None
+    if base in ("cp", "hybrid_cp", "cp_joint"):
+        gen_kwargs = cp_kwargs
+    elif base in ("portfolio", "auto"):
+        gen_kwargs = {"budget": args.budget, "step_budget": args.step_budget}
+    return cp_kwargs, gen_kwargs
+
+
+def make_dispatcher(algo):
+    return DISP_REG[_split(algo)[0]]()
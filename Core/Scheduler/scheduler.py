@@ -1,12 +1,21 @@
 # Core/Scheduler/scheduler.py
+import copy
 import datetime
+import itertools
 import math
 import time
-from typing import List
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+import numpy as np
+
 from Model.tasks import Tasks, Task
 from Model.providers import Providers
 from Core.Scheduler.interface import TaskSelector, MetricEvaluator
-from Core.Scheduler.registry import COMBO_REG, DISP_REG
+from Core.Scheduler.combo_generator.cached import CachedComboGenerator
+from Core.Scheduler.provider_index import ActiveProviders
+from Core.Scheduler.registry import make_generator, make_dispatcher
+from utils.utils import to_epoch, from_epoch, US_PER_SEC, US_PER_HOUR
 
 try:
     from tqdm import tqdm
@@ -16,45 +25,179 @@ except Exception:  # pragma: no cover - fallback when tqdm is unavailable
 
 Assignment = tuple[str, int, datetime.datetime, datetime.datetime, int]
 
+
+def _solve_chunk(generator, evaluator, ps, tasks, now, active, verbose):
+    """Worker of the parallel mode: ``best_combo`` of each task on the step snapshot."""
+    return [generator.best_combo(t, ps, now, evaluator, verbose=verbose, active=active) for t in tasks]
+
+
+class _Pipeline:
+    """Sliding window of ``depth`` solves running ahead of the dispatch loop.
+
+    Tasks must be looked up in ``todo`` order; each lookup submits the next
+    task before waiting, so solving overlaps with dispatching.
+    """
+
+    def __init__(self, pool, solve, todo, depth, versions):
+        self._pool, self._solve, self.versions = pool, solve, versions
+        self._todo = list(todo)
+        self._next = 0
+        self._futures = {}
+        for _ in range(depth):
+            self._submit()
+
+    def _submit(self):
+        if self._next < len(self._todo):
+            t = self._todo[self._next]
+            self._next += 1
+            self._futures[t.id] = self._pool.submit(self._solve, t)
+
+    def __getitem__(self, tid):
+        self._submit()
+        return self._futures.pop(tid).result(), self.versions
+
 class BaselineScheduler:
+    """Step the simulation clock and schedule waiting tasks at each step.
+
+    ``mode="tick"`` advances the clock by ``time_gap`` on every step.
+    ``mode="event"`` jumps straight to the next instant at which the schedule
+    can change: a task arrival, a provider availability window opening or a
+    scene finishing. Tasks that were partially dispatched are retried one
+    ``time_gap`` later, exactly as in tick mode, so both modes produce the
+    same assignments whenever event times fall on tick boundaries.
+
+    ``algo="<algo>+ls"`` improves the generator's combos by local search
+    (see :func:`~Core.Scheduler.registry.make_generator`).
+    ``generator_kwargs`` are passed to the combo generator of ``algo``, e.g.
+    CP-SAT solver parameters (``num_workers``, ``time_limit``,
+    ``relative_gap``, ``random_seed``). ``memo > 0`` memoises the
+    generator's results in a
+    :class:`~Core.Scheduler.combo_generator.cached.CachedComboGenerator`
+    of that many entries (not available for joint generators).
+
+    Generators only see the providers whose availability window contains
+    ``now`` (``active=``), kept current by an
+    :class:`~Core.Scheduler.provider_index.ActiveProviders` sweep.
+
+    ``workers > 1`` solves the step's tasks speculatively in a process pool:
+    each worker gets a pickled snapshot of the providers (caches arrive
+    empty) and a share of the tasks. Combos are then committed in selector
+    order; a combo is kept if none of its providers changed since the
+    snapshot (``Provider.version``) and ``feasible`` still accepts it,
+    otherwise the task is solved again on the live state. A task without
+    a combo on the snapshot has none on the live state either, since
+    earlier commits only take capacity away. Commits are therefore
+    conflict-free, and when every task gets the combo a serial run would
+    give it, so does the result; generators whose choice depends on the
+    provider state they were solved on (ties, top-``k`` candidates,
+    heuristics) may pick differently. Counters are in ``parallel_stats``. Joint generators
+    (``best_combos``) ignore ``workers``.
+
+    ``pipeline > 0`` is the threaded variant: up to that many
+    ``best_combo`` calls run in a thread pool ahead of the dispatch loop
+    (CP-SAT releases the GIL while solving) and are committed the same way.
+    The threads read a copy of the providers taken at the start of the
+    step; only providers whose ``version`` changed are copied again, so
+    generator caches keyed by provider keep hitting. The generator must
+    accept concurrent calls for different tasks.
+    """
+
+    MODES = ("tick", "event")
+
     def __init__(self, *, algo="bf", time_gap=datetime.timedelta(minutes=5),
                  selector: TaskSelector = None,
                  evaluator: MetricEvaluator = None,
-                 verbose: int = 0):
+                 verbose: int = 0,
+                 mode: str = "tick",
+                 generator_kwargs: dict | None = None,
+                 memo: int = 0,
+                 workers: int = 0,
+                 pipeline: int = 0):
+        if mode not in self.MODES:
+            raise ValueError(f"unknown mode {mode!r}; expected one of {self.MODES}")
+        if workers > 1 and pipeline > 0:
+            raise ValueError("workers and pipeline are mutually exclusive")
         from Core.Scheduler.task_selector.fifo import FIFOTaskSelector
         from Core.Scheduler.metric_evaluator.baseline import BaselineEvaluator
         self.selector = selector or FIFOTaskSelector()
-        self.generator = COMBO_REG[algo]()
-        self.dispatcher = DISP_REG[algo]()
+        self.generator = make_generator(algo, **(generator_kwargs or {}))
+        if memo > 0:
+            self.generator = CachedComboGenerator(self.generator, cache_size=memo)
+        self.dispatcher = make_dispatcher(algo)
         self.evaluator = evaluator or BaselineEvaluator()
         self.time_gap = time_gap
         self.verbose = verbose
+        self.mode = mode
         self.waiting_tasks: List[Task] = []
         self.results: List[Assignment] = []
         # Tasks that were attempted but could not be scheduled under the
-        # current provider state. These will be skipped until the provider
-        # availability changes.
-        self._unschedulable: set[str] = set()
-        # Timestamp of the next provider availability change. Scheduling is
-        # skipped until this time unless new tasks arrive.
-        self._next_provider_event: datetime.datetime | None = None
+        # current provider state, with the providers that could ever run one
+        # of their scenes and the shortest such scene (hours). They are
+        # skipped until one of those providers can fit that scene (_wake).
+        self._unschedulable: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        # Timestamp (epoch us) of the next provider availability change.
+        # Scheduling is skipped until this time unless new tasks arrive.
+        self._next_provider_event: int | None = None
+        # Tasks whose evaluator cache was already dropped at their deadline
+        self._expired: set[str] = set()
+        # Per-step solver statistics of joint generators (see best_combos)
+        self.solve_log: List[dict] = []
+        # Providers available at the current step; built in run()
+        self._active: ActiveProviders | None = None
+        # Parallel mode (workers > 1); the pool lives for one run()
+        self.workers = workers
+        self._pool: ProcessPoolExecutor | None = None
+        # Pipelined mode (pipeline > 0): solver threads and their provider copies
+        self.pipeline = pipeline
+        self._threads: ThreadPoolExecutor | None = None
+        self._mirror: list = []
+        self.parallel_stats = {"speculated": 0, "committed": 0, "resolved": 0}
 
     def _feed(self, now, tasks):
         ids = {t.id for t in self.waiting_tasks}
         for t in tasks:
             # Add task to queue if its start time has arrived and it still has unassigned scenes
             if (
-                t.start_time <= now
+                t.start_us <= now
                 and t.id not in ids
                 and any(st is None for st, _ in t.scene_allocation_data)
             ):
                 self.waiting_tasks.append(t)
-        self.waiting_tasks.sort(key=lambda t: t.start_time)
+        self.waiting_tasks.sort(key=lambda t: t.start_us)
 
     def _schedule_once(self, now, ps):
         new: List[Assignment] = []
         remain = []
-        for t in self.selector.select(now, self.waiting_tasks):
+        selected = self.selector.select(now, self.waiting_tasks)
+        active = None
+        if self._active is not None:
+            self._active.update(now)
+            active = self._active.indices()
+        # Generators that optimise all waiting tasks together (best_combos)
+        # are solved once per step; the plans are dispatched in selector order
+        plans = None
+        spec = None  # speculative combos of the parallel mode
+        if hasattr(self.generator, "best_combos"):
+            todo = [
+                t for t in selected
+                if t.id not in self._unschedulable
+                and any(st is None for st, _ in t.scene_allocation_data)
+            ]
+            plans = self.generator.best_combos(
+                todo, ps, now, self.evaluator, verbose=self.verbose >= 2, active=active
+            ) if todo else {}
+            if todo:
+                self.solve_log.append({"now": now, **self.generator.last_solve})
+        elif self.workers > 1 or self.pipeline > 0:
+            todo = [
+                t for t in selected
+                if t.id not in self._unschedulable
+                and any(st is None for st, _ in t.scene_allocation_data)
+            ]
+            if len(todo) > 1:
+                spec = (self._speculate(todo, now, ps, active) if self.workers > 1
+                        else self._pipelined(todo, now, ps, active))
+        for t in selected:
             # Skip tasks that are already complete
             if all(st is not None for st, _ in t.scene_allocation_data):
                 continue
@@ -63,10 +206,17 @@ class BaselineScheduler:
                 remain.append(t)
                 continue
 
-            best = self.generator.best_combo(t, ps, now, self.evaluator, verbose=self.verbose >= 2)
+            if plans is not None:
+                best = plans.get(t.id)
+            elif spec is not None:
+                best = self._commit(t, spec[t.id], now, ps, active)
+            else:
+                best = self.generator.best_combo(
+                    t, ps, now, self.evaluator, verbose=self.verbose >= 2, active=active
+                )
             if best is None:
                 remain.append(t)
-                self._unschedulable.add(t.id)
+                self._mark_unschedulable(t, now, ps)
                 continue
             cmb, t_tot, cost = best
             if self.verbose >= 2:
@@ -77,64 +227,230 @@ class BaselineScheduler:
             # Keep tasks with remaining scenes for the next iteration
             if after_missing > 0:
                 remain.append(t)
+            else:
+                self._release(t)
         self.waiting_tasks = remain
         return new
 
-    def _compute_next_event(self, ps: Providers, after: datetime.datetime) -> datetime.datetime | None:
-        """Earliest time when provider availability may change."""
-        times: List[datetime.datetime] = []
+    def _speculate(self, todo, now, ps, active):
+        """Solve ``todo`` on a snapshot of ``ps`` in the process pool."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.workers)
+        n = min(self.workers, len(todo))
+        chunks = [todo[i::n] for i in range(n)]
+        futures = [
+            self._pool.submit(_solve_chunk, self.generator, self.evaluator, ps, chunk, now,
+                              active, self.verbose >= 2)
+            for chunk in chunks
+        ]
+        versions = [p.version for p in ps]
+        plans = {}
+        for chunk, fut in zip(chunks, futures):
+            for t, res in zip(chunk, fut.result()):
+                plans[t.id] = (res, versions)
+        self.parallel_stats["speculated"] += len(todo)
+        return plans
+
+    def _pipelined(self, todo, now, ps, active):
+        """Start solving ``todo`` in the thread pool on a copy of ``ps``."""
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(self.pipeline)
+        if len(self._mirror) != len(ps):
+            self._mirror = [None] * len(ps)
+        for i, p in enumerate(ps):
+            m = self._mirror[i]
+            if m is None or m.version != p.version:
+                self._mirror[i] = copy.deepcopy(p)
+        mirror = list(self._mirror)
+
+        def solve(t):
+            return self.generator.best_combo(
+                t, mirror, now, self.evaluator, verbose=self.verbose >= 2, active=active
+            )
+
+        self.parallel_stats["speculated"] += len(todo)
+        return _Pipeline(self._threads, solve, todo, self.pipeline, [p.version for p in ps])
+
+    def _commit(self, t, plan, now, ps, active):
+        """Speculative combo of ``t`` if still valid, else a fresh solve."""
+        res, versions = plan
+        if res is None:
+            return None
+        cmb = res[0]
+        taken = any(
+            p >= 0 and st is None and ps[p].version != versions[p]
+            for p, (st, _) in zip(cmb, t.scene_allocation_data)
+        )
+        if not taken and self.evaluator.feasible(t, cmb, now, ps)[0]:
+            self.parallel_stats["committed"] += 1
+            return res
+        self.parallel_stats["resolved"] += 1
+        return self.generator.best_combo(
+            t, ps, now, self.evaluator, verbose=self.verbose >= 2, active=active
+        )
+
+    def _mark_unschedulable(self, t, now, ps):
+        """Record which providers are relevant to ``t``'s failed attempt.
+
+        For every provider the shortest unassigned scene of ``t`` is kept;
+        durations do not depend on ``now``, so the task can only become
+        schedulable once one of these providers has that much capacity.
+        """
+        M = self.evaluator.scene_matrices(t, now, ps)
+        unassigned = np.array([st is None for st, _ in t.scene_allocation_data], dtype=bool)
+        with np.errstate(invalid="ignore"):
+            usable = np.isfinite(M.dur) & (M.dur > 0.0) & unassigned[:, None]
+        need = np.where(usable, M.dur, np.inf).min(axis=0)
+        pids = np.flatnonzero(np.isfinite(need))
+        self._unschedulable[t.id] = (pids, need[pids])
+
+    def _wake(self, now, ps):
+        """Retry unschedulable tasks for which a relevant provider gained capacity.
+
+        The test is the per-pair capacity check of ``scene_ok_mask``; a task
+        failing it for every provider would fail again, so skipping it does
+        not change any assignment.
+        """
+        if not self._unschedulable:
+            return
+        self._active.update(now)
+        cap = np.zeros(len(ps))
+        for i in self._active:
+            cap[i] = self._active.remaining(i)
+        cap /= US_PER_HOUR
+        for tid, (pids, need) in list(self._unschedulable.items()):
+            c = cap[pids]
+            if np.any(~(need - 1e-9 > c) & (c > 0.0)):
+                del self._unschedulable[tid]
+
+    def _release(self, t):
+        self.evaluator.release(t)
+        self.generator.release(t)
+
+    def _expire(self, now):
+        """Drop cached evaluator/generator state of waiting tasks past their deadline.
+
+        Late tasks keep being scheduled, so this happens once per task; what
+        they still need is recomputed on demand.
+        """
+        for t in self.waiting_tasks:
+            if t.deadline_us <= now and t.id not in self._expired:
+                self._expired.add(t.id)
+                self._release(t)
+
+    def _compute_next_event(self, ps: Providers, after: int) -> int | None:
+        """Earliest time (epoch us) when provider availability may change."""
+        times: List[int] = []
         for p in ps:
-            times += [f for *_, _, f in p.schedule if f > after]
-            times += [s for s, _ in getattr(p, "available_hours", []) if s > after]
+            for nxt in (p.busy.next_end(after), p.calendar.next_start(after)):
+                if nxt is not None:
+                    times.append(nxt)
+        return min(times) if times else None
+
+    def _next_instant(self, now: int, gap: int, tasks: Tasks) -> int | None:
+        """Next simulation time at which a step can change anything (event mode)."""
+        times: List[int] = []
+        # Tasks that still have schedulable scenes are retried on the next
+        # tick, mirroring tick mode.
+        if any(t.id not in self._unschedulable for t in self.waiting_tasks):
+            times.append(now + gap)
+        times += [
+            t.start_us for t in tasks
+            if t.start_us > now and any(st is None for st, _ in t.scene_allocation_data)
+        ]
+        if self._next_provider_event is not None and self._next_provider_event > now:
+            times.append(self._next_provider_event)
         return min(times) if times else None
 
+    def _close(self):
+        """Shut down the worker pools and release the generator's resources."""
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+        if self._threads is not None:
+            self._threads.shutdown(cancel_futures=True)
+            self._threads = None
+        self.generator.close()
+
     def run(self, tasks: Tasks, ps: Providers,
             time_start: datetime.datetime | None = None,
             time_end: datetime.datetime | None = None) -> List[Assignment]:
+        # Run on the integer time base; datetimes only reappear in results
+        gap = self.time_gap // datetime.timedelta(microseconds=1)
         if time_start is None:
             # Note: provider available_hours may be empty
             starts = []
             for p in ps:
-                if getattr(p, 'available_hours', None):
-                    starts.append(min(a[0] for a in p.available_hours))
-            time_start = min(starts) if starts else min(t.start_time for t in tasks)
-        now = time_start
+                if len(p.calendar):
+                    starts.append(int(p.calendar.starts[0]))
+            time_start = min(starts) if starts else min(t.start_us for t in tasks)
         if time_end is None:
-            time_end = max(t.deadline for t in tasks) + datetime.timedelta(days=1)
-        steps = math.ceil((time_end - time_start) / self.time_gap)
-        pbar = tqdm(range(steps), disable=self.verbose < 1)
-        for step in pbar:
-            step_start = time.time()
-            self._feed(now, tasks)
-            feed_elapsed = time.time() - step_start
-            waiting_before = len(self.waiting_tasks)
-            sched_start = time.time()
-
-            need_schedule = any(t.id not in self._unschedulable for t in self.waiting_tasks)
-            if self._next_provider_event and now >= self._next_provider_event:
-                self._unschedulable.clear()
-                need_schedule = True
-            if need_schedule:
-                new = self._schedule_once(now, ps)
-                self._next_provider_event = self._compute_next_event(ps, now)
-            else:
-                new = []
-
-            sched_elapsed = time.time() - sched_start
-            waiting_after = len(self.waiting_tasks)
-            self.results += new
-            total_elapsed = time.time() - step_start
-            if self.verbose >= 1:
-                msg = (
-                    f"[step {step}] waiting={waiting_before}->{waiting_after} "
-                    f"assigned={len(new)} feed={feed_elapsed:.3f}s "
-                    f"schedule={sched_elapsed:.3f}s total={total_elapsed:.3f}s"
-                )
-                if hasattr(pbar, "write"):
-                    pbar.write(msg)
+            time_end = max(t.deadline_us for t in tasks) + 24 * 3600 * US_PER_SEC
+        time_start, time_end = to_epoch(time_start), to_epoch(time_end)
+        now = time_start
+        self._active = ActiveProviders(ps)
+        if self.mode == "event":
+            pbar = tqdm(itertools.count(), disable=self.verbose < 1)
+        else:
+            steps = math.ceil((time_end - time_start) / gap)
+            pbar = tqdm(range(steps), disable=self.verbose < 1)
+        # Worker pools are closed on any exit, not only after the last step
+        try:
+            for step in pbar:
+                step_start = time.time()
+                self._feed(now, tasks)
+                self._expire(now)
+                feed_elapsed = time.time() - step_start
+                waiting_before = len(self.waiting_tasks)
+                sched_start = time.time()
+
+                need_schedule = any(t.id not in self._unschedulable for t in self.waiting_tasks)
+                if self._next_provider_event and now >= self._next_provider_event:
+                    self._wake(now, ps)
+                    need_schedule = True
+                solves_before = len(self.solve_log)
+                if need_schedule:
+                    new = self._schedule_once(now, ps)
+                    self._next_provider_event = self._compute_next_event(ps, now)
+                else:
+                    new = []
+
+                sched_elapsed = time.time() - sched_start
+                waiting_after = len(self.waiting_tasks)
+                self.results += new
+                total_elapsed = time.time() - step_start
+                if self.verbose >= 1:
+                    msg = (
+                        f"[step {step}] now={from_epoch(now):%m-%d %H:%M} "
+                        f"waiting={waiting_before}->{waiting_after} "
+                        f"assigned={len(new)} feed={feed_elapsed:.3f}s "
+                        f"schedule={sched_elapsed:.3f}s total={total_elapsed:.3f}s"
+                    )
+                    if len(self.solve_log) > solves_before:
+                        sol = self.solve_log[-1]
+                        msg += f" solve={sol['wall_time']:.3f}s gap={sol['gap']:.2%}"
+                        if "build_time" in sol:
+                            msg += f" build={sol['build_time']:.3f}s"
+                    if hasattr(pbar, "write"):
+                        pbar.write(msg)
+                    else:
+                        print(msg)
+                if all(all(st is not None for st, _ in t.scene_allocation_data) for t in tasks):
+                    break
+                if self.mode == "event":
+                    now = self._next_instant(now, gap, tasks)
+                    if now is None or now >= time_end:
+                        break
                 else:
-                    print(msg)
-            if all(all(st is not None for st, _ in t.scene_allocation_data) for t in tasks):
-                break
-            now += self.time_gap
+                    now += gap
+        finally:
+            self._close()
+        if self.verbose >= 1:
+            for name, stats in (("cache", self.evaluator.cache_stats()),
+                                ("generator cache", self.generator.cache_stats()),
+                                ("parallel", self.parallel_stats if self.workers > 1 or self.pipeline else {})):
+                if stats:
+                    print(f"[{name}] " + " ".join(
+                        f"{k}={v:.3f}" if isinstance(v, float) else f"{k}={v}" for k, v in stats.items()
+                    ))
         return self.results
@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-import datetime
 from typing import List, Sequence
 
 from Core.Scheduler.interface import TaskSelector
 from Model.tasks import Task
+from utils.utils import to_epoch, US_PER_HOUR
 
 
 class EDFPriorityTaskSelector(TaskSelector):
@@ -17,12 +17,14 @@ class EDFPriorityTaskSelector(TaskSelector):
     per remaining scene is selected first.
     """
 
-    def select(self, now: datetime.datetime, waiting: Sequence[Task]) -> List[Task]:
+    def select(self, now: int, waiting: Sequence[Task]) -> List[Task]:
+        now = to_epoch(now)
+
         def score(t: Task) -> tuple[float, float]:
             remaining = sum(st is None for st, _ in t.scene_allocation_data)
             if remaining <= 0:
                 remaining = 1  # avoid division by zero; complete tasks are filtered elsewhere
-            slack_hours = (t.deadline - now).total_seconds() / 3600.0
+            slack_hours = (t.deadline_us - now) / US_PER_HOUR
             return (slack_hours, -t.budget / remaining)
 
         return sorted(waiting, key=score)
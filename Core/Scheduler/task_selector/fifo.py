@@ -3,8 +3,7 @@ from __future__ import annotations
 from Core.Scheduler.interface import TaskSelector
 from typing import List, Sequence
 from Model.tasks import Task
-import datetime
 
 class FIFOTaskSelector(TaskSelector):
-    def select(self, now: datetime.datetime, waiting: Sequence[Task]) -> List[Task]:
+    def select(self, now: int, waiting: Sequence[Task]) -> List[Task]:
         return list(waiting)
@@ -26,3 +26,9 @@ class Scheduler(Protocol):
 BaselineScheduler = _BaselineScheduler
 
 __all__ = ["Scheduler", "Assignment", "BaselineScheduler"]
+
+try:
+    from Core.Scheduler.lookahead import LookaheadScheduler
+    __all__.append("LookaheadScheduler")
+except ImportError:  # ortools missing
+    pass
@@ -27,6 +27,8 @@ if str(ROOT) not in sys.path:
 # ---------------------------------------------------------------------------
 
 def _parse_args(argv: list[str] | None = None):
+    from Core.Scheduler.registry import algo_names
+
     pa = argparse.ArgumentParser(
         description="End-to-end scheduling experiment runner (config 생성 + 시뮬 + 로그 저장)"
     )
@@ -52,13 +54,26 @@ def _parse_args(argv: list[str] | None = None):
         "--out-config", default="config.json", help="--generate 출력 파일명"
     )
     pa.add_argument(
-        "--algo", default="bf", choices=["bf", "cp"],
-        help="BaselineScheduler 알고리즘: bf (Brute Force) 또는 cp (CP-SAT)"
+        "--algo", default="bf", choices=algo_names(),
+        help="BaselineScheduler 알고리즘: bf (Brute Force), greedy, assign (최소비용 할당), dp (비트마스크 DP), cp (CP-SAT), hybrid_cp, cp_joint (스텝 단위 전체 task CP-SAT), portfolio (greedy + 시간 예산 내 bf/cp), auto (task별 알고리즘 자동 선택); <algo>+ls는 local search 후처리 (cp_joint 제외)"
     )
     pa.add_argument(
         "--time-gap-min", type=int, default=5,
         help="스케줄러 ticker 시간 간격 (minutes)"
     )
+    pa.add_argument(
+        "--mode", default="tick", choices=["tick", "event"],
+        help="tick: time_gap 간격 진행 | event: 다음 이벤트(도착/가용구간/완료) 시점으로 이동"
+    )
+    pa.add_argument("--cp-workers", type=int, default=None, help="CP-SAT num_workers")
+    pa.add_argument("--cp-time-limit", type=float, default=None, help="CP-SAT 1회 풀이 시간 제한 (초)")
+    pa.add_argument("--cp-gap", type=float, default=None, help="CP-SAT relative gap limit")
+    pa.add_argument("--cp-seed", type=int, default=None, help="CP-SAT random seed")
+    pa.add_argument("--budget", type=float, default=1.0, help="portfolio, auto: task당 시간 예산 (초)")
+    pa.add_argument("--step-budget", type=float, default=None, help="portfolio, auto: 스텝당 시간 예산 (초)")
+    pa.add_argument("--workers", type=int, default=0, help="스텝의 task들을 병렬로 풀 프로세스 수 (0 = 순차)")
+    pa.add_argument("--pipeline", type=int, default=0, help="dispatch와 겹쳐 스레드에서 미리 돌릴 풀이 수 (0 = 끔)")
+    pa.add_argument("--memo", type=int, default=0, help="best_combo 결과 메모 캐시 크기 (0 = 끔)")
     pa.add_argument(
         "--result-out", default=None, help="평가 결과 JSON 저장 경로 (선택)"
     )
@@ -101,12 +116,20 @@ def main():
     # 2) 시뮬 + 스케줄 --------------------------------------------------------
     from simulator import Simulator
     from Core.scheduler import BaselineScheduler
+    from Core.Scheduler.registry import cli_kwargs
+
+    _, gen_kwargs = cli_kwargs(args)
 
     sim = Simulator(cfg_path)
     sch = BaselineScheduler(
         algo=args.algo,
         verbose=args.v,
         time_gap=datetime.timedelta(minutes=args.time_gap_min),
+        mode=args.mode,
+        generator_kwargs=gen_kwargs,
+        memo=args.memo,
+        workers=args.workers,
+        pipeline=args.pipeline,
     )
 
     # 3) verbose 로그 파일 저장 설정 ----------------------------------------
@@ -0,0 +1,142 @@
+"""Availability calendar used by providers."""
+
+from __future__ import annotations
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+
+class AvailabilityCalendar:
+    """Sorted availability windows stored as two int64 arrays (epoch us).
+
+    Windows are half-open ``[start, end)`` and must not overlap, so both
+    ``starts`` and ``ends`` are sorted and every lookup is a binary search.
+    """
+
+    __slots__ = ("starts", "ends")
+
+    def __init__(self, windows: Iterable[Tuple[int, int]] = ()):
+        ws = sorted((int(s), int(e)) for s, e in windows)
+        self.starts = np.array([s for s, _ in ws], dtype=np.int64)
+        self.ends = np.array([e for _, e in ws], dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return zip(self.starts.tolist(), self.ends.tolist())
+
+    def windows(self) -> List[Tuple[int, int]]:
+        return list(self)
+
+    # ---------------------------------------------------
+    # Queries
+    # ---------------------------------------------------
+    def index_at(self, now: int) -> int:
+        """Index of the window containing ``now``, or -1."""
+        i = int(self.starts.searchsorted(now, "right")) - 1
+        if i >= 0 and now < self.ends[i]:
+            return i
+        return -1
+
+    def remaining(self, now: int) -> int:
+        """Time left (us) in the window containing ``now``; 0 if none."""
+        i = int(self.starts.searchsorted(now, "right")) - 1
+        if i < 0:
+            return 0
+        end = int(self.ends[i])
+        return end - now if now < end else 0
+
+    def next_start(self, after: int) -> Optional[int]:
+        """First window start strictly after ``after``."""
+        i = int(self.starts.searchsorted(after, "right"))
+        return int(self.starts[i]) if i < len(self.starts) else None
+
+    def first_ending_after(self, after: int) -> int:
+        """Index of the first window whose end is strictly after ``after``."""
+        return int(self.ends.searchsorted(after, "right"))
+
+    # ---------------------------------------------------
+    # Mutation
+    # ---------------------------------------------------
+    def remove(self, start: int, finish: int) -> None:
+        """Carve ``[start, finish)`` out of the calendar."""
+        lo = int(self.ends.searchsorted(start, "right"))
+        hi = int(self.starts.searchsorted(finish, "left"))
+        if lo >= hi:
+            return
+        if hi - lo == 1:
+            # Common case: the block sits inside a single window
+            s, e = int(self.starts[lo]), int(self.ends[lo])
+            if s < start and finish < e:
+                self.starts = np.insert(self.starts, lo + 1, finish)
+                self.ends = np.insert(self.ends, lo, start)
+            elif s < start:
+                self.ends[lo] = start
+            elif finish < e:
+                self.starts[lo] = finish
+            else:
+                self.starts = np.delete(self.starts, lo)
+                self.ends = np.delete(self.ends, lo)
+            return
+        keep_s: List[int] = []
+        keep_e: List[int] = []
+        if self.starts[lo] < start:
+            keep_s.append(int(self.starts[lo])); keep_e.append(start)
+        if finish < self.ends[hi - 1]:
+            keep_s.append(finish); keep_e.append(int(self.ends[hi - 1]))
+        self.starts = np.concatenate((self.starts[:lo], np.array(keep_s, dtype=np.int64), self.starts[hi:]))
+        self.ends = np.concatenate((self.ends[:lo], np.array(keep_e, dtype=np.int64), self.ends[hi:]))
+
+
+class BusyIndex:
+    """Merged, sorted busy intervals of a provider (epoch us).
+
+    Kept as plain sorted lists because every assignment inserts into it;
+    overlapping or touching intervals are merged on insert, so the
+    free gaps are exactly the holes between consecutive entries.
+    """
+
+    __slots__ = ("starts", "ends", "total")
+
+    def __init__(self, intervals: Iterable[Tuple[int, int]] = ()):
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.total = 0  # summed length of the merged intervals (us)
+        for s, f in intervals:
+            self.add(s, f)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return zip(self.starts, self.ends)
+
+    def add(self, start: int, finish: int) -> None:
+        # Entries overlapping or touching [start, finish) are lo .. hi-1
+        lo = bisect_left(self.ends, start)
+        hi = bisect_right(self.starts, finish)
+        if lo < hi:
+            start = min(start, self.starts[lo])
+            finish = max(finish, self.ends[hi - 1])
+            self.total -= sum(f - s for s, f in zip(self.starts[lo:hi], self.ends[lo:hi]))
+        self.starts[lo:hi] = [start]
+        self.ends[lo:hi] = [finish]
+        self.total += finish - start
+
+    def next_end(self, after: int) -> Optional[int]:
+        """First interval end strictly after ``after``."""
+        i = bisect_right(self.ends, after)
+        return self.ends[i] if i < len(self.ends) else None
+
+    def first_gap(self, after: int, until: int, dur: int) -> Optional[int]:
+        """Earliest t >= after with [t, t + dur) free and t + dur <= until."""
+        cur = after
+        i = bisect_right(self.ends, cur)
+        while i < len(self.starts) and self.starts[i] < until:
+            if self.starts[i] - cur >= dur:
+                return cur
+            cur = max(cur, self.ends[i])
+            i += 1
+        return cur if until - cur >= dur else None
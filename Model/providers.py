@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 import datetime
-from typing import Dict, Any, List, Tuple, Optional
-from utils.utils import merge_intervals
+from typing import Dict, Any, List, Set, Tuple, Optional, Union
+from utils.utils import to_epoch, from_epoch, hours_to_us
+from Model.calendar import AvailabilityCalendar, BusyIndex
 
 
 class Provider:
@@ -12,77 +13,96 @@ class Provider:
         self.price_per_gpu_hour: float = float(d.get("price", 0.0))  # $
         self.bandwidth: float = float(d.get("bandwidth", 0.0))  # MB/s
 
-        raw = d.get("available_hours", [])
-        self.available_hours: List[Tuple[datetime.datetime, datetime.datetime]] = [
+        # Bumped whenever availability or the schedule changes, so callers
+        # can cache anything derived from the provider state
+        self.version = 0
+
+        self.available_hours = d.get("available_hours", [])
+
+        self.schedule = []
+
+    # ---------------------------------------------------
+    # Availability (epoch microseconds internally)
+    # ---------------------------------------------------
+    @property
+    def available_hours(self) -> List[Tuple[datetime.datetime, datetime.datetime]]:
+        return [(from_epoch(s), from_epoch(e)) for s, e in self.calendar]
+
+    @available_hours.setter
+    def available_hours(self, raw) -> None:
+        self.calendar = AvailabilityCalendar(
             (
-                datetime.datetime.fromisoformat(s) if isinstance(s, str) else s,
-                datetime.datetime.fromisoformat(e) if isinstance(e, str) else e,
+                to_epoch(datetime.datetime.fromisoformat(s) if isinstance(s, str) else s),
+                to_epoch(datetime.datetime.fromisoformat(e) if isinstance(e, str) else e),
             )
             for s, e in raw
-        ]
+        )
+        self.version += 1
 
-        # (task_id, scene_id, start, finish)
-        self.schedule: List[Tuple[str, int, datetime.datetime, datetime.datetime]] = []
+    # ---------------------------------------------------
+    # Executed scenes
+    # ---------------------------------------------------
+    @property
+    def schedule(self) -> Tuple[Tuple[str, int, datetime.datetime, datetime.datetime], ...]:
+        """(task_id, scene_id, start, finish) records, in assignment order.
+
+        A read-only copy: add records through :meth:`assign` or replace them
+        all through the setter, so ``busy``, ``hosted`` and ``version`` follow.
+        """
+        return tuple(self._schedule)
+
+    @schedule.setter
+    def schedule(self, records) -> None:
+        # Replacing the whole schedule rebuilds the derived indexes
+        self._schedule = list(records)
+        self.busy = BusyIndex((to_epoch(s), to_epoch(f)) for *_, s, f in self._schedule)
+        # Ids of tasks with at least one scene here, i.e. whose global file
+        # has already been transferred to this provider
+        self.hosted: Set[str] = {rec[0] for rec in self._schedule}
+        self.version += 1
 
     # ---------------------------------------------------
     # Metrics
     # ---------------------------------------------------
     def idle_ratio(
         self,
-        start: Optional[datetime.datetime] = None,
-        end: Optional[datetime.datetime] = None,
+        start: Union[int, datetime.datetime, None] = None,
+        end: Union[int, datetime.datetime, None] = None,
     ) -> float:
-        if not self.schedule:
+        busy = self.busy
+        if not busy:
             return 1.0
-        if start is None:
-            start = min(s for *_, s, _ in self.schedule)
-        if end is None:
-            end = max(f for *_, f in self.schedule)
-        horizon = (end - start).total_seconds() / 3600.0
+        start = busy.starts[0] if start is None else to_epoch(start)
+        end = busy.ends[-1] if end is None else to_epoch(end)
+        horizon = end - start
         if horizon <= 0:
             return 1.0
-        busy = merge_intervals([(s, f) for *_, s, f in self.schedule])
-        busy_h = sum((f - s).total_seconds() / 3600.0 for s, f in busy)
-        return max(0.0, 1.0 - busy_h / horizon)
+        return max(0.0, 1.0 - busy.total / horizon)
 
     # ---------------------------------------------------
     # Scheduling helpers
     # ---------------------------------------------------
-    def earliest_available(self, dur_h: float, after: datetime.datetime) -> Optional[datetime.datetime]:
-        """Earliest time (>= after) to allocate a contiguous block of length dur_h."""
-        for a_s, a_e in sorted(self.available_hours, key=lambda t: t[0]):
-            if a_e <= after:
-                continue
-            cur = max(a_s, after)
-
-            # Find a gap within the window that does not clash with existing schedule
-            clashes = sorted(
-                [(s, f) for *_, s, f in self.schedule if s < a_e and f > cur],
-                key=lambda iv: iv[0],
-            )
-            for s, f in clashes:
-                if (s - cur).total_seconds() / 3600.0 >= dur_h:
-                    return cur
-                cur = max(cur, f)
-            if (a_e - cur).total_seconds() / 3600.0 >= dur_h:
+    def earliest_available(self, dur_h: float, after: Union[int, datetime.datetime]) -> Optional[int]:
+        """Earliest time (>= after, epoch us) to allocate a contiguous block of length dur_h."""
+        after = to_epoch(after)
+        dur = hours_to_us(dur_h)
+        cal = self.calendar
+        for i in range(cal.first_ending_after(after), len(cal)):
+            # First gap within the window that does not clash with the schedule
+            cur = self.busy.first_gap(max(int(cal.starts[i]), after), int(cal.ends[i]), dur)
+            if cur is not None:
                 return cur
         return None
 
-    def assign(self, task_id: str, scene_id: int, start: datetime.datetime, dur_h: float):
-        finish = start + datetime.timedelta(hours=dur_h)
-        self.schedule.append((task_id, scene_id, start, finish))
-
-        # Update available_hours by removing the allocated interval
-        new: List[Tuple[datetime.datetime, datetime.datetime]] = []
-        for s, e in self.available_hours:
-            if finish <= s or start >= e:
-                new.append((s, e))
-                continue
-            if s < start:
-                new.append((s, start))
-            if finish < e:
-                new.append((finish, e))
-        self.available_hours = new
+    def assign(self, task_id: str, scene_id: int, start: Union[int, datetime.datetime], dur_h: float):
+        start = to_epoch(start)
+        finish = start + hours_to_us(dur_h)
+        self._schedule.append((task_id, scene_id, from_epoch(start), from_epoch(finish)))
+        self.busy.add(start, finish)
+        self.hosted.add(task_id)
+        # Remove the allocated interval from availability
+        self.calendar.remove(start, finish)
+        self.version += 1
 
 
 class Providers:
@@ -3,6 +3,7 @@
 from __future__ import annotations
 import datetime
 from typing import Dict, List, Tuple, Optional, Any
+from utils.utils import to_epoch
 
 
 class Task:
@@ -29,11 +30,16 @@ class Task:
         self.start_time: datetime.datetime = (
             datetime.datetime.fromisoformat(d["start_time"]) if isinstance(d["start_time"], str) else d["start_time"]
         )
+        # Same instants on the integer time base used by the scheduler
+        self.deadline_us: int = to_epoch(self.deadline)
+        self.start_us: int = to_epoch(self.start_time)
 
         # (start_time, provider_idx) for each scene
         self.scene_allocation_data: List[Tuple[Optional[datetime.datetime], Optional[int]]] = [
             (None, None) for _ in range(self.scene_number)
         ]
+        # Running total ($) of committed scenes, updated by the dispatcher
+        self.spent_cost: float = 0.0
 
     # Helpers
     def scene_size(self, idx: int) -> float:
@@ -17,6 +17,7 @@ from Model.tasks import Tasks
 from Model.providers import Providers
 from Core.scheduler import BaselineScheduler, Assignment
 from Core.Scheduler import system_evaluator
+from Core.Scheduler.registry import cli_kwargs
 
 _DEFAULT_COLORS = plt.rcParams["axes.prop_cycle"].by_key()["color"]
 
@@ -160,15 +161,42 @@ class Simulator:
 if __name__ == "__main__":
     pa = argparse.ArgumentParser()
     pa.add_argument("--config", default="config.json")
-    pa.add_argument("--algo",   default="bf", help="bf | cp")
+    pa.add_argument("--algo",   default="bf", help="bf | greedy | assign | dp | cp | hybrid_cp | cp_joint | portfolio | auto; "
+                                             "<algo>+ls adds a local-search pass (e.g. greedy+ls; not cp_joint)")
+    pa.add_argument("--mode", default="tick", choices=BaselineScheduler.MODES,
+                    help="tick: fixed time_gap steps | event: jump to next arrival/window/finish")
     pa.add_argument("--out-img", default="schedule.png", help="Output image path")
+    pa.add_argument("--cp-workers", type=int, default=None, help="CP-SAT num_workers (cp, hybrid_cp, cp_joint)")
+    pa.add_argument("--cp-time-limit", type=float, default=None, help="CP-SAT time limit per solve (s)")
+    pa.add_argument("--cp-gap", type=float, default=None, help="CP-SAT relative gap limit")
+    pa.add_argument("--cp-seed", type=int, default=None, help="CP-SAT random seed")
+    pa.add_argument("--budget", type=float, default=1.0, help="portfolio, auto: wall-clock budget per task (s)")
+    pa.add_argument("--step-budget", type=float, default=None, help="portfolio, auto: wall-clock budget per step (s)")
+    pa.add_argument("--workers", type=int, default=0, help="solve each step's tasks in this many processes (0 = serial)")
+    pa.add_argument("--pipeline", type=int, default=0, help="run up to this many solves in threads ahead of dispatch (0 = off)")
+    pa.add_argument("--lookahead", type=float, default=None,
+                    help="plan this many hours ahead with CP-SAT intervals (--algo is the fallback)")
+    pa.add_argument("--memo", type=int, default=0, help="memoise best_combo results (cache size, 0 = off)")
     pa.add_argument("-v", action="count", default=0, help="-v: step logs, -vv: detailed logs")
     args = pa.parse_args()
 
+    cp_kwargs, gen_kwargs = cli_kwargs(args)
+
     sim = Simulator(args.config)
-    sch = BaselineScheduler(algo=args.algo,
-                            verbose=args.v,
-                            time_gap=datetime.timedelta(minutes=5))
+    sch_kwargs = dict(algo=args.algo,
+                      verbose=args.v,
+                      time_gap=datetime.timedelta(minutes=5),
+                      mode=args.mode,
+                      generator_kwargs=gen_kwargs,
+                      memo=args.memo,
+                      workers=args.workers,
+                      pipeline=args.pipeline)
+    if args.lookahead is not None:
+        from Core.scheduler import LookaheadScheduler
+        sch = LookaheadScheduler(horizon=datetime.timedelta(hours=args.lookahead),
+                                 **cp_kwargs, **sch_kwargs)
+    else:
+        sch = BaselineScheduler(**sch_kwargs)
     sim.schedule(sch)
     pprint.pprint(sim.evaluate(), sort_dicts=False)
     sim.visualize(save_path=args.out_img, show=True)
@@ -0,0 +1,125 @@
+"""Instance builders and scoring shared by the test modules."""
+import datetime as dt
+import pathlib
+import random
+import sys
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+
+from Model.tasks import Tasks
+from Model.providers import Providers
+
+BASE = dt.datetime(2024, 1, 1, 8, 0)
+
+
+def random_instance(seed):
+    """One random task ``"T"`` and 2-6 providers; returns ``(task, providers, now)``."""
+    rng = random.Random(seed)
+    base = dt.datetime(2024, 1, 1, 8, 0)
+    n = rng.randint(3, 7)
+    tasks_data = [{
+        "id": "T",
+        "scene_number": n,
+        "scene_file_size": [rng.uniform(100, 5000) for _ in range(n)],
+        "global_file_size": rng.uniform(0, 2000),
+        "scene_workload": rng.uniform(500, 8000),
+        "bandwidth": rng.uniform(0.5, 5.0),
+        "budget": rng.uniform(1.0, 20.0),
+        "start_time": base,
+        "deadline": base + dt.timedelta(hours=rng.uniform(0.5, 4)),
+    }]
+    tasks = Tasks(); tasks.initialize_from_data(tasks_data)
+    prov_data = [{
+        "throughput": rng.uniform(500, 4000),
+        "price": rng.uniform(0.1, 3.0),
+        "bandwidth": rng.uniform(0.5, 5.0),
+        "available_hours": [(base, base + dt.timedelta(hours=rng.uniform(0.2, 5)))],
+    } for _ in range(rng.randint(2, 6))]
+    ps = Providers(); ps.initialize_from_data(prov_data)
+    return tasks["T"], ps, base
+
+
+def make_tasks_providers():
+    """Two staggered tasks on two providers with gaps in their windows."""
+    base = dt.datetime(2024, 1, 1, 8, 0)
+    tasks_data = [
+        {
+            "id": "T1",
+            "scene_number": 3,
+            "scene_file_size": 3600.0,
+            "global_file_size": 0.0,
+            "scene_workload": 3600.0,
+            "bandwidth": 10.0,
+            "budget": 100.0,
+            "start_time": base,
+            "deadline": base + dt.timedelta(hours=6),
+        },
+        {
+            "id": "T2",
+            "scene_number": 2,
+            "scene_file_size": 1800.0,
+            "global_file_size": 0.0,
+            "scene_workload": 1800.0,
+            "bandwidth": 10.0,
+            "budget": 100.0,
+            "start_time": base + dt.timedelta(hours=3),
+            "deadline": base + dt.timedelta(hours=8),
+        },
+    ]
+    tasks = Tasks(); tasks.initialize_from_data(tasks_data)
+
+    prov_data = [
+        {
+            "throughput": 3600.0,
+            "price": 1.0,
+            "bandwidth": 1.0,
+            "available_hours": [(base, base + dt.timedelta(hours=4)),
+                                (base + dt.timedelta(hours=5), base + dt.timedelta(hours=9))],
+        },
+        {
+            "throughput": 1800.0,
+            "price": 0.5,
+            "bandwidth": 2.0,
+            "available_hours": [(base + dt.timedelta(hours=1), base + dt.timedelta(hours=6))],
+        },
+    ]
+    providers = Providers(); providers.initialize_from_data(prov_data)
+    return tasks, providers
+
+
+def deep_queue(n_tasks=8, n_prov=5):
+    """Many tasks arriving together, competing for a few providers."""
+    tasks_data = [{
+        "id": f"T{i}", "scene_number": 2 + i % 3, "scene_file_size": 1800.0 * (1 + i % 2),
+        "global_file_size": 600.0, "scene_workload": 3600.0 * (1 + i % 4), "bandwidth": 2.0,
+        "budget": 50.0, "start_time": BASE + dt.timedelta(minutes=5 * (i % 2)),
+        "deadline": BASE + dt.timedelta(hours=12),
+    } for i in range(n_tasks)]
+    tasks = Tasks(); tasks.initialize_from_data(tasks_data)
+    prov_data = [{
+        "throughput": 1800.0 * (1 + i % 3), "price": 1.0 + i % 2, "bandwidth": 2.0,
+        "available_hours": [(BASE + dt.timedelta(hours=i % 2), BASE + dt.timedelta(hours=30))],
+    } for i in range(n_prov)]
+    ps = Providers(); ps.initialize_from_data(prov_data)
+    return tasks, ps
+
+
+def symmetric_instance(sizes=(0.0, 0.0, 0.0, 3600.0, 3600.0, 0.0), budget=100.0):
+    """Scenes of two sizes on two provider classes (whole-hour durations)."""
+    tasks_data = [{
+        "id": "T", "scene_number": len(sizes), "scene_file_size": list(sizes),
+        "global_file_size": 0.0, "scene_workload": 3600.0, "bandwidth": 1.0,
+        "budget": budget, "start_time": BASE, "deadline": BASE + dt.timedelta(hours=3),
+    }]
+    tasks = Tasks(); tasks.initialize_from_data(tasks_data)
+    prov_data = [{
+        "throughput": 3600.0 if i % 2 else 1800.0, "price": 2.0 if i % 2 else 1.0,
+        "bandwidth": 1.0, "available_hours": [(BASE, BASE + dt.timedelta(hours=10))],
+    } for i in range(6)]
+    ps = Providers(); ps.initialize_from_data(prov_data)
+    return tasks["T"], ps
+
+
+def score(ev, t, ps, now, cmb):
+    """``ev``'s score of combo ``cmb`` (-inf when infeasible)."""
+    return ev.efficiency(t, cmb, ps, now, *ev.feasible(t, cmb, now, ps)[1:])
@@ -0,0 +1,153 @@
+import pathlib
+import pickle
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+
+from Core.Scheduler.metric_evaluator.baseline import BaselineEvaluator
+from Core.Scheduler.combo_generator.adaptive import AdaptiveComboGenerator
+from Core.Scheduler.combo_generator.bitmask_dp import BitmaskDPComboGenerator
+from Core.Scheduler.combo_generator.brute_force import BruteForceGenerator
+from Core.Scheduler.combo_generator.greedy import GreedyComboGenerator
+from Core.Scheduler.provider_index import top_k_providers
+from Core.Scheduler.scheduler import BaselineScheduler
+from utils.utils import to_epoch
+from conftest import random_instance, make_tasks_providers
+
+ENGINES = {"bf": BruteForceGenerator, "dp": BitmaskDPComboGenerator, "greedy": GreedyComboGenerator}
+
+
+def test_choose_fastest_engine_within_budget():
+    gen = AdaptiveComboGenerator(engines=("bf", "dp"), rates={"bf": 1e-3, "dp": 1e-2, "greedy": 1e-6})
+    assert gen.choose({"bf": 9, "dp": 9, "greedy": 20}, 1.0) == ("bf", pytest.approx(1e-2))
+    # bf가 예산을 넘으면 dp, 둘 다 넘으면 greedy
+    assert gen.choose({"bf": 1e4, "dp": 9, "greedy": 20}, 1.0)[0] == "dp"
+    assert gen.choose({"bf": 1e4, "dp": 1e4, "greedy": 20}, 1.0)[0] == "greedy"
+    # 들어가는 쌍이 없으면 풀 필요 없음
+    assert gen.choose({"bf": 0, "dp": 0, "greedy": 0}, 1.0)[0] == "greedy"
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_sizes(seed):
+    t, ps, now = random_instance(seed)
+    ev = BaselineEvaluator()
+    sizes = AdaptiveComboGenerator(engines=("bf", "dp")).sizes(t, ps, now, ev)
+    bf, dp = BruteForceGenerator(), BitmaskDPComboGenerator()
+    assert sizes["bf"] >= bf.time_complexity(t, ps, now, ev) + 1
+    assert sizes["dp"] == dp.time_complexity(t, ps, now, ev)
+    assert sizes["greedy"] == int(ev.scene_matrices(t, now, ps).ok.sum())
+    # 엔진별 k만큼 잘라 쓰므로 전체 순위를 줘도 같음
+    M = ev.scene_matrices(t, now, ps)
+    sids = [s for s, (st, _) in enumerate(t.scene_allocation_data) if st is None]
+    top = top_k_providers(M, sids, len(ps))
+    assert sizes["bf"] == bf.size_estimate(t, M, sids, top)
+    assert sizes["dp"] == dp.size_estimate(t, M, sids, top)
+
+
+def test_greedy_fallback_when_engine_places_nothing():
+    t, ps, now = random_instance(0)
+    ev = BaselineEvaluator()
+    gen = AdaptiveComboGenerator(engines=("dp",), budget=10.0)
+    gen.engines["dp"].best_combo = lambda *a, **kw: None
+    assert gen.best_combo(t, ps, now, ev) == GreedyComboGenerator().best_combo(t, ps, now, ev)
+    assert gen.log[-1]["algo"] == "dp" and gen.log[-1]["fallback"]
+
+
+def test_fallback_ignores_providers_of_assigned_scenes():
+    t, ps, now = random_instance(0)
+    ev = BaselineEvaluator()
+    t.scene_allocation_data[0] = (now, 0)
+    gen = AdaptiveComboGenerator(engines=("dp",), budget=10.0)
+    # CP처럼 배정된 씬의 provider만 담고 새로 배치한 씬은 없음
+    gen.engines["dp"].best_combo = lambda *a, **kw: ([0] + [-1] * (t.scene_number - 1), 0.0, 0.0)
+    assert gen.best_combo(t, ps, now, ev) == GreedyComboGenerator().best_combo(t, ps, now, ev)
+    assert gen.log[-1]["fallback"]
+
+
+def test_cp_time_limit_capped_by_budget():
+    pytest.importorskip("ortools")
+    t, ps, now = random_instance(0)
+    ev = BaselineEvaluator()
+    gen = AdaptiveComboGenerator(engines=("cp",), budget=0.25)
+    seen = []
+    gen.engines["cp"].best_combo = lambda *a, time_limit=None, **kw: seen.append(time_limit)
+    gen.rates["cp"] = 0.0  # 항상 cp 선택
+    gen.best_combo(t, ps, now, ev)
+    assert gen.log[-1]["algo"] == "cp" and 0 < seen[0] <= 0.25
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_routes_and_calibrates(seed):
+    t, ps, now = random_instance(seed)
+    ev = BaselineEvaluator()
+    gen = AdaptiveComboGenerator(engines=("bf", "dp"), budget=10.0)
+    before = dict(gen.rates)
+    res = gen.best_combo(t, ps, now, ev)
+    entry = gen.log[-1]
+    name = entry["algo"]
+    assert res == ENGINES[name]().best_combo(t, ps, now, ev)
+    assert gen.decisions == {name: 1}
+    want = before[name] + gen.alpha * (entry["observed"] / (entry["size"] + 1) - before[name])
+    assert gen.rates[name] == pytest.approx(want)
+    assert all(gen.rates[k] == before[k] for k in before if k != name)
+
+
+def test_slow_engine_is_dropped_after_calibration():
+    t, ps, now = random_instance(3)
+    ev = BaselineEvaluator()
+    gen = AdaptiveComboGenerator(engines=("bf", "dp"), budget=10.0, alpha=1.0)
+    gen.best_combo(t, ps, now, ev)
+    name = gen.log[-1]["algo"]
+    gen.rates[name] = 1e9  # 관측이 예산을 크게 넘은 것처럼
+    gen.best_combo(t, ps, now, ev)
+    assert gen.log[-1]["algo"] != name
+
+
+def test_step_budget_exhausted_routes_to_greedy():
+    t, ps, now = random_instance(0)
+    ev = BaselineEvaluator()
+    gen = AdaptiveComboGenerator(engines=("bf", "dp"), step_budget=0.0)
+    assert gen.best_combo(t, ps, now, ev) == GreedyComboGenerator().best_combo(t, ps, now, ev)
+    assert gen.decisions == {"greedy": 1}
+
+
+def test_concurrent_calls_share_one_step_budget():
+    t, ps, now = random_instance(0)
+    ev = BaselineEvaluator()
+    gen = AdaptiveComboGenerator(engines=("bf", "dp"), step_budget=0.05, budget=10.0)
+    with ThreadPoolExecutor(4) as pool:
+        list(pool.map(lambda _: gen.best_combo(t, ps, now, ev), range(8)))
+    # 같은 스텝이면 마감은 첫 호출에서 한 번만 정해짐
+    assert gen._step[0] == to_epoch(now)
+    assert sum(gen.decisions.values()) == len(gen.log) == 8
+    # 워커로 보낼 때 락은 새로 만듦
+    copy = pickle.loads(pickle.dumps(gen))
+    assert copy.best_combo(t, ps, now, ev) is not None
+
+
+def test_log_is_bounded():
+    t, ps, now = random_instance(0)
+    ev = BaselineEvaluator()
+    gen = AdaptiveComboGenerator(engines=("dp",), log_size=2)
+    for _ in range(3):
+        gen.best_combo(t, ps, now, ev)
+    assert len(gen.log) == 2 and sum(gen.decisions.values()) == 3
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        AdaptiveComboGenerator(engines=("bf", "magic"))
+
+
+@pytest.mark.parametrize("mode", ["tick", "event"])
+def test_scheduler_auto(mode):
+    tasks, ps = make_tasks_providers()
+    sch = BaselineScheduler(algo="auto", mode=mode)
+    res = sch.run(tasks, ps)
+    gen = sch.generator
+    assert res
+    assert sum(gen.decisions.values()) == len(gen.log) > 0
+    assert all(e["observed"] >= 0 for e in gen.log)
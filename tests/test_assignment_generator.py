@@ -0,0 +1,54 @@
+import itertools
+import pathlib
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+
+from Core.Scheduler.metric_evaluator.baseline import BaselineEvaluator
+from Core.Scheduler.combo_generator.brute_force import BruteForceGenerator
+from Core.Scheduler.combo_generator.assignment import AssignmentComboGenerator, min_cost_assignment
+from Core.Scheduler.scheduler import BaselineScheduler
+from conftest import random_instance, make_tasks_providers, score
+
+
+def test_min_cost_assignment_is_optimal():
+    rng = np.random.default_rng(0)
+    for _ in range(100):
+        n, m = map(int, rng.integers(1, 6, 2))
+        C = rng.normal(size=(n, m))
+        rows, cols = min_cost_assignment(C)
+        assert len(set(rows.tolist())) == len(set(cols.tolist())) == min(n, m)
+        if n <= m:
+            best = min(sum(C[i, p[i]] for i in range(n)) for p in itertools.permutations(range(m), n))
+        else:
+            best = min(sum(C[p[j], j] for j in range(m)) for p in itertools.permutations(range(n), m))
+        assert C[rows, cols].sum() == pytest.approx(best)
+
+
+# 324: 예산이 걸려 완전 탐색보다 나쁜 사례
+@pytest.mark.parametrize("seed", [*range(40), 324])
+def test_assign_matches_exhaustive_score(seed):
+    t, ps, now = random_instance(seed)
+    ev = BaselineEvaluator()
+    got = AssignmentComboGenerator().best_combo(t, ps, now, ev)
+    want = BruteForceGenerator(kprov=len(ps)).best_combo(t, ps, now, ev)
+    if want is None:
+        assert got is None
+        return
+    free = BruteForceGenerator(kprov=len(ps)).best_combo(t, ps, now, BaselineEvaluator(WB=0.0))
+    if free[2] <= t.budget - t.spent_cost:
+        # 예산이 안 걸리면 정확
+        assert score(ev, t, ps, now, got[0]) == pytest.approx(score(ev, t, ps, now, want[0]))
+    else:
+        assert (score(ev, t, ps, now, free[0]) <= score(ev, t, ps, now, got[0])
+                <= score(ev, t, ps, now, want[0]) + 1e-9)
+
+
+def test_scheduler_runs_assign():
+    tasks, ps = make_tasks_providers()
+    res = BaselineScheduler(algo="assign").run(tasks, ps)
+    assert all(st is not None for t in tasks for st, _ in t.scene_allocation_data)
+    assert len(res) == sum(t.scene_number for t in tasks)
@@ -0,0 +1,47 @@
+import pathlib
+import sys
+
+import pytest
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+
+from Core.Scheduler.metric_evaluator.baseline import BaselineEvaluator
+from Core.Scheduler.combo_generator.brute_force import BruteForceGenerator
+from conftest import random_instance
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_bnb_matches_exhaustive(seed):
+    t, ps, now = random_instance(seed)
+    ev = BaselineEvaluator()
+    bnb = BruteForceGenerator(mode="bnb")
+    full = BruteForceGenerator(mode="exhaustive")
+    assert bnb.best_combo(t, ps, now, ev) == full.best_combo(t, ps, now, ev)
+    assert bnb.search_stats["T"]["nodes"] <= full.search_stats["T"]["nodes"]
+
+
+def test_bnb_prunes():
+    t, ps, now = random_instance(3)
+    ev = BaselineEvaluator()
+    bnb = BruteForceGenerator(kprov=6, mode="bnb")
+    full = BruteForceGenerator(kprov=6, mode="exhaustive")
+    assert bnb.best_combo(t, ps, now, ev) == full.best_combo(t, ps, now, ev)
+    assert bnb.search_stats["T"]["nodes"] < full.search_stats["T"]["nodes"]
+
+
+def test_search_stats_per_task():
+    t, ps, now = random_instance(3)
+    ev = BaselineEvaluator()
+    bf = BruteForceGenerator(kprov=6)
+    space = bf.time_complexity(t, ps, now, ev)
+    assert isinstance(space, int) and space > 0
+    assert "T" not in bf.search_stats
+    bf.best_combo(t, ps, now, ev)
+    assert 0 < bf.search_stats["T"]["nodes"] and not bf.search_stats["T"]["timed_out"]
+    bf.release(t)
+    assert "T" not in bf.search_stats
+
+
+def test_unknown_mode_rejected():
+    with pytest.raises(ValueError):
+        BruteForceGenerator(mode="bogus")
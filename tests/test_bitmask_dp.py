@@ -0,0 +1,43 @@
+import pathlib
+import sys
+
+import pytest
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+
+from Core.Scheduler.metric_evaluator.baseline import BaselineEvaluator
+from Core.Scheduler.combo_generator.brute_force import BruteForceGenerator
+from Core.Scheduler.combo_generator.bitmask_dp import BitmaskDPComboGenerator
+from Core.Scheduler.scheduler import BaselineScheduler
+from conftest import random_instance, make_tasks_providers, score
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_dp_is_exact(seed):
+    t, ps, now = random_instance(seed)
+    ev = BaselineEvaluator()
+    got = BitmaskDPComboGenerator(k=len(ps)).best_combo(t, ps, now, ev)
+    want = BruteForceGenerator(kprov=len(ps)).best_combo(t, ps, now, ev)
+    if want is None:
+        assert got is None
+    else:
+        assert ev.feasible(t, got[0], now, ps)[0]
+        assert score(ev, t, ps, now, got[0]) == pytest.approx(score(ev, t, ps, now, want[0]))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_dp_top_k_no_worse_than_bf_top_k(seed):
+    # BF restricts each scene to its own top k; DP searches their union
+    t, ps, now = random_instance(seed)
+    ev = BaselineEvaluator()
+    got = BitmaskDPComboGenerator(k=2).best_combo(t, ps, now, ev)
+    want = BruteForceGenerator(kprov=2).best_combo(t, ps, now, ev)
+    if want is not None:
+        assert ev.feasible(t, got[0], now, ps)[0]
+        assert score(ev, t, ps, now, got[0]) >= score(ev, t, ps, now, want[0]) - 1e-9
+
+
+def test_scheduler_runs_dp():
+    tasks, ps = make_tasks_providers()
+    res = BaselineScheduler(algo="dp").run(tasks, ps)
+    assert len(res) == sum(t.scene_number for t in tasks)
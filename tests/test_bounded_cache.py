@@ -0,0 +1,68 @@
+import pathlib
+import pickle
+import sys
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+
+from utils.cache import BoundedCache
+from Core.Scheduler.metric_evaluator.baseline import BaselineEvaluator
+from Core.Scheduler.scheduler import BaselineScheduler
+from conftest import make_tasks_providers
+
+
+def test_lru_eviction_and_counters():
+    c = BoundedCache(maxsize=2)
+    c.put("a", 1, group="T1")
+    c.put("b", 2, group="T1")
+    assert c.get("a") == 1          # "b" is now least recently used
+    c.put("c", 3, group="T2")
+    assert "b" not in c and "a" in c and "c" in c
+    assert c.get("b") is None
+    assert c.stats() == {"size": 2, "hits": 1, "misses": 1, "evictions": 1, "hit_rate": 0.5}
+
+
+def test_drop_group():
+    c = BoundedCache()
+    c.put("a", 1, group="T1")
+    c.put("b", 2, group="T1")
+    c.put("c", 3, group="T2")
+    assert c.drop("T1") == 2
+    assert len(c) == 1 and "c" in c
+    assert c.drop("T1") == 0
+    assert c.evictions == 2
+
+
+def test_pickled_cache_is_empty():
+    c = BoundedCache(maxsize=2)
+    c.put("a", 1, group="T1")
+    c.get("a")
+    copy = pickle.loads(pickle.dumps(c))
+    assert len(copy) == 0 and copy.maxsize == 2 and copy.stats()["hits"] == 0
+    copy.put("b", 2, group="T1")
+    assert copy.drop("T1") == 1
+    assert c.get("a") == 1
+
+
+def test_evaluator_cache_is_bounded_and_released():
+    tasks, ps = make_tasks_providers()
+    ev = BaselineEvaluator(cache_size=3)
+    t = tasks["T1"]
+    for p in ps:
+        for s in range(t.scene_number):
+            ev.time_cost(t, s, p)
+    stats = ev.cache_stats()
+    assert stats["size"] == 3 and stats["evictions"] > 0
+
+    # Same values after eviction/recompute
+    before = [ev.time_cost(t, s, p) for p in ps for s in range(t.scene_number)]
+    ev.release(t)
+    assert ev.cache_stats()["size"] == 0
+    assert [ev.time_cost(t, s, p) for p in ps for s in range(t.scene_number)] == before
+
+
+def test_scheduler_releases_finished_tasks():
+    tasks, ps = make_tasks_providers()
+    ev = BaselineEvaluator()
+    BaselineScheduler(algo="greedy", evaluator=ev).run(tasks, ps)
+    assert all(st is not None for t in tasks for st, _ in t.scene_allocation_data)
+    assert ev.cache_stats()["size"] == 0
@@ -0,0 +1,124 @@
+import datetime as dt
+import pathlib
+import sys
+
+import pytest
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+
+from Model.tasks import Tasks
+from Model.providers import Providers
+from Core.Scheduler.metric_evaluator.baseline import BaselineEvaluator
+from Core.Scheduler.combo_generator.bitmask_dp import BitmaskDPComboGenerator
+from Core.Scheduler.combo_generator.brute_force import BruteForceGenerator
+from Core.Scheduler.combo_generator.cached import CachedComboGenerator
+from Core.Scheduler.combo_generator.greedy import GreedyComboGenerator
+from Core.Scheduler.scheduler import BaselineScheduler
+from conftest import random_instance, score
+
+BASE = dt.datetime(2024, 1, 1, 8, 0)
+
+
+def workset(n_tasks=6, budget=50.0, hours=10, reverse=False):
+    """Identical tasks (same workload and scene sizes) on two provider classes."""
+    tasks_data = [{
+        "id": f"T{i}", "scene_number": 3, "scene_file_size": [600.0, 1200.0, 600.0],
+        "global_file_size": 300.0, "scene_workload": 1080.0, "bandwidth": 2.0,
+        "budget": budget, "start_time": BASE + dt.timedelta(hours=i),
+        "deadline": BASE + dt.timedelta(hours=i + hours),
+    } for i in range(n_tasks)]
+    tasks = Tasks(); tasks.initialize_from_data(tasks_data)
+    prov_data = [{
+        "throughput": 1000.0 if i % 2 else 2000.0, "price": 1.0 if i % 2 else 2.5,
+        "bandwidth": 2.0, "available_hours": [(BASE, BASE + dt.timedelta(hours=48))],
+    } for i in range(6)]
+    if reverse:
+        prov_data.reverse()
+    ps = Providers(); ps.initialize_from_data(prov_data)
+    return tasks, ps
+
+
+@pytest.mark.parametrize("seed", range(15))
+@pytest.mark.parametrize("gen", [GreedyComboGenerator, BruteForceGenerator, BitmaskDPComboGenerator])
+def test_same_score_as_bare_generator(seed, gen):
+    t, ps, now = random_instance(seed)
+    ev = BaselineEvaluator()
+    want = gen().best_combo(t, ps, now, ev)
+    cached = CachedComboGenerator(gen())
+    for _ in range(2):  # miss, then hit
+        got = cached.best_combo(t, ps, now, ev)
+        assert (got is None) == (want is None)
+        if want is not None:
+            assert ev.feasible(t, got[0], now, ps)[0]
+            assert score(ev, t, ps, now, got[0]) == pytest.approx(score(ev, t, ps, now, want[0]))
+    assert cached.cache_stats()["memo_hits"] == 1
+
+
+def test_isomorphic_task_hits_and_maps_back():
+    tasks, ps = workset()
+    ev = BaselineEvaluator()
+    gen = CachedComboGenerator(GreedyComboGenerator())
+    a = gen.best_combo(tasks["T0"], ps, BASE, ev)
+    # 같은 provider들이 다른 순서로 와도 같은 문제
+    ps2 = workset(reverse=True)[1]
+    b = gen.best_combo(tasks["T1"], ps2, BASE, ev)
+    assert gen.cache_stats()["memo_hits"] == 1
+    assert [ps2[p].throughput for p in b[0]] == [ps[p].throughput for p in a[0]]
+    assert ev.feasible(tasks["T1"], b[0], BASE, ps2)[0]
+    assert b[1:] == a[1:]
+    # 한 class가 줄면 다른 시그니처
+    ps[0].assign("X", 0, BASE, 47.0)
+    c = gen.best_combo(tasks["T2"], ps, BASE, ev)
+    assert gen.cache_stats()["memo_misses"] == 2
+    assert 0 not in c[0]
+
+
+def test_slack_budget_and_deadline_share_an_entry():
+    tasks, ps = workset(n_tasks=2, budget=1e6, hours=100)
+    tasks["T1"].budget = 2e6
+    tasks["T1"].deadline_us += 3600 * 10**6
+    ev = BaselineEvaluator()
+    gen = CachedComboGenerator(BitmaskDPComboGenerator())
+    gen.best_combo(tasks["T0"], ps, BASE, ev)
+    gen.best_combo(tasks["T1"], ps, BASE, ev)
+    assert gen.cache_stats()["memo_hits"] == 1
+
+
+class PinningGenerator(GreedyComboGenerator):
+    subset_safe = False
+
+
+def test_partial_tasks_bypass_unsafe_generators():
+    tasks, ps = workset(n_tasks=1)
+    t = tasks["T0"]
+    ev = BaselineEvaluator()
+    gen = CachedComboGenerator(PinningGenerator())
+    cmb, *_ = gen.best_combo(t, ps, BASE, ev)
+    s = next(s for s, p in enumerate(cmb) if p >= 0)
+    t.scene_allocation_data[s] = (BASE, cmb[s])
+    gen.best_combo(t, ps, BASE, ev)
+    assert gen.cache_stats()["memo_bypassed"] == 1
+    assert gen.cache_stats()["memo_misses"] == 1
+
+
+@pytest.mark.parametrize("algo", ["greedy", "dp"])
+def test_scheduler_memo_option(algo):
+    runs = []
+    for memo in (0, 256):
+        tasks, ps = workset()
+        sch = BaselineScheduler(algo=algo, memo=memo)
+        runs.append((sch.run(tasks, ps), sch.generator))
+    (bare, _), (memo_res, gen) = runs
+    assert isinstance(gen, CachedComboGenerator)
+    assert len(memo_res) == len(bare) == 18
+    assert [r[2:4] for r in sorted(memo_res)] == [r[2:4] for r in sorted(bare)]
+    assert gen.cache_stats()["memo_hits"] > 0
+
+
+def test_joint_generator_refused():
+    pytest.importorskip("ortools")
+    from Core.Scheduler.combo_generator.cp_joint import JointCPSatComboGenerator
+    with pytest.raises(ValueError):
+        CachedComboGenerator(JointCPSatComboGenerator())
+    with pytest.raises(ValueError):
+        BaselineScheduler(algo="cp_joint", memo=64)
@@ -0,0 +1,52 @@
+import pathlib
+import sys
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+
+from Model.calendar import AvailabilityCalendar, BusyIndex
+
+
+def make_calendar():
+    # windows [10, 20), [30, 40), [50, 60) given out of order
+    return AvailabilityCalendar([(30, 40), (10, 20), (50, 60)])
+
+
+def test_queries():
+    cal = make_calendar()
+    assert cal.windows() == [(10, 20), (30, 40), (50, 60)]
+    assert cal.index_at(35) == 1
+    assert cal.index_at(20) == -1
+    assert cal.remaining(12) == 8
+    assert cal.remaining(25) == 0
+    assert cal.next_start(10) == 30
+    assert cal.next_start(50) is None
+    assert cal.first_ending_after(20) == 1
+
+
+def test_remove_splits_trims_and_drops_windows():
+    cal = make_calendar()
+    cal.remove(33, 36)          # split
+    assert cal.windows() == [(10, 20), (30, 33), (36, 40), (50, 60)]
+    cal.remove(10, 15)          # trim front
+    cal.remove(58, 60)          # trim back
+    cal.remove(30, 33)          # drop whole window
+    assert cal.windows() == [(15, 20), (36, 40), (50, 58)]
+    cal.remove(18, 55)          # spans several windows
+    assert cal.windows() == [(15, 18), (55, 58)]
+    cal.remove(0, 5)            # no overlap
+    assert cal.windows() == [(15, 18), (55, 58)]
+
+
+def test_busy_index_merges_and_finds_gaps():
+    busy = BusyIndex([(30, 40), (10, 20)])
+    busy.add(20, 25)            # touches [10, 20) -> merged
+    busy.add(35, 50)            # overlaps [30, 40) -> merged
+    assert list(busy) == [(10, 25), (30, 50)]
+    assert busy.total == 35
+
+    assert busy.first_gap(0, 100, 10) == 0
+    assert busy.first_gap(12, 100, 5) == 25
+    assert busy.first_gap(12, 100, 6) == 50
+    assert busy.first_gap(12, 55, 6) is None
+    assert busy.next_end(25) == 50
+    assert busy.next_end(50) is None
@@ -0,0 +1,96 @@
+import datetime as dt
+import pathlib
+import sys
+
+import pytest
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+
+from Model.tasks import Tasks
+from Model.providers import Providers
+from Core.Scheduler.metric_evaluator.baseline import BaselineEvaluator
+from Core.Scheduler.combo_generator.brute_force import BruteForceGenerator
+from Core.Scheduler.scheduler import BaselineScheduler
+from conftest import random_instance, make_tasks_providers, score
+try:
+    from Core.Scheduler.combo_generator.cp_joint import JointCPSatComboGenerator
+    from Core.Scheduler.combo_generator.cpsat import CPSatComboGenerator
+except ModuleNotFoundError:  # pragma: no cover - ortools missing
+    JointCPSatComboGenerator = None
+
+pytestmark = pytest.mark.skipif(JointCPSatComboGenerator is None, reason="ortools not installed")
+
+BASE = dt.datetime(2024, 1, 1, 8, 0)
+
+
+def contended():
+    """A runs a bit faster on P0, but B only fits P0 (P1's window is 1.5h)."""
+    tasks_data = [
+        {"id": "A", "scene_number": 1, "scene_file_size": 0.0, "global_file_size": 0.0,
+         "scene_workload": 3600.0, "bandwidth": 10.0, "budget": 100.0,
+         "start_time": BASE, "deadline": BASE + dt.timedelta(hours=8)},
+        {"id": "B", "scene_number": 1, "scene_file_size": 0.0, "global_file_size": 0.0,
+         "scene_workload": 4800.0, "bandwidth": 10.0, "budget": 100.0,
+         "start_time": BASE, "deadline": BASE + dt.timedelta(hours=8)},
+    ]
+    tasks = Tasks(); tasks.initialize_from_data(tasks_data)
+    prov_data = [
+        {"throughput": 3600.0, "price": 1.0, "bandwidth": 10.0,
+         "available_hours": [(BASE, BASE + dt.timedelta(hours=8))]},
+        # A: 1.2h, B: 1.6h
+        {"throughput": 3000.0, "price": 1.0, "bandwidth": 10.0,
+         "available_hours": [(BASE, BASE + dt.timedelta(hours=1.5))]},
+    ]
+    ps = Providers(); ps.initialize_from_data(prov_data)
+    return tasks, ps
+
+
+@pytest.mark.parametrize("seed", range(15))
+def test_single_task_matches_exhaustive(seed):
+    t, ps, now = random_instance(seed)
+    ev = BaselineEvaluator()
+    got = JointCPSatComboGenerator(num_workers=1).best_combo(t, ps, now, ev)
+    want = BruteForceGenerator(kprov=len(ps)).best_combo(t, ps, now, ev)
+    assert (got is None) == (want is None)
+    if want is not None:
+        assert score(ev, t, ps, now, got[0]) == pytest.approx(score(ev, t, ps, now, want[0]), abs=1e-3)
+
+
+def test_joint_shares_providers_across_tasks():
+    tasks, ps = contended()
+    ev = BaselineEvaluator()
+    # Sequential BF gives A the faster P0 and leaves B nothing this step
+    assert BruteForceGenerator().best_combo(tasks["A"], ps, BASE, ev)[0] == [0]
+    gen = JointCPSatComboGenerator(num_workers=1)
+    plans = gen.best_combos([tasks["A"], tasks["B"]], ps, BASE, ev)
+    assert plans["A"][0] == [1]
+    assert plans["B"][0] == [0]
+    assert gen.last_solve["status"] == "OPTIMAL"
+    assert gen.last_solve["gap"] == pytest.approx(0.0)
+
+
+@pytest.mark.parametrize("gen", [JointCPSatComboGenerator, CPSatComboGenerator])
+def test_task_without_budget(gen):
+    ev = BaselineEvaluator()
+    got = {}
+    for budget in (1e5, float("inf")):  # inf: config에 budget이 없을 때의 기본값
+        tasks, ps = contended()
+        for t in tasks:
+            t.budget = budget
+        got[budget] = [gen(num_workers=1).best_combo(t, ps, BASE, ev) for t in tasks]
+    assert got[float("inf")] == got[1e5]
+    plans = JointCPSatComboGenerator(num_workers=1).best_combos(list(tasks), ps, BASE, ev)
+    assert plans["A"][0] == [1] and plans["B"][0] == [0]
+
+
+def test_scheduler_runs_joint_and_logs_solves():
+    tasks, ps = make_tasks_providers()
+    sch = BaselineScheduler(algo="cp_joint", generator_kwargs={"num_workers": 1})
+    res = sch.run(tasks, ps)
+    assert len(res) == sum(t.scene_number for t in tasks)
+    assert sch.solve_log
+    assert all({"now", "wall_time", "gap", "tasks"} <= set(s) for s in sch.solve_log)
+    # No provider runs two scenes at once
+    for p in ps:
+        iv = sorted((s, f) for *_, s, f in p.schedule)
+        assert all(a[1] <= b[0] for a, b in zip(iv, iv[1:]))
@@ -0,0 +1,63 @@
+import datetime as dt
+import pathlib
+import sys
+
+import pytest
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+
+from Core.Scheduler.metric_evaluator.baseline import BaselineEvaluator
+from Core.Scheduler.scheduler import BaselineScheduler
+from conftest import make_tasks_providers
+try:
+    from Core.Scheduler.combo_generator.cpsat import CPSatComboGenerator
+except ModuleNotFoundError:  # pragma: no cover - ortools missing
+    CPSatComboGenerator = None
+
+BASE = dt.datetime(2024, 1, 1, 8, 0)
+
+
+def test_provider_version_bumps_on_state_change():
+    _, ps = make_tasks_providers()
+    p = ps[0]
+    v = p.version
+    p.assign("T1", 0, BASE, 1.0)
+    assert p.version == v + 1
+    p.available_hours = [(BASE, BASE + dt.timedelta(hours=2))]
+    assert p.version == v + 2
+
+
+@pytest.mark.skipif(CPSatComboGenerator is None, reason="ortools not installed")
+def test_model_reused_until_provider_state_changes():
+    tasks, ps = make_tasks_providers()
+    t = tasks["T1"]
+    ev = BaselineEvaluator()
+    gen = CPSatComboGenerator(num_workers=1, time_limit=5.0, random_seed=0)
+
+    first = gen.best_combo(t, ps, BASE + dt.timedelta(hours=1), ev)
+    assert gen.last_solve["reused"] is False
+    # Later instant, same provider state: only domains change
+    gen.best_combo(t, ps, BASE + dt.timedelta(hours=2), ev)
+    assert gen.last_solve["reused"] is True
+    again = gen.best_combo(t, ps, BASE + dt.timedelta(hours=1), ev)
+    assert again == first
+
+    ps[1].assign("other", 0, BASE + dt.timedelta(hours=5), 0.5)
+    gen.best_combo(t, ps, BASE + dt.timedelta(hours=1), ev)
+    assert gen.last_solve["reused"] is False
+    assert gen.cache_stats()["size"] == 1
+
+    gen.release(t)
+    assert gen.cache_stats()["size"] == 0
+
+
+@pytest.mark.skipif(CPSatComboGenerator is None, reason="ortools not installed")
+def test_solver_parameters_passed_through_scheduler():
+    sch = BaselineScheduler(algo="hybrid_cp", generator_kwargs={
+        "num_workers": 2, "time_limit": 1.5, "relative_gap": 0.05, "random_seed": 7,
+    })
+    prm = sch.generator._cp._solver().parameters
+    assert prm.num_workers == 2
+    assert prm.max_time_in_seconds == 1.5
+    assert prm.relative_gap_limit == pytest.approx(0.05)
+    assert prm.random_seed == 7
@@ -67,3 +67,18 @@ def test_verbose_assignment_logs_all_metrics(capsys):
     assert cmp_t == pytest.approx(cmp_exp, abs=1e-4)
     assert tot == pytest.approx(tot_exp, abs=1e-4)
     assert cost == pytest.approx(cost_exp, abs=1e-4)
+
+
+def test_dispatch_updates_spent_ledger():
+    t, p, ps = setup_basic()
+    ev = BaselineEvaluator()
+    now = dt.datetime(2024, 1, 1, 8, 0)
+
+    ok, _, cost_before, *_ = ev.feasible(t, [0], now, ps)
+    assert ok
+    SequentialDispatcher().dispatch(t, [0], now, ps, ev, verbose=False)
+
+    _, _, st, ft = p.schedule[0]
+    expected = (ft - st).total_seconds() / 3600.0 * p.price_per_gpu_hour
+    assert t.spent_cost == pytest.approx(expected)
+    assert t.spent_cost == pytest.approx(cost_before)
@@ -0,0 +1,37 @@
+import pathlib
+import sys
+
+import pytest
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+
+from Core.Scheduler.scheduler import BaselineScheduler
+from conftest import make_tasks_providers
+
+
+@pytest.mark.parametrize("algo", ["bf", "greedy"])
+def test_event_mode_matches_tick_mode(algo):
+    tasks, ps = make_tasks_providers()
+    tick = BaselineScheduler(algo=algo, mode="tick").run(tasks, ps)
+
+    tasks, ps = make_tasks_providers()
+    event = BaselineScheduler(algo=algo, mode="event").run(tasks, ps)
+
+    assert tick
+    assert event == tick
+
+
+def test_event_mode_skips_idle_steps():
+    tasks, ps = make_tasks_providers()
+    sch = BaselineScheduler(algo="greedy", mode="event")
+    calls = []
+    orig = sch._schedule_once
+    sch._schedule_once = lambda now, ps: calls.append(now) or orig(now, ps)
+    sch.run(tasks, ps)
+    # Only a handful of instants are visited instead of one per 5-minute tick
+    assert 0 < len(calls) < 20
+
+
+def test_unknown_mode_rejected():
+    with pytest.raises(ValueError):
+        BaselineScheduler(mode="bogus")
@@ -0,0 +1,62 @@
+import datetime as dt
+import itertools
+import pathlib
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+
+from Model.tasks import Tasks
+from Model.providers import Providers
+from Core.Scheduler.interface import MetricEvaluator
+from Core.Scheduler.metric_evaluator.baseline import BaselineEvaluator
+
+
+def setup_task_providers():
+    base = dt.datetime(2024, 1, 1, 8, 0)
+    tasks = Tasks(); tasks.initialize_from_data([{
+        "id": "T1",
+        "scene_number": 3,
+        "scene_file_size": [100.0, 200.0, 300.0],
+        "global_file_size": 50.0,
+        "scene_workload": 7200.0,
+        "bandwidth": 0.05,
+        "budget": 3.0,
+        "start_time": base,
+        "deadline": base + dt.timedelta(hours=2),
+    }])
+    providers = Providers(); providers.initialize_from_data([
+        {"throughput": 3600.0, "price": 1.0, "bandwidth": 0.1,
+         "available_hours": [(base, base + dt.timedelta(hours=6))]},
+        {"throughput": 1800.0, "price": 0.5, "bandwidth": 0.1,
+         "available_hours": [(base, base + dt.timedelta(hours=3))]},
+        {"throughput": 7200.0, "price": 2.0, "bandwidth": 0.02,
+         "available_hours": [(base + dt.timedelta(hours=1), base + dt.timedelta(hours=5))]},
+    ])
+    return tasks["T1"], providers, base
+
+
+def test_feasible_many_matches_scalar_path():
+    t, ps, base = setup_task_providers()
+    ev = BaselineEvaluator()
+    combos = np.array(list(itertools.product(range(-1, 3), repeat=3)))
+    now = base + dt.timedelta(minutes=30)
+
+    fast = ev.feasible_many(t, combos, now, ps)
+    slow = MetricEvaluator.feasible_many(ev, t, combos, now, ps)
+
+    ok = slow[0]
+    assert ok.any() and not ok.all()
+    assert np.array_equal(fast[0], ok)
+    assert np.array_equal(fast[3], slow[3])
+    for a, b in zip(fast[1:], slow[1:]):
+        assert np.array_equal(a[ok], b[ok])
+    assert np.all(np.isneginf(fast[6][~ok]))
+    # duplicate provider in one step is rejected
+    assert not ev.feasible_many(t, np.array([[0, 0, -1]]), now, ps)[0][0]
+    assert fast[6][ok].max() == pytest.approx(max(
+        ev.efficiency(t, list(c), ps, now, *ev.feasible(t, list(c), now, ps)[1:])
+        for c in combos[ok]
+    ))
@@ -50,7 +50,7 @@ def test_baseline_time_cost_skips_global_file_after_first_scene():
     assert d1 == pytest.approx(110.0 / 10.0 / 3600.0)
 
     # First scene scheduled on provider -> global file already transmitted
-    p.schedule.append((t.id, 0, dt.datetime(2024, 1, 1, 8, 0), dt.datetime(2024, 1, 1, 9, 0)))
+    p.assign(t.id, 0, dt.datetime(2024, 1, 1, 8, 0), 1.0)
     d2, _ = ev.time_cost(t, 1, p)
     assert d2 == pytest.approx(10.0 / 10.0 / 3600.0)
 
@@ -63,7 +63,21 @@ def test_cpsat_model_skips_global_file_after_first_scene():
     tot_scene0 = tot_int[0][0] / (3600 * cpsat._SCALE)
     assert tot_scene0 == pytest.approx(110.0 / 10.0 / 3600.0)
 
-    p.schedule.append((t.id, 0, dt.datetime(2024, 1, 1, 8, 0), dt.datetime(2024, 1, 1, 9, 0)))
+    p.assign(t.id, 0, dt.datetime(2024, 1, 1, 8, 0), 1.0)
     _, _, _, tot_int2, *_ = cpsat._build_common_model(t, ps, now)
     tot_scene1 = tot_int2[1][0] / (3600 * cpsat._SCALE)
     assert tot_scene1 == pytest.approx(10.0 / 10.0 / 3600.0)
+
+
+def test_scene_matrices_match_time_cost():
+    t, p, ps = setup_task_provider()
+    ev = BaselineEvaluator()
+    p.assign(t.id, 0, dt.datetime(2024, 1, 1, 8, 0), 1.0)
+    t.scene_allocation_data[0] = (dt.datetime(2024, 1, 1, 8, 0), 0)
+
+    M = ev.scene_matrices(t, dt.datetime(2024, 1, 1, 9, 30), ps)
+    assert M.cap[0] == pytest.approx(2.5)
+    for sid in range(t.scene_number):
+        assert (M.dur[sid, 0], M.cost[sid, 0]) == ev.time_cost(t, sid, p)
+    # Scene 0 is already placed; scene 1 fits in the remaining window
+    assert M.ok[:, 0].tolist() == [False, True]
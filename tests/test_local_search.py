@@ -0,0 +1,122 @@
+import argparse
+import pathlib
+import random
+import sys
+
+import pytest
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+
+from Core.Scheduler.metric_evaluator.baseline import BaselineEvaluator
+from Core.Scheduler.combo_generator.brute_force import BruteForceGenerator
+from Core.Scheduler.combo_generator.greedy import GreedyComboGenerator
+from Core.Scheduler.combo_generator.local_search import LocalSearchComboGenerator, _Search
+from Core.Scheduler.registry import algo_names, cli_kwargs, make_generator
+from Core.Scheduler.scheduler import BaselineScheduler
+from conftest import random_instance, make_tasks_providers, score
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("method", ["descent", "anneal"])
+def test_never_worse_than_inner(seed, method):
+    t, ps, now = random_instance(seed)
+    ev = BaselineEvaluator()
+    want = GreedyComboGenerator().best_combo(t, ps, now, ev)
+    got = LocalSearchComboGenerator(GreedyComboGenerator(), method=method).best_combo(t, ps, now, ev)
+    if want is None:
+        return
+    ok, t_tot, cost, *_ = ev.feasible(t, got[0], now, ps)
+    assert ok and (t_tot, cost) == pytest.approx(got[1:])
+    assert score(ev, t, ps, now, got[0]) >= score(ev, t, ps, now, want[0])
+
+
+def test_improves_greedy_on_most_instances():
+    better = 0
+    for seed in range(30):
+        t, ps, now = random_instance(seed)
+        ev = BaselineEvaluator()
+        greedy = GreedyComboGenerator().best_combo(t, ps, now, ev)
+        ls = make_generator("greedy+ls").best_combo(t, ps, now, ev)
+        if greedy is None:
+            continue
+        better += score(ev, t, ps, now, ls[0]) > score(ev, t, ps, now, greedy[0]) + 1e-9
+    assert better >= 5
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_incremental_objective_matches_evaluator(seed):
+    t, ps, now = random_instance(seed)
+    ev = BaselineEvaluator()
+    M = ev.scene_matrices(t, now, ps)
+    sids = list(range(t.scene_number))
+    s = _Search(t, now, ev, M, sids, [-1] * len(sids))
+    rng = random.Random(seed)
+    for _ in range(50):
+        nb = s.random_move(rng)
+        if nb is None or nb[0] == float("inf"):  # 전부 연기는 허용 안 됨
+            continue
+        nj, kind, i, x = nb
+        s.apply(kind, i, x)
+        assert s.current() == pytest.approx(nj)
+        assert -nj == pytest.approx(score(ev, t, ps, now, s.cur))
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_descent_stops_at_local_optimum(seed):
+    t, ps, now = random_instance(seed)
+    ev = BaselineEvaluator()
+    gen = LocalSearchComboGenerator(GreedyComboGenerator())
+    res = gen.best_combo(t, ps, now, ev)
+    if res is None:
+        return
+    s = _Search(t, now, ev, ev.scene_matrices(t, now, ps), list(range(t.scene_number)), res[0])
+    assert s.best_move()[1] is None
+
+
+def test_other_evaluators_get_inner_result():
+    class Weighted(BaselineEvaluator):
+        def efficiency(self, *a):
+            return 2 * super().efficiency(*a)
+
+    t, ps, now = random_instance(0)
+    ev = Weighted()
+    gen = LocalSearchComboGenerator(GreedyComboGenerator())
+    assert gen.best_combo(t, ps, now, ev) == GreedyComboGenerator().best_combo(t, ps, now, ev)
+
+
+def test_make_generator_splits_options():
+    gen = make_generator("bf+ls", kprov=2, method="anneal", max_iters=50)
+    assert isinstance(gen, LocalSearchComboGenerator)
+    assert gen.method == "anneal" and gen.max_iters == 50
+    assert isinstance(gen.inner, BruteForceGenerator) and gen.inner.kprov == 2
+    with pytest.raises(KeyError):
+        make_generator("greedy+tabu")
+    with pytest.raises(ValueError):
+        make_generator("greedy+ls", method="tabu")
+
+
+def test_joint_generator_not_wrapped():
+    pytest.importorskip("ortools")
+    with pytest.raises(ValueError):
+        make_generator("cp_joint+ls")
+    assert "cp_joint" in algo_names() and "cp_joint+ls" not in algo_names()
+    assert "cp+ls" in algo_names()
+
+
+def test_cli_kwargs_pass_through_ls():
+    args = argparse.Namespace(algo="portfolio+ls", cp_workers=2, cp_time_limit=None,
+                              cp_gap=None, cp_seed=None, budget=0.5, step_budget=None)
+    assert cli_kwargs(args) == ({"num_workers": 2}, {"budget": 0.5, "step_budget": None})
+    args.algo = "cp+ls"
+    assert cli_kwargs(args) == ({"num_workers": 2}, {"num_workers": 2})
+    args.algo = "greedy"
+    assert cli_kwargs(args)[1] is None
+
+
+@pytest.mark.parametrize("mode", ["tick", "event"])
+def test_scheduler_greedy_ls(mode):
+    out = {}
+    for algo in ("greedy", "greedy+ls"):
+        tasks, ps = make_tasks_providers()
+        out[algo] = BaselineScheduler(algo=algo, mode=mode).run(tasks, ps)
+    assert len(out["greedy+ls"]) == len(out["greedy"])
@@ -0,0 +1,224 @@
+import datetime as dt
+import pathlib
+import sys
+
+import pytest
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+
+pytest.importorskip("ortools")
+
+from ortools.sat.python import cp_model
+
+from Model.tasks import Tasks
+from Model.providers import Providers
+from Core.Scheduler.metric_evaluator.baseline import BaselineEvaluator
+from Core.Scheduler.lookahead import LookaheadScheduler, _first_fit
+from Core.Scheduler.scheduler import BaselineScheduler
+from Core.Scheduler.provider_index import ActiveProviders
+from utils.utils import to_epoch, hours_to_us
+from conftest import make_tasks_providers
+
+BASE = dt.datetime(2024, 1, 1, 8, 0)
+
+
+def chain_instance(n=3, workload=3120.0, windows=((0, 10),), price=1.0):
+    """One task of ``n`` equal scenes (52 min each by default) and one provider."""
+    tasks_data = [{
+        "id": "T", "scene_number": n, "scene_file_size": 0.0, "global_file_size": 0.0,
+        "scene_workload": workload, "bandwidth": 1.0, "budget": 100.0,
+        "start_time": BASE, "deadline": BASE + dt.timedelta(hours=10),
+    }]
+    tasks = Tasks(); tasks.initialize_from_data(tasks_data)
+    prov_data = [{
+        "throughput": 3600.0, "price": price, "bandwidth": 1.0,
+        "available_hours": [(BASE + dt.timedelta(hours=a), BASE + dt.timedelta(hours=b))
+                            for a, b in windows],
+    }]
+    ps = Providers(); ps.initialize_from_data(prov_data)
+    return tasks, ps
+
+
+def assert_no_overlap(ps):
+    for p in ps:
+        spans = sorted((st, ft) for _, _, st, ft in p.schedule)
+        assert all(a[1] <= b[0] for a, b in zip(spans, spans[1:]))
+
+
+def test_back_to_back_beats_tick_grid():
+    tasks, ps = chain_instance()
+    la = LookaheadScheduler()
+    res = la.run(tasks, ps)
+    starts = sorted(r[2] for r in res)
+    ends = sorted(r[3] for r in res)
+    # 다음 씬이 틱을 기다리지 않고 바로 이어서 시작
+    assert starts[0] == BASE and starts[1:] == ends[:-1]
+    assert la.plan_stats["reused"] > 0
+
+    tasks, ps = chain_instance()
+    base = BaselineScheduler(algo="greedy").run(tasks, ps)
+    assert len(base) == len(res)
+    assert max(ends) < max(r[3] for r in base)
+
+
+def test_commits_only_first_window():
+    tasks, ps = chain_instance()
+    la = LookaheadScheduler()
+    plan = la.plan(list(tasks), ps, BASE)
+    assert [s for _, _, s in plan["T"]] == sorted(s for _, _, s in plan["T"])
+    assert len(plan["T"]) == 3
+
+    tasks, ps = chain_instance()
+    res = LookaheadScheduler().run(tasks, ps, time_end=BASE + dt.timedelta(minutes=5))
+    assert len(res) == 1 and res[0][2] == BASE
+
+    # 창을 넓히면 한 번에 더 많이 확정
+    tasks, ps = chain_instance()
+    la = LookaheadScheduler(commit_window=dt.timedelta(hours=2))
+    res = la.run(tasks, ps, time_end=BASE + dt.timedelta(minutes=5))
+    assert len(res) == 3
+
+
+def test_build_and_solves_share_time_limit(monkeypatch):
+    tasks, ps = make_tasks_providers()
+    la = LookaheadScheduler(time_limit=0.2)
+    limits = []
+    solve = cp_model.CpSolver.Solve
+
+    def spy(self, m, *a, **kw):
+        limits.append(self.parameters.max_time_in_seconds)
+        return solve(self, m, *a, **kw)
+
+    monkeypatch.setattr(cp_model.CpSolver, "Solve", spy)
+    la.plan(list(tasks), ps, BASE)
+    fixed, search = limits
+    # 모델 생성 시간을 뺀 나머지에서 고정 풀이는 최대 절반, 탐색은 남은 시간
+    build = la.solve_log[-1]["build_time"]
+    assert fixed == pytest.approx((0.2 - build) / 2)
+    assert 0.0 < search <= 0.2 - build
+
+
+def test_entry_that_no_longer_fits_drops_the_plan(capsys):
+    tasks, ps = chain_instance()
+    la = LookaheadScheduler(verbose=2)
+    now = to_epoch(BASE)
+    la._last = (("key",), {"T": []})
+    ps[0].assign("X", 0, now + hours_to_us(9.5), 0.5)  # 창 끝을 깎음
+    start = now + hours_to_us(9.0)  # 52분짜리 씬이 남은 30분에 안 들어감
+    assert la._dispatch(tasks["T"], [(0, 0, start)], start, ps) == []
+    assert la._last[1] is None and la.plan_stats["dropped"] == 1
+    assert "re-plan" in capsys.readouterr().out
+
+
+def test_first_fit():
+    busy = [(10, 20), (25, 40)]
+    assert _first_fit(busy, 0, 100, 10) == 0
+    assert _first_fit(busy, 5, 100, 10) == 40
+    assert _first_fit(busy, 12, 100, 5) == 20
+    assert _first_fit(busy, 12, 30, 10) is None
+
+
+def test_warm_start_keeps_previous_plan():
+    la = LookaheadScheduler()
+    now = to_epoch(BASE)
+    cands = [("T", s, 0, 0, 90, 10) for s in range(3)] + [("T", 2, 1, 0, 90, 30)]
+    assert la._warm_start(cands, now) == {0: 0, 1: 10, 2: 20}
+    la._plan = {("T", 1): (0, now + 5 * 1000)}
+    # 이전 계획의 씬을 먼저 두고, 나머지는 가장 일찍 끝나는 후보에
+    assert la._warm_start(cands, now) == {1: 5, 0: 15, 3: 0}
+
+
+def test_future_window_is_planned():
+    # 지금 창은 씬보다 짧고, 다음 창에 들어감
+    tasks, ps = chain_instance(n=1, workload=7200.0, windows=((0, 1), (3, 6)))
+    la = LookaheadScheduler()
+    plan = la.plan(list(tasks), ps, BASE)
+    assert [st for _, _, st in plan["T"]] == [to_epoch(BASE + dt.timedelta(hours=3))]
+    res = la.run(tasks, ps)
+    assert [r[2] for r in res] == [BASE + dt.timedelta(hours=3)]
+
+
+def test_spill_past_big_stays_feasible():
+    # 지평 안에는 씬 하나만 들어가고 나머지는 20일 뒤 창에서 끝남 (BIG ms 초과)
+    tasks, ps = chain_instance(n=3, windows=((0, 1), (480, 490)))
+    la = LookaheadScheduler(horizon=dt.timedelta(hours=4))
+    plan = la.plan(list(tasks), ps, BASE)
+    assert la.solve_log[-1]["status"] in ("OPTIMAL", "FEASIBLE")
+    assert [st for _, _, st in plan["T"]] == [to_epoch(BASE)]
+
+
+def test_nothing_in_horizon_is_left_to_wake():
+    tasks, ps = chain_instance(n=1, windows=((30, 31),))
+    la = LookaheadScheduler(horizon=dt.timedelta(hours=4))
+    assert la.plan(list(tasks), ps, BASE) == {}
+    res = la.run(tasks, ps, time_start=BASE, time_end=BASE + dt.timedelta(hours=32))
+    assert [r[2] for r in res] == [BASE + dt.timedelta(hours=30)]
+
+
+def test_task_without_budget():
+    tasks, ps = chain_instance()
+    want = LookaheadScheduler().run(tasks, ps)
+    tasks, ps = chain_instance()
+    for t in tasks:
+        t.budget = float("inf")  # config에 budget이 없을 때의 기본값
+    assert LookaheadScheduler().run(tasks, ps) == want
+
+
+def test_evaluator_weights():
+    def instance():
+        tasks_data = [{
+            "id": "T", "scene_number": 1, "scene_file_size": 0.0, "global_file_size": 0.0,
+            "scene_workload": 3600.0, "bandwidth": 1.0, "budget": 100.0,
+            "start_time": BASE, "deadline": BASE + dt.timedelta(hours=10),
+        }]
+        tasks = Tasks(); tasks.initialize_from_data(tasks_data)
+        prov_data = [{"throughput": thr, "price": price, "bandwidth": 1.0,
+                      "available_hours": [(BASE, BASE + dt.timedelta(hours=10))]}
+                     for thr, price in ((3600.0, 1.0), (1800.0, 0.25))]
+        ps = Providers(); ps.initialize_from_data(prov_data)
+        return tasks, ps
+
+    tasks, ps = instance()
+    assert [r[4] for r in LookaheadScheduler().run(tasks, ps)] == [0]  # 빠른 쪽
+    tasks, ps = instance()
+    assert [r[4] for r in LookaheadScheduler(evaluator=BaselineEvaluator(WC=10.0)).run(tasks, ps)] == [1]
+
+
+@pytest.mark.parametrize("mode", ["tick", "event"])
+def test_schedules_everything_without_overlap(mode):
+    tasks, ps = make_tasks_providers()
+    la = LookaheadScheduler(mode=mode)
+    res = la.run(tasks, ps)
+    assert len(res) == sum(t.scene_number for t in tasks)
+    assert_no_overlap(ps)
+    for t in tasks:
+        assert t.spent_cost == pytest.approx(
+            sum((r[3] - r[2]).total_seconds() / 3600 * ps[r[4]].price_per_gpu_hour
+                for r in res if r[0] == t.id))
+    assert all(e["status"] in ("OPTIMAL", "FEASIBLE") for e in la.solve_log)
+
+
+def test_falls_back_to_generator_without_plan():
+    tasks, ps = make_tasks_providers()
+    la = LookaheadScheduler()
+    la.plan = lambda *a: None
+    got = la.run(tasks, ps)
+    tasks, ps = make_tasks_providers()
+    assert got == BaselineScheduler(algo="greedy").run(tasks, ps)
+
+
+def test_backfill_keeps_planned_providers():
+    tasks, ps = make_tasks_providers()
+    la = LookaheadScheduler()
+    la._active = ActiveProviders(ps)
+    t = tasks["T1"]
+
+    class Everywhere:
+        # active를 무시하는 생성기 (cp처럼): 모든 씬을 provider 0에
+        def best_combo(self, t, ps, now, ev, verbose=False, active=None):
+            return [0] * t.scene_number, 0.0, 0.0
+
+    la.generator = Everywhere()
+    now = to_epoch(BASE + dt.timedelta(hours=1))  # provider 1은 비어 있음
+    got = la._backfill([t], {"T1": [(0, 0, now)]}, now, ps)
+    assert got == [] and not ps[0].schedule
@@ -0,0 +1,112 @@
+import pathlib
+import pickle
+import sys
+import time
+
+import pytest
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+
+from Core.Scheduler.metric_evaluator.baseline import BaselineEvaluator
+from Core.Scheduler.combo_generator.greedy import GreedyComboGenerator
+from Core.Scheduler.combo_generator.portfolio import PortfolioComboGenerator
+from Core.Scheduler.scheduler import BaselineScheduler
+from conftest import BASE, deep_queue, random_instance
+
+
+@pytest.mark.parametrize("algo", ["bf", "dp"])
+@pytest.mark.parametrize("mode", ["tick", "event"])
+@pytest.mark.parametrize("kw", [{"workers": 3}, {"pipeline": 3}])
+def test_same_assignments_as_serial(algo, mode, kw):
+    out = []
+    for parallel in (False, True):
+        tasks, ps = deep_queue()
+        sch = BaselineScheduler(algo=algo, mode=mode, **(kw if parallel else {}))
+        out.append((sch.run(tasks, ps), sch.parallel_stats))
+    (serial, _), (parallel, stats) = out
+    assert parallel == serial
+    assert stats["speculated"] > 0
+    # 앞선 task가 provider를 가져간 경우만 다시 푼다
+    assert stats["committed"] > 0 and stats["resolved"] > 0
+    assert sch._pool is None and sch._threads is None  # shut down at the end of run()
+
+
+@pytest.mark.parametrize("kw", [{"workers": 2}, {"pipeline": 2}])
+def test_pools_shut_down_on_error(kw):
+    tasks, ps = deep_queue()
+    sch = BaselineScheduler(algo="greedy", **kw)
+
+    def boom(*a, **k):
+        raise RuntimeError("dispatch failed")
+
+    sch.dispatcher.dispatch = boom
+    with pytest.raises(RuntimeError):
+        sch.run(tasks, ps)
+    assert sch._pool is None and sch._threads is None
+
+
+class SlowSolver(GreedyComboGenerator):
+    """Waits like a solver releasing the GIL (CP-SAT); task Ti only uses provider i."""
+
+    def best_combo(self, t, ps, now, ev, verbose=False, active=None):
+        time.sleep(0.05)
+        i = int(t.id[1:])
+        fits = ev.scene_matrices(t, now, ps).ok[:, i].nonzero()[0]
+        if not len(fits):
+            return None
+        cmb = [-1] * t.scene_number
+        cmb[fits[0]] = i
+        return cmb, *ev.feasible(t, cmb, now, ps)[1:3]
+
+
+def test_pipelined_solves_overlap():
+    out = []
+    for pipeline in (0, 4):
+        tasks, ps = deep_queue(n_tasks=8, n_prov=8)
+        sch = BaselineScheduler(algo="greedy", pipeline=pipeline)
+        sch.generator = SlowSolver()
+        start = time.perf_counter()
+        out.append((sch.run(tasks, ps, time_end=tasks["T0"].start_us + 3600 * 10**6),
+                    time.perf_counter() - start, sch.parallel_stats))
+    (serial, t_serial, _), (piped, t_piped, stats) = out
+    assert piped == serial
+    assert stats["resolved"] == 0
+    assert t_piped < 0.6 * t_serial
+
+
+def test_pipeline_copies_only_changed_providers():
+    tasks, ps = deep_queue()
+    sch = BaselineScheduler(algo="greedy", pipeline=2)
+    todo = list(tasks)[:2]
+    sch._pipelined(todo, tasks["T0"].start_us, ps, None)["T0"]
+    first = list(sch._mirror)
+    ps[1].assign("X", 0, BASE, 1.0)
+    sch._pipelined(todo, tasks["T0"].start_us, ps, None)["T0"]
+    assert [a is b for a, b in zip(first, sch._mirror)] == [True, False, True, True, True]
+    assert sch._mirror[1].version == ps[1].version
+    sch._threads.shutdown()
+
+
+def test_workers_and_pipeline_exclusive():
+    with pytest.raises(ValueError):
+        BaselineScheduler(algo="greedy", workers=2, pipeline=2)
+
+
+def test_greedy_parallel_is_valid():
+    tasks, ps = deep_queue()
+    res = BaselineScheduler(algo="greedy", workers=2).run(tasks, ps)
+    # 한 provider에서 시간이 겹치는 배정은 없어야 한다
+    for p in range(len(ps)):
+        spans = sorted((r[2], r[3]) for r in res if r[4] == p)
+        assert all(a[1] <= b[0] for a, b in zip(spans, spans[1:]))
+    assert len({(r[0], r[1]) for r in res}) == len(res)
+    assert all(st is not None for t in tasks for st, _ in t.scene_allocation_data)
+
+
+def test_generators_pickle_for_workers():
+    gen = pickle.loads(pickle.dumps(PortfolioComboGenerator(engines=("bf",))))
+    assert gen.engines["bf"].kprov == 3
+    # 스레드 풀은 worker에서 처음 쓸 때 새로 만든다
+    t, ps, now = random_instance(0)
+    assert gen.best_combo(t, ps, now, BaselineEvaluator()) is not None
+    gen.close()
@@ -0,0 +1,167 @@
+import pathlib
+import sys
+import time
+
+import pytest
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+
+from Core.Scheduler.metric_evaluator.baseline import BaselineEvaluator
+from Core.Scheduler.combo_generator.brute_force import BruteForceGenerator
+from Core.Scheduler.combo_generator.greedy import GreedyComboGenerator
+from Core.Scheduler.combo_generator.portfolio import PortfolioComboGenerator, _score
+from Core.Scheduler.scheduler import BaselineScheduler
+from conftest import random_instance, make_tasks_providers, score, symmetric_instance
+
+
+@pytest.mark.parametrize("seed", range(15))
+def test_never_worse_than_greedy(seed):
+    t, ps, now = random_instance(seed)
+    ev = BaselineEvaluator()
+    gen = PortfolioComboGenerator(engines=("bf",), budget=5.0)
+    got = gen.best_combo(t, ps, now, ev)
+    want = GreedyComboGenerator().best_combo(t, ps, now, ev)
+    if want is None:
+        return
+    assert score(ev, t, ps, now, got[0]) >= score(ev, t, ps, now, want[0])
+    # 시간이 충분하면 bnb 결과와 같다
+    bf = BruteForceGenerator().best_combo(t, ps, now, ev)
+    assert score(ev, t, ps, now, got[0]) == pytest.approx(score(ev, t, ps, now, bf[0]))
+    entry = gen.log[-1]
+    assert entry["winner"] in ("greedy", "bf") and entry["gain"] >= 0
+    assert sum(gen.wins.values()) == 1
+
+
+def test_logs_winner_and_gain():
+    t, ps = symmetric_instance()
+    now = t.start_time
+    ev = BaselineEvaluator()
+    gen = PortfolioComboGenerator(engines=("bf",), budget=5.0, kprov=6)
+    gen.best_combo(t, ps, now, ev)
+    entry = gen.log[-1]
+    assert set(entry["scores"]) == {"greedy", "bf"}
+    assert entry["scores"]["bf"] >= entry["scores"]["greedy"]
+    assert entry["gain"] == pytest.approx(entry["scores"][entry["winner"]] - entry["scores"]["greedy"])
+
+
+def test_bf_deadline_returns_best_so_far():
+    t, ps = symmetric_instance()
+    ev = BaselineEvaluator()
+    bf = BruteForceGenerator(kprov=6, mode="exhaustive", symmetry=False)
+    full = bf.best_combo(t, ps, t.start_time, ev)
+    stats = bf.search_stats[t.id]
+    assert not stats["timed_out"]
+    # already passed: stops at the first node
+    assert bf.best_combo(t, ps, t.start_time, ev, deadline=time.monotonic()) is None
+    assert bf.search_stats[t.id] == {"nodes": 1, "timed_out": True}
+    assert bf.best_combo(t, ps, t.start_time, ev, deadline=time.monotonic() + 60) == full
+    assert bf.search_stats[t.id] == stats
+
+
+def test_step_budget_is_shared():
+    t, ps, now = random_instance(0)
+    ev = BaselineEvaluator()
+    gen = PortfolioComboGenerator(engines=("bf",), budget=None, step_budget=0.0)
+    res = gen.best_combo(t, ps, now, ev)
+    # 스텝 예산이 0이면 greedy만 돈다
+    assert res == GreedyComboGenerator().best_combo(t, ps, now, ev)
+    assert set(gen.log[-1]["scores"]) == {"greedy"}
+
+
+def test_respects_wall_clock_budget():
+    t, ps = symmetric_instance()
+    ev = BaselineEvaluator()
+    gen = PortfolioComboGenerator(budget=0.05, kprov=6)
+    gen.engines["bf"].mode = "exhaustive"
+    gen.engines["bf"].symmetry = False
+    start = time.monotonic()
+    assert gen.best_combo(t, ps, t.start_time, ev) is not None
+    assert time.monotonic() - start < 2.0
+
+
+def test_combos_without_new_scenes_do_not_count():
+    t, ps = symmetric_instance()
+    ev = BaselineEvaluator()
+    now = t.start_time
+    assert _score(ev, t, ps, now, ([-1] * t.scene_number, 0.0, 0.0)) == float("-inf")
+    t.scene_allocation_data[0] = (now, 1)
+    # 이미 배정된 씬만 provider를 가리키는 조합 (CP-SAT은 배정된 씬을 고정해 돌려줌)
+    pinned = [1] + [-1] * (t.scene_number - 1)
+    assert _score(ev, t, ps, now, (pinned, 0.0, 0.0)) == float("-inf")
+    assert _score(ev, t, ps, now, ([1, 0] + [-1] * (t.scene_number - 2), 0.0, 0.0)) > float("-inf")
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        PortfolioComboGenerator(engines=("bf", "magic"))
+
+
+@pytest.mark.parametrize("mode", ["tick", "event"])
+def test_scheduler_portfolio(mode):
+    tasks, ps = make_tasks_providers()
+    sch = BaselineScheduler(algo="portfolio", mode=mode, generator_kwargs={"budget": 0.5})
+    res, gen = sch.run(tasks, ps), sch.generator
+    assert res
+    assert sum(gen.wins.values()) == len(gen.log) > 0
+
+
+def test_deadline_is_per_call():
+    t, ps, now = random_instance(0)
+    ev = BaselineEvaluator()
+    gen = PortfolioComboGenerator(engines=("bf",), budget=5.0)
+    seen = []
+    bf = gen.engines["bf"]
+    inner = bf.best_combo
+
+    def spy(*args, **kwargs):
+        seen.append(kwargs.get("deadline"))
+        return inner(*args, **kwargs)
+
+    bf.best_combo = spy
+    start = time.monotonic()
+    gen.best_combo(t, ps, now, ev)
+    # 엔진 속성은 건드리지 않고 호출 인자로만 전달
+    assert not hasattr(bf, "deadline")
+    assert len(seen) == 1 and start + 5.0 <= seen[0] <= time.monotonic() + 5.0
+
+
+def test_budget_counts_from_engine_start():
+    t, ps, now = random_instance(0)
+    ev = BaselineEvaluator()
+    gen = PortfolioComboGenerator(engines=("bf",), budget=0.1)
+    seen = []
+    bf = gen.engines["bf"]
+    inner = bf.best_combo
+
+    def spy(*args, **kwargs):
+        seen.append((time.monotonic(), kwargs.get("deadline")))
+        return inner(*args, **kwargs)
+
+    bf.best_combo = spy
+    # 다른 호출의 엔진이 스레드를 잡고 있음
+    gen._executor().submit(time.sleep, 0.2)
+    gen.best_combo(t, ps, now, ev)
+    started, deadline = seen[0]
+    assert deadline >= started + 0.1 - 1e-6
+    gen.close()
+
+
+def test_log_is_bounded():
+    t, ps, now = random_instance(0)
+    ev = BaselineEvaluator()
+    gen = PortfolioComboGenerator(engines=("bf",), budget=0.5, log_size=2)
+    for _ in range(3):
+        gen.best_combo(t, ps, now, ev)
+    assert len(gen.log) == 2 and sum(gen.wins.values()) == 3
+
+
+def test_pipelined_portfolio_and_close():
+    out = {}
+    for pipeline in (0, 3):
+        tasks, ps = make_tasks_providers()
+        sch = BaselineScheduler(algo="portfolio", pipeline=pipeline, generator_kwargs={"budget": 5.0})
+        out[pipeline] = sch.run(tasks, ps)
+        gen = sch.generator
+        assert gen._pool is None  # run() 끝에서 close
+        assert sum(gen.wins.values()) == len(gen.log)
+    assert out[3] == out[0]
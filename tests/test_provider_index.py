@@ -0,0 +1,129 @@
+import datetime as dt
+import pathlib
+import random
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+
+from Model.providers import Providers
+from Core.Scheduler.metric_evaluator.baseline import BaselineEvaluator
+from Core.Scheduler.combo_generator.assignment import AssignmentComboGenerator
+from Core.Scheduler.combo_generator.bitmask_dp import BitmaskDPComboGenerator
+from Core.Scheduler.combo_generator.greedy import GreedyComboGenerator
+from Core.Scheduler.provider_index import ActiveProviders, top_k_providers
+from Core.Scheduler.scheduler import BaselineScheduler
+from utils.utils import to_epoch, US_PER_SEC
+from conftest import random_instance, make_tasks_providers, symmetric_instance
+try:
+    from Core.Scheduler.combo_generator.hybrid_cp import HybridCPComboGenerator
+except ModuleNotFoundError:  # pragma: no cover - ortools missing
+    HybridCPComboGenerator = None
+
+BASE = dt.datetime(2024, 1, 1, 8, 0)
+
+
+def random_providers(seed):
+    rng = random.Random(seed)
+    prov_data = []
+    for _ in range(rng.randint(3, 10)):
+        hours, t = [], rng.uniform(0, 3)
+        for _ in range(rng.randint(0, 3)):
+            end = t + rng.uniform(0.2, 4)
+            hours.append((BASE + dt.timedelta(hours=t), BASE + dt.timedelta(hours=end)))
+            t = end + rng.uniform(0.1, 3)
+        prov_data.append({"throughput": 1000.0, "price": 1.0, "bandwidth": 1.0,
+                          "available_hours": hours})
+    ps = Providers(); ps.initialize_from_data(prov_data)
+    return ps, rng
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_sweep_matches_recomputation(seed):
+    ps, rng = random_providers(seed)
+    idx = ActiveProviders(ps)
+    now = to_epoch(BASE)
+    for step in range(80):
+        idx.update(now)
+        want = [i for i, p in enumerate(ps) if p.calendar.remaining(now) > 0]
+        assert idx.indices() == want
+        for i in want:
+            assert idx.remaining(i) == ps[i].calendar.remaining(now)
+        # 가끔 활성 provider에 작업을 넣어 달력을 깎는다
+        if want and rng.random() < 0.3:
+            i = rng.choice(want)
+            ps[i].assign(f"T{step}", 0, now, rng.uniform(0.05, 1.0) * idx.remaining(i) / 3600 / US_PER_SEC)
+        now += rng.randint(1, 30) * 60 * US_PER_SEC
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("gen", [GreedyComboGenerator, AssignmentComboGenerator, BitmaskDPComboGenerator])
+def test_generators_unchanged_on_active_subset(seed, gen):
+    t, ps, now = random_instance(seed)
+    now += dt.timedelta(hours=1)  # 일부 provider의 창은 이미 닫힘
+    ev = BaselineEvaluator()
+    active = ActiveProviders(ps, to_epoch(now)).indices()
+    assert gen().best_combo(t, ps, now, ev, active=active) == gen().best_combo(t, ps, now, ev)
+
+
+@pytest.mark.parametrize("seed", range(25))
+@pytest.mark.parametrize("k", [1, 3, 10])
+def test_top_k_matches_sort(seed, k):
+    t, ps, now = random_instance(seed)
+    now += dt.timedelta(minutes=30 * (seed % 4))
+    M = BaselineEvaluator().scene_matrices(t, now, ps)
+    sids = list(range(t.scene_number))
+    top = top_k_providers(M, sids, k)
+    for sid in sids:
+        cand = np.flatnonzero(M.ok[sid])
+        cand = cand[np.argsort(M.dur[sid, cand], kind="stable")]
+        assert top[sid] == cand[:k].tolist()
+
+
+@pytest.mark.parametrize("k", [1, 2, 4])
+def test_top_k_breaks_ties_by_index(k):
+    # 같은 provider가 3개씩: k번째 경계에서 동점이 남음
+    t, ps = symmetric_instance()
+    M = BaselineEvaluator().scene_matrices(t, t.start_time, ps)
+    sids = list(range(t.scene_number))
+    top = top_k_providers(M, sids, k)
+    for sid in sids:
+        cand = np.flatnonzero(M.ok[sid])
+        cand = cand[np.argsort(M.dur[sid, cand], kind="stable")]
+        assert top[sid] == cand[:k].tolist()
+
+
+@pytest.mark.skipif(HybridCPComboGenerator is None, reason="ortools not installed")
+def test_hybrid_fallback_gets_active_providers():
+    t, ps, now = random_instance(0)
+    now += dt.timedelta(hours=1)
+    ev = BaselineEvaluator()
+    active = ActiveProviders(ps, to_epoch(now)).indices()
+    gen = HybridCPComboGenerator()
+    gen._cp.best_combo = lambda *a, **kw: None  # CP-SAT이 해를 못 찾은 경우
+    calls = []
+    greedy = gen._greedy.best_combo
+    gen._greedy.best_combo = lambda *a, **kw: calls.append(kw.get("active")) or greedy(*a, **kw)
+    assert gen.best_combo(t, ps, now, ev, active=active) == GreedyComboGenerator().best_combo(t, ps, now, ev)
+    assert calls[0] == active
+
+
+def test_scheduler_passes_active_providers():
+    tasks, ps = make_tasks_providers()
+    seen = []
+    sch = BaselineScheduler(algo="greedy")
+    best_combo = sch.generator.best_combo
+
+    def spy(t, ps_, now, ev, verbose=False, active=None):
+        # 스텝의 첫 호출만 비교 (같은 스텝의 이전 배정이 달력을 깎으므로)
+        if not seen or seen[-1][0] != now:
+            seen.append((now, active, [i for i, p in enumerate(ps_) if p.calendar.remaining(now) > 0]))
+        return best_combo(t, ps_, now, ev, verbose, active)
+
+    sch.generator.best_combo = spy
+    sch.run(tasks, ps)
+    assert seen
+    for _, active, want in seen:
+        assert active == want
@@ -0,0 +1,79 @@
+import datetime as dt
+import pathlib
+import sys
+
+import pytest
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+
+from Model.tasks import Tasks
+from Model.providers import Providers
+from Core.Scheduler.scheduler import BaselineScheduler
+from conftest import make_tasks_providers
+
+BASE = dt.datetime(2024, 1, 1, 8, 0)
+
+
+class ResetScheduler(BaselineScheduler):
+    """Previous behaviour: retry every task at each provider event."""
+
+    def _wake(self, now, ps):
+        self._unschedulable.clear()
+
+
+def count_calls(sch):
+    calls = []
+    best_combo = sch.generator.best_combo
+
+    def spy(t, *a, **k):
+        if "active" in k:  # scheduler calls only, not the generator's own re-entry
+            calls.append(t.id)
+        return best_combo(t, *a, **k)
+
+    sch.generator.best_combo = spy
+    return calls
+
+
+def long_task_short_windows():
+    """T needs 2h; P0 has many short windows (irrelevant events), P1 opens at 12:00."""
+    tasks_data = [{
+        "id": "T", "scene_number": 1, "scene_file_size": 0.0, "global_file_size": 0.0,
+        "scene_workload": 7200.0, "bandwidth": 10.0, "budget": 100.0,
+        "start_time": BASE, "deadline": BASE + dt.timedelta(hours=12),
+    }]
+    tasks = Tasks(); tasks.initialize_from_data(tasks_data)
+    prov_data = [
+        {"throughput": 3600.0, "price": 1.0, "bandwidth": 10.0,
+         "available_hours": [(BASE + dt.timedelta(hours=h), BASE + dt.timedelta(hours=h, minutes=30))
+                             for h in range(4)]},
+        {"throughput": 3600.0, "price": 1.0, "bandwidth": 10.0,
+         "available_hours": [(BASE + dt.timedelta(hours=4), BASE + dt.timedelta(hours=8))]},
+    ]
+    ps = Providers(); ps.initialize_from_data(prov_data)
+    return tasks, ps
+
+
+@pytest.mark.parametrize("mode", ["tick", "event"])
+def test_irrelevant_provider_events_do_not_retry(mode):
+    tasks, ps = long_task_short_windows()
+    sch = BaselineScheduler(algo="greedy", mode=mode)
+    calls = count_calls(sch)
+    res = sch.run(tasks, ps)
+    assert [(r[0], r[4]) for r in res] == [("T", 1)]
+    assert res[0][2] == BASE + dt.timedelta(hours=4)
+    # 처음 실패 1회 + P1이 열릴 때 1회
+    assert calls == ["T", "T"]
+
+
+@pytest.mark.parametrize("algo", ["greedy", "bf", "dp"])
+@pytest.mark.parametrize("mode", ["tick", "event"])
+def test_same_assignments_as_global_reset(algo, mode):
+    out = []
+    for cls in (BaselineScheduler, ResetScheduler):
+        tasks, ps = make_tasks_providers()
+        sch = cls(algo=algo, mode=mode)
+        calls = count_calls(sch)
+        out.append((sch.run(tasks, ps), len(calls)))
+    (new, n_new), (old, n_old) = out
+    assert new == old
+    assert n_new <= n_old
@@ -0,0 +1,82 @@
+import pathlib
+import sys
+
+import pytest
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+
+from Core.Scheduler.metric_evaluator.baseline import BaselineEvaluator
+from Core.Scheduler.combo_generator.bitmask_dp import BitmaskDPComboGenerator
+from Core.Scheduler.combo_generator.brute_force import BruteForceGenerator
+from conftest import BASE, random_instance, score, symmetric_instance
+try:
+    from Core.Scheduler.combo_generator.cpsat import CPSatComboGenerator
+except ModuleNotFoundError:  # pragma: no cover - ortools missing
+    CPSatComboGenerator = None
+
+@pytest.mark.parametrize("mode", ["bnb", "exhaustive"])
+def test_bf_enumerates_multisets(mode):
+    t, ps = symmetric_instance()
+    ev = BaselineEvaluator()
+    full = BruteForceGenerator(kprov=6, mode=mode, symmetry=False)
+    sym = BruteForceGenerator(kprov=6, mode=mode)
+    assert sym.best_combo(t, ps, BASE, ev) == full.best_combo(t, ps, BASE, ev)
+    assert sym.search_stats["T"]["nodes"] * 10 < full.search_stats["T"]["nodes"]
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_bf_symmetry_keeps_result(seed):
+    t, ps, now = random_instance(seed)
+    ev = BaselineEvaluator()
+    want = BruteForceGenerator(mode="exhaustive", symmetry=False).best_combo(t, ps, now, ev)
+    assert BruteForceGenerator(mode="exhaustive").best_combo(t, ps, now, ev) == want
+
+
+@pytest.mark.parametrize("budget", [1.0, 5.0, 100.0])
+def test_dp_counts_provider_classes(budget):
+    t, ps = symmetric_instance(budget=budget)
+    ev = BaselineEvaluator()
+    dp = BitmaskDPComboGenerator(k=6)
+    got = dp.best_combo(t, ps, BASE, ev)
+    want = BruteForceGenerator(kprov=6, mode="exhaustive", symmetry=False).best_combo(t, ps, BASE, ev)
+    assert score(ev, t, ps, BASE, got[0]) == pytest.approx(score(ev, t, ps, BASE, want[0]))
+    # 2 classes of 3 providers: 4*4 states instead of 2**6
+    assert dp.time_complexity(t, ps, BASE, ev) == t.scene_number * 16
+
+
+@pytest.mark.skipif(CPSatComboGenerator is None, reason="ortools not installed")
+@pytest.mark.parametrize("budget", [1.0, 5.0, 100.0])
+def test_cp_symmetry_breaking_keeps_optimum(budget):
+    t, ps = symmetric_instance(budget=budget)
+    ev = BaselineEvaluator()
+    want = BruteForceGenerator(kprov=6, mode="exhaustive", symmetry=False).best_combo(t, ps, BASE, ev)
+    assert any(p != -1 for p in want[0])
+    res = {}
+    for symmetry in (False, True):
+        gen = CPSatComboGenerator(num_workers=1, random_seed=0, symmetry=symmetry)
+        res[symmetry] = gen.best_combo(t, ps, BASE, ev)
+        assert gen.last_solve["status"] == "OPTIMAL"
+        # 전부 미루는 조합이 아니라 전수 탐색의 최적과 같은 점수
+        assert any(p != -1 for p in res[symmetry][0])
+        assert score(ev, t, ps, BASE, res[symmetry][0]) == pytest.approx(score(ev, t, ps, BASE, want[0]))
+    # 대표 조합: 같은 씬은 번호가 증가, 같은 provider는 앞 번호부터
+    cmb = res[True][0]
+    for group in ([0, 1, 2, 5], [3, 4]):
+        placed = [cmb[s] for s in group if cmb[s] != -1]
+        assert placed == sorted(placed) and cmb[group[0]] != -1 or not placed
+    used = set(cmb) - {-1}
+    for p in used:
+        assert all(q in used for q in range(p % 2, p, 2))
+
+
+@pytest.mark.skipif(CPSatComboGenerator is None, reason="ortools not installed")
+def test_cp_provider_pairs_follow_windows():
+    t, ps = symmetric_instance()
+    ps[0].assign("X", 0, BASE, 9.5)  # P0 is busy, so P0 and P2 are not interchangeable now
+    ev = BaselineEvaluator()
+    gen = CPSatComboGenerator(num_workers=1, random_seed=0)
+    cmb, *_ = gen.best_combo(t, ps, BASE, ev)
+    assert 0 not in cmb
+    free = CPSatComboGenerator(num_workers=1, random_seed=0, symmetry=False)
+    want, *_ = free.best_combo(t, ps, BASE, ev)
+    assert score(ev, t, ps, BASE, cmb) == pytest.approx(score(ev, t, ps, BASE, want))
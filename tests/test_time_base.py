@@ -0,0 +1,35 @@
+import datetime as dt
+import pathlib
+import sys
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+
+from Model.providers import Providers
+from utils.utils import to_epoch, from_epoch, hours_to_us
+
+
+def test_epoch_round_trip_is_lossless():
+    ts = dt.datetime(2017, 12, 2, 9, 30, 45, 123456)
+    assert from_epoch(to_epoch(ts)) == ts
+    assert to_epoch(to_epoch(ts)) == to_epoch(ts)
+    assert hours_to_us(1.5) == 5400 * 10**6
+
+
+def test_provider_assign_accepts_epoch_and_datetime():
+    base = dt.datetime(2024, 1, 1, 8, 0)
+    ps = Providers()
+    ps.initialize_from_data([{
+        "available_hours": [(base, base + dt.timedelta(hours=4))],
+    }])
+    p = ps[0]
+    p.assign("T1", 0, to_epoch(base), 1.0)
+    p.assign("T1", 1, base + dt.timedelta(hours=2), 0.5)
+
+    assert p.schedule[0][2:] == (base, base + dt.timedelta(hours=1))
+    # 기록은 assign/setter로만 바뀜 (busy, hosted, version이 함께 갱신되도록)
+    assert not hasattr(p.schedule, "append")
+    assert p.available_hours == [
+        (base + dt.timedelta(hours=1), base + dt.timedelta(hours=2)),
+        (base + dt.timedelta(hours=2, minutes=30), base + dt.timedelta(hours=4)),
+    ]
+    assert p.earliest_available(1.0, base) == to_epoch(base + dt.timedelta(hours=1))
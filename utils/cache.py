@@ -0,0 +1,93 @@
+"""Bounded caches shared by evaluators and generators."""
+
+from __future__ import annotations
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Set
+
+
+class BoundedCache:
+    """LRU cache with group invalidation and hit/miss/eviction counters.
+
+    Each entry may belong to a *group* (e.g. a task id) so that everything
+    cached for that group can be dropped at once with :meth:`drop`.
+    Operations hold a lock, so one cache can serve several solver threads
+    (see :class:`~Core.Scheduler.combo_generator.portfolio.PortfolioComboGenerator`).
+    A pickled cache arrives empty: copies sent to worker processes keep
+    their size limit but not the entries.
+    """
+
+    def __init__(self, maxsize: int = 100_000):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (value, group)
+        self._groups: Dict[Hashable, Set[Hashable]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key: Hashable, value: Any, group: Optional[Hashable] = None) -> None:
+        with self._lock:
+            if key in self._data:
+                self._discard(key)
+            self._data[key] = (value, group)
+            if group is not None:
+                self._groups.setdefault(group, set()).add(key)
+            while len(self._data) > self.maxsize:
+                old, _ = next(iter(self._data.items()))
+                self._discard(old)
+                self.evictions += 1
+
+    def drop(self, group: Hashable) -> int:
+        """Evict every entry of ``group``; returns how many were dropped."""
+        with self._lock:
+            keys = self._groups.pop(group, ())
+            for k in keys:
+                del self._data[k]
+            self.evictions += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._groups.clear()
+
+    def __getstate__(self):
+        return {"maxsize": self.maxsize}
+
+    def __setstate__(self, state):
+        self.__init__(state["maxsize"])
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _discard(self, key: Hashable) -> None:
+        _, group = self._data.pop(key)
+        if group is not None:
+            members = self._groups[group]
+            members.discard(key)
+            if not members:
+                del self._groups[group]
@@ -2,7 +2,37 @@
 
 from __future__ import annotations
 import datetime
-from typing import List, Tuple
+from typing import List, Tuple, Union
+
+# ---------------------------------------------------
+# Integer time base
+# ---------------------------------------------------
+# Inside the simulation every instant is an int: microseconds since EPOCH.
+# Microseconds match datetime's own resolution, so converting back and forth
+# is lossless and schedules are identical to datetime arithmetic.
+# ``datetime`` only appears at the edges (config load, results, plots).
+EPOCH = datetime.datetime(1970, 1, 1)
+US_PER_SEC = 1_000_000
+US_PER_HOUR = 3600 * US_PER_SEC
+
+_ONE_US = datetime.timedelta(microseconds=1)
+
+
+def to_epoch(ts: Union[int, datetime.datetime]) -> int:
+    """Convert ``ts`` to microseconds since :data:`EPOCH`; ints pass through."""
+    if isinstance(ts, datetime.datetime):
+        return (ts - EPOCH) // _ONE_US
+    return int(ts)
+
+
+def from_epoch(us: int) -> datetime.datetime:
+    """Inverse of :func:`to_epoch`."""
+    return EPOCH + datetime.timedelta(microseconds=int(us))
+
+
+def hours_to_us(hours: float) -> int:
+    """Duration in hours -> integer microseconds (rounded like ``timedelta``)."""
+    return round(hours * US_PER_HOUR)
 
 
 def merge_intervals(